@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, status
 
 from constants.response import common_error_authenticated_response
 
@@ -7,6 +10,8 @@ from vui_common.security.helpers.rate_limiter import RateLimiter, LimiterRequest
 from vui_common.utils.swagger import route_description
 from vui_common.utils.exceptions import handle_exceptions_endpoint
 
+from integrations.nats_route_table import NATS_EXCLUDED
+
 from schemas.request.delete_resource import DeleteResourceRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from schemas.request.create_backup import CreateBackupRequestSchema
@@ -15,7 +20,9 @@ from schemas.request.update_backup_expiration import UpdateBackupExpirationReque
 from schemas.response.successful_backups import SuccessfulBackupResponse
 
 from controllers.common import (get_resource_describe_handler,
-                                get_resource_logs_handler)
+                                get_resource_logs_handler,
+                                get_resource_log_records_handler,
+                                stream_resource_logs_handler)
 from controllers.backup import (get_backups_handler,
                                 get_backup_storage_classes_handler,
                                 create_backup_handler,
@@ -60,11 +67,23 @@ route = '/backups'
 @handle_exceptions_endpoint
 async def get_backups(schedule_name: str | None = None,
                       only_last_for_schedule: bool = False,
-                      in_progress: bool = False
+                      in_progress: bool = False,
+                      storage_location: str | None = None,
+                      limit: int | None = None,
+                      continue_token: str | None = None,
+                      fields: str | None = None,
+                      summary: bool = False,
+                      if_none_match: Annotated[str | None, Header()] = None
                       ):
     return await get_backups_handler(schedule_name=schedule_name,
                                      latest_per_schedule=str(only_last_for_schedule).lower() == 'true',
-                                     in_progress=str(in_progress).lower() == 'true')
+                                     in_progress=str(in_progress).lower() == 'true',
+                                     storage_location=storage_location,
+                                     limit=limit,
+                                     continue_token=continue_token,
+                                     fields=fields,
+                                     summary=str(summary).lower() == 'true',
+                                     if_none_match=if_none_match)
 
 
 # ------------------------------------------------------------------------------------------------
@@ -89,8 +108,82 @@ route = '/backup/logs'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def get_backup_logs(resource_name: str):
-    return await get_resource_logs_handler(resource_name=resource_name, resource_type='backup')
+async def get_backup_logs(resource_name: str,
+                          grep: str | None = None,
+                          level: str | None = None,
+                          since: datetime | None = None,
+                          until: datetime | None = None,
+                          tail: int | None = None):
+    return await get_resource_logs_handler(resource_name=resource_name, resource_type='backup',
+                                           grep=grep, level=level, since=since, until=until, tail=tail)
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET BACKUP LOG RECORDS
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_log_records = endpoint_limiter.get_limiter_cust('backup_log_records')
+route = '/backup/logs/records'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get the parsed backup log records',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_log_records.max_request,
+                                  limiter_seconds=limiter_log_records.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_log_records.seconds,
+                                      max_requests=limiter_log_records.max_request))],
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_backup_log_records(resource_name: str,
+                                 grep: str | None = None,
+                                 level: str | None = None,
+                                 since: datetime | None = None,
+                                 until: datetime | None = None,
+                                 namespace: str | None = None,
+                                 resource: str | None = None,
+                                 tail: int | None = None):
+    return await get_resource_log_records_handler(resource_name=resource_name, resource_type='backup',
+                                                  grep=grep, level=level, since=since, until=until,
+                                                  namespace=namespace, resource=resource, tail=tail)
+
+
+# ------------------------------------------------------------------------------------------------
+#             STREAM BACKUP LOGS
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_logs_stream = endpoint_limiter.get_limiter_cust('backup_logs_stream')
+route = '/backup/logs/stream'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Stream backup logs as NDJSON',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_logs_stream.max_request,
+                                  limiter_seconds=limiter_logs_stream.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_logs_stream.seconds,
+                                      max_requests=limiter_logs_stream.max_request))],
+    responses=common_error_authenticated_response,
+    openapi_extra=NATS_EXCLUDED,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def stream_backup_logs(resource_name: str,
+                             grep: str | None = None,
+                             level: str | None = None,
+                             since: datetime | None = None,
+                             until: datetime | None = None,
+                             tail: int | None = None):
+    return await stream_resource_logs_handler(resource_name=resource_name, resource_type='backup',
+                                              grep=grep, level=level, since=since, until=until, tail=tail)
 
 
 # ------------------------------------------------------------------------------------------------
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, status
 
 from constants.response import common_error_authenticated_response
 
@@ -49,8 +51,8 @@ route = '/bsl'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def get_bsl():
-    return await get_bsls_handler()
+async def get_bsl(if_none_match: Annotated[str | None, Header()] = None):
+    return await get_bsls_handler(if_none_match=if_none_match)
 
 
 # ------------------------------------------------------------------------------------------------
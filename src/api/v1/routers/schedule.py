@@ -1,4 +1,6 @@
-from fastapi import APIRouter, status, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, status, Depends, Header
 
 from constants.response import common_error_authenticated_response
 from schemas.request.pause_schedule import PauseScheduleRequestSchema
@@ -53,8 +55,8 @@ route = '/schedules'
     responses=common_error_authenticated_response,
     status_code=status.HTTP_200_OK)
 @handle_exceptions_endpoint
-async def get_schedule():
-    return await get_schedules_handler()
+async def get_schedule(if_none_match: Annotated[str | None, Header()] = None):
+    return await get_schedules_handler(if_none_match=if_none_match)
 
 
 # ------------------------------------------------------------------------------------------------
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, status, Depends
 
 from constants.response import common_error_authenticated_response
+from controllers.agent import get_agent_metrics_handler
 from controllers.k8s import get_pod_logs_handler
 
 from vui_common.security.helpers.rate_limiter import RateLimiter, LimiterRequests
@@ -76,6 +77,32 @@ route = '/vui/pods'
 async def get_vui_pods():
     return await get_vui_pods_handler()
 
+# ------------------------------------------------------------------------------------------------
+#             GET AGENT METRICS
+# ------------------------------------------------------------------------------------------------
+
+
+limiter_metrics = endpoint_limiter_setup.get_limiter_cust('agent_metrics')
+route = '/agent/metrics'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get metrics of the K8s watches and of the NATS cron jobs',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_metrics.max_request,
+                                  limiter_seconds=limiter_metrics.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_metrics.seconds,
+                                      max_requests=limiter_metrics.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_agent_metrics():
+    return await get_agent_metrics_handler()
+
 tag_name = 'Velero'
 
 # ------------------------------------------------------------------------------------------------
@@ -11,7 +11,8 @@ from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 from controllers.stats import (get_stats_handler,
                                get_in_progress_task_handler,
-                               get_schedules_heatmap_handler)
+                               get_schedules_heatmap_handler,
+                               get_schedules_contention_handler)
 
 router = APIRouter()
 rate_limiter = RateLimiter()
@@ -100,3 +101,31 @@ route = '/stats/schedules'
 #@handle_exceptions_endpoint
 async def get_schedules_heatmap():
     return await get_schedules_heatmap_handler()
+
+
+# ------------------------------------------------------------------------------------------------
+#             GET SCHEDULES CONTENTION
+# ------------------------------------------------------------------------------------------------
+
+
+route = '/stats/schedules/contention'
+
+
+@router.get(
+    path=route,
+    tags=[tag_name],
+    summary='Get schedules overlaps, peak concurrency per hour and first free window',
+    description=route_description(tag=tag_name,
+                                  route=route,
+                                  limiter_calls=limiter_schedules.max_request,
+                                  limiter_seconds=limiter_schedules.seconds),
+    dependencies=[Depends(RateLimiter(interval_seconds=limiter_schedules.seconds,
+                                      max_requests=limiter_schedules.max_request))],
+    response_model=SuccessfulRequest,
+    responses=common_error_authenticated_response,
+    status_code=status.HTTP_200_OK)
+@handle_exceptions_endpoint
+async def get_schedules_contention(schedule_name: str | None = None,
+                                   free_window_minutes: int = 60):
+    return await get_schedules_contention_handler(schedule_name=schedule_name,
+                                                  free_window_minutes=free_window_minutes)
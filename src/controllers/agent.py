@@ -2,6 +2,7 @@ from fastapi.responses import JSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 
+from service.agent_metrics import get_agent_metrics_service
 from service.watchdog import check_watchdog_online_service
 
 
@@ -10,3 +11,10 @@ async def watchdog_online_handler():
 
     response = SuccessfulRequest(payload=payload)
     return JSONResponse(content=response.model_dump(), status_code=200)
+
+
+async def get_agent_metrics_handler():
+    payload = await get_agent_metrics_service()
+
+    response = SuccessfulRequest(payload=payload)
+    return JSONResponse(content=response.model_dump(), status_code=200)
@@ -1,16 +1,20 @@
 import json
 from fastapi.responses import JSONResponse
 
+from constants.resources import RESOURCES, ResourcesNames
+from utils.etag import collection_etag, etag_matches, etag_headers, not_modified_response
+
 from schemas.request.create_backup import CreateBackupRequestSchema
 from schemas.request.create_backup_from_schedule import CreateBackupFromScheduleRequestSchema
 from schemas.request.update_backup_expiration import UpdateBackupExpirationRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from schemas.response.successful_backups import SuccessfulBackupResponse
+from schemas.response.successful_list import SuccessfulProjectedListResponse
 from vui_common.schemas.notification import Notification
 
 from service.backup_storage_class import get_backup_storage_classes_service
 from service.resource import get_resource_creation_settings_service
-from service.backup import (get_backups_service,
+from service.backup import (get_backups_page_service,
                             delete_backup_service,
                             create_backup_service,
                             create_backup_from_schedule_service,
@@ -28,13 +32,31 @@ async def get_creation_settings_handler():
 
 
 async def get_backups_handler(schedule_name: str | None = None, latest_per_schedule: bool = False,
-                              in_progress: bool = False):
-    payload = await get_backups_service(schedule_name=schedule_name,
-                                        latest_per_schedule=latest_per_schedule,
-                                        in_progress=in_progress)
-
-    response = SuccessfulBackupResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+                              in_progress: bool = False, storage_location: str | None = None,
+                              limit: int | None = None, continue_token: str | None = None,
+                              fields: str | None = None, summary: bool = False,
+                              if_none_match: str | None = None):
+    # the in progress list also depends on the time elapsed since the completion: no ETag
+    etag = None if in_progress else collection_etag(RESOURCES[ResourcesNames.BACKUP].plural,
+                                                    schedule_name, latest_per_schedule, storage_location,
+                                                    limit, continue_token, fields, summary)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    payload, pagination = await get_backups_page_service(schedule_name=schedule_name,
+                                                         latest_per_schedule=latest_per_schedule,
+                                                         in_progress=in_progress,
+                                                         storage_location=storage_location,
+                                                         limit=limit,
+                                                         continue_token=continue_token,
+                                                         fields=fields,
+                                                         summary=summary)
+
+    if fields or summary:
+        response = SuccessfulProjectedListResponse(payload=payload, pagination=pagination)
+    else:
+        response = SuccessfulBackupResponse(payload=payload, pagination=pagination)
+    return JSONResponse(content=response.model_dump(), status_code=200, headers=etag_headers(etag))
 
 
 async def delete_backup_handler(backup_name: str):
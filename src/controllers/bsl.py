@@ -1,5 +1,8 @@
 from fastapi.responses import JSONResponse
 
+from constants.resources import RESOURCES, ResourcesNames
+from utils.etag import collection_etag, etag_matches, etag_headers, not_modified_response
+
 from schemas.request.update_bsl import UpdateBslRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
@@ -14,11 +17,15 @@ from service.bsl import (remove_default_bsl_service,
                          update_bsl_service)
 
 
-async def get_bsls_handler():
+async def get_bsls_handler(if_none_match: str | None = None):
+    etag = collection_etag(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
     payload = await get_bsls_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return JSONResponse(content=response.model_dump(), status_code=200, headers=etag_headers(etag))
 
 
 async def create_bsl_handler(bsl: CreateBslRequestSchema):
@@ -1,10 +1,13 @@
-from fastapi.responses import JSONResponse
+from datetime import datetime
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 
 # from utils.commons import logs_string_to_list
 
-from service.logs import get_velero_logs_service
+from service.logs import get_velero_logs_service, get_velero_log_records_service, stream_velero_logs_service
 from service.describe import get_velero_resource_details_service
 
 
@@ -15,8 +18,15 @@ async def get_resource_describe_handler(resource_name: str, resource_type: str):
     return JSONResponse(content=response.model_dump(), status_code=200)
 
 
-async def get_resource_logs_handler(resource_name: str, resource_type: str):
-    payload = await get_velero_logs_service(resource_name, resource_type)
+async def get_resource_logs_handler(resource_name: str,
+                                    resource_type: str,
+                                    grep: str | None = None,
+                                    level: str | None = None,
+                                    since: datetime | None = None,
+                                    until: datetime | None = None,
+                                    tail: int | None = None):
+    payload = await get_velero_logs_service(resource_name, resource_type,
+                                            grep=grep, level=level, since=since, until=until, tail=tail)
 
     # logs = payload.logs
 
@@ -24,3 +34,33 @@ async def get_resource_logs_handler(resource_name: str, resource_type: str):
 
     response = SuccessfulRequest(payload=payload)
     return JSONResponse(content=response.model_dump(), status_code=200)
+
+
+async def get_resource_log_records_handler(resource_name: str,
+                                           resource_type: str,
+                                           grep: str | None = None,
+                                           level: str | None = None,
+                                           since: datetime | None = None,
+                                           until: datetime | None = None,
+                                           namespace: str | None = None,
+                                           resource: str | None = None,
+                                           tail: int | None = None):
+    payload = await get_velero_log_records_service(resource_name, resource_type,
+                                                   grep=grep, level=level, since=since, until=until,
+                                                   namespace=namespace, resource=resource, tail=tail)
+
+    response = SuccessfulRequest(payload=payload.model_dump())
+    return JSONResponse(content=response.model_dump(), status_code=200)
+
+
+async def stream_resource_logs_handler(resource_name: str,
+                                       resource_type: str,
+                                       grep: str | None = None,
+                                       level: str | None = None,
+                                       since: datetime | None = None,
+                                       until: datetime | None = None,
+                                       tail: int | None = None):
+    lines = await stream_velero_logs_service(resource_name, resource_type,
+                                             grep=grep, level=level, since=since, until=until, tail=tail)
+    # the download is released when the response ends, even if the stream was never consumed
+    return StreamingResponse(lines, media_type="application/x-ndjson", background=BackgroundTask(lines.aclose))
@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.configs.config_proxy import config_app
+from service.utils.backup_content_cache import backup_content_cache
 from service.inspect import (get_folders_list,
                              # get_directory_contents,
                              read_json_file,
@@ -24,6 +25,8 @@ async def get_backups_handler():
 #
 
 async def get_file_content_handler(path: str):
+    # the backup being browsed stays in the backup cache
+    backup_content_cache.touch_alias(os.path.join(config_app.app.inspect_folder, path.strip('/').split('/')[0]))
     payload = await read_json_file(os.path.join(config_app.app.inspect_folder, path))
 
     response = SuccessfulRequest(payload=payload)
@@ -31,6 +34,7 @@ async def get_file_content_handler(path: str):
 
 
 async def get_recursive_directory_contents_handler(backup: str):
+    backup_content_cache.touch_alias(os.path.join(config_app.app.inspect_folder, backup))
     payload = await get_recursive_directory_contents(os.path.join(config_app.app.inspect_folder, backup))
 
     response = SuccessfulRequest(payload=payload)
@@ -1,6 +1,9 @@
 import os
 from fastapi.responses import JSONResponse
 
+from constants.resources import RESOURCES, ResourcesNames
+from utils.etag import collection_etag, etag_matches, etag_headers, not_modified_response
+
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
 from vui_common.schemas.message import Message
@@ -14,11 +17,15 @@ from service.repo import (get_repos_service,
                           check_restic_repo_service)
 
 
-async def get_repos_handler():
+async def get_repos_handler(if_none_match: str | None = None):
+    etag = collection_etag(RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
     payload = await get_repos_service()
 
     response = SuccessfulRequest(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return JSONResponse(content=response.model_dump(), status_code=200, headers=etag_headers(etag))
 
 
 async def get_backup_size_handler(repository_url: str = None,
@@ -1,18 +1,36 @@
 from fastapi.responses import JSONResponse
 
+from constants.resources import RESOURCES, ResourcesNames
+from utils.etag import collection_etag, etag_matches, etag_headers, not_modified_response
+
 from schemas.request.create_restore import CreateRestoreRequestSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from schemas.response.successful_restores import SuccessfulRestoreResponse
+from schemas.response.successful_list import SuccessfulProjectedListResponse
 from vui_common.schemas.notification import Notification
 
-from service.restore import get_restores_service, create_restore_service, delete_restore_service
+from service.restore import get_restores_page_service, create_restore_service, delete_restore_service
 
 
-async def get_restores_handler(in_progress=False):
-    payload = await get_restores_service(in_progress=in_progress)
+async def get_restores_handler(in_progress=False, limit: int | None = None, continue_token: str | None = None,
+                               fields: str | None = None, summary: bool = False, if_none_match: str | None = None):
+    # the in progress list also depends on the time elapsed since the completion: no ETag
+    etag = None if in_progress else collection_etag(RESOURCES[ResourcesNames.RESTORE].plural,
+                                                    limit, continue_token, fields, summary)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
 
-    response = SuccessfulRestoreResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    payload, pagination = await get_restores_page_service(in_progress=in_progress,
+                                                          limit=limit,
+                                                          continue_token=continue_token,
+                                                          fields=fields,
+                                                          summary=summary)
+
+    if fields or summary:
+        response = SuccessfulProjectedListResponse(payload=payload, pagination=pagination)
+    else:
+        response = SuccessfulRestoreResponse(payload=payload, pagination=pagination)
+    return JSONResponse(content=response.model_dump(), status_code=200, headers=etag_headers(etag))
 
 
 async def create_restore_handler(restore: CreateRestoreRequestSchema):
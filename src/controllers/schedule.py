@@ -2,6 +2,9 @@
 
 from fastapi.responses import JSONResponse
 
+from constants.resources import RESOURCES, ResourcesNames
+from utils.etag import collection_etag, etag_matches, etag_headers, not_modified_response
+
 from vui_common.schemas.response.successful_request import SuccessfulRequest
 from vui_common.schemas.notification import Notification
 from schemas.request.create_schedule import CreateScheduleRequestSchema
@@ -16,11 +19,15 @@ from service.schedule import (get_schedules_service,
 from vui_common.logger.logger_proxy import logger
 
 
-async def get_schedules_handler():
+async def get_schedules_handler(if_none_match: str | None = None):
+    etag = collection_etag(RESOURCES[ResourcesNames.SCHEDULE].plural)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
     payload = await get_schedules_service()
 
     response = SuccessfulScheduleResponse(payload=payload)
-    return JSONResponse(content=response.model_dump(), status_code=200)
+    return JSONResponse(content=response.model_dump(), status_code=200, headers=etag_headers(etag))
 
 
 async def pause_schedule_handler(schedule: str):
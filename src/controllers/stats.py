@@ -6,6 +6,7 @@ from service.backup import get_backups_service
 from service.restore import get_restores_service
 from service.stats import get_stats_service
 from service.schedule_heatmap import get_schedules_heatmap_service
+from service.schedule_contention import get_schedules_contention_service
 
 
 async def get_stats_handler():
@@ -29,3 +30,11 @@ async def get_schedules_heatmap_handler():
 
     response = SuccessfulRequest(payload=payload)
     return JSONResponse(content=response.model_dump(), status_code=200)
+
+
+async def get_schedules_contention_handler(schedule_name: str | None = None, free_window_minutes: int = 60):
+    payload = await get_schedules_contention_service(schedule_name=schedule_name,
+                                                     free_window_minutes=free_window_minutes)
+
+    response = SuccessfulRequest(payload=payload)
+    return JSONResponse(content=response.model_dump(), status_code=200)
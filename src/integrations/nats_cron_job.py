@@ -1,11 +1,53 @@
+import time
+from datetime import datetime
+
+
+class NatsCronJobStats:
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.consecutive_failures = 0
+        self.last_duration_sec = None
+        self.max_duration_sec = 0.0
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = None
+
+    def __record_run(self, duration: float):
+        self.runs += 1
+        self.last_duration_sec = round(duration, 3)
+        self.max_duration_sec = max(self.max_duration_sec, self.last_duration_sec)
+
+    def record_success(self, duration: float):
+        self.__record_run(duration)
+        self.consecutive_failures = 0
+        self.last_success = datetime.utcnow().isoformat()
+
+    def record_failure(self, duration: float, error: str, timeout: bool = False):
+        self.__record_run(duration)
+        self.failures += 1
+        self.timeouts += int(timeout)
+        self.consecutive_failures += 1
+        self.last_failure = datetime.utcnow().isoformat()
+        self.last_error = error
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
 class NatsCronJob:
     def __init__(self, endpoint: str,
                  credential_required: bool,
-                 interval: int):
+                 interval: int,
+                 sources: tuple = ()):
         self._endpoint = endpoint
         self._cr = credential_required
         self._interval = interval
-        self.__from_last_publish_sec = interval + 1
+        # Watched plurals whose changes trigger a publish before the interval expires
+        self._sources = tuple(sources)
+        self.__last_publish = None
+        self.stats = NatsCronJobStats()
 
     @property
     def endpoint(self):
@@ -27,6 +69,10 @@ class NatsCronJob:
     def interval(self):
         return self._interval
 
+    @property
+    def sources(self):
+        return self._sources
+
     @property
     def ky_key(self):
         return self._endpoint.replace("/", "_")
@@ -36,19 +82,24 @@ class NatsCronJob:
         return {'endpoint': self._endpoint,
                 'credential': self._cr,
                 'intervals': self._interval,
-                'kv_key': self.ky_key}
+                'sources': list(self._sources),
+                'kv_key': self.ky_key,
+                'stats': self.stats.as_dict()}
 
     @property
     def time_elapsed(self):
-        return self.__from_last_publish_sec
-
-    @time_elapsed.setter
-    def time_elapsed(self, value: int):
-        self.__from_last_publish_sec += value
+        if self.__last_publish is None:
+            return float('inf')
+        return time.monotonic() - self.__last_publish
 
     @property
     def is_elapsed(self):
-        return self.__from_last_publish_sec > self._interval
+        return self.time_elapsed > self._interval
+
+    @property
+    def next_due(self):
+        """Seconds before the interval expires"""
+        return max(0.0, self._interval - self.time_elapsed)
 
     def reset_timer(self):
-        self.__from_last_publish_sec = 0
+        self.__last_publish = time.monotonic()
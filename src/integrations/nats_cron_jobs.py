@@ -1,4 +1,5 @@
 from vui_common.configs.config_proxy import config_app
+from constants.resources import RESOURCES, ResourcesNames
 from integrations.nats_cron_job import NatsCronJob
 from vui_common.logger.logger_proxy import logger
 
@@ -12,7 +13,10 @@ class NatsCronJobs:
         # logger.debug(f"__init_default_api")
         self.add_job(endpoint="/v1/stats",
                      credential=True,
-                     interval=config_app.nats.cron_get_stats_update)
+                     interval=config_app.nats.cron_get_stats_update,
+                     sources=(RESOURCES[ResourcesNames.BACKUP].plural,
+                              RESOURCES[ResourcesNames.RESTORE].plural,
+                              RESOURCES[ResourcesNames.SCHEDULE].plural))
 
         self.add_job(endpoint="/health/k8s",
                      credential=False,
@@ -20,19 +24,23 @@ class NatsCronJobs:
 
         self.add_job(endpoint="/v1/backups",
                      credential=True,
-                     interval=config_app.nats.cron_backup_update)
+                     interval=config_app.nats.cron_backup_update,
+                     sources=(RESOURCES[ResourcesNames.BACKUP].plural,))
 
         self.add_job(endpoint="/v1/restores",
                      credential=True,
-                     interval=config_app.nats.cron_restore_update)
+                     interval=config_app.nats.cron_restore_update,
+                     sources=(RESOURCES[ResourcesNames.RESTORE].plural,))
 
         self.add_job(endpoint="/v1/schedules",
                      credential=True,
-                     interval=config_app.nats.cron_schedules_update)
+                     interval=config_app.nats.cron_schedules_update,
+                     sources=(RESOURCES[ResourcesNames.SCHEDULE].plural,))
 
         self.add_job(endpoint="/v1/bsl",
                      credential=True,
-                     interval=config_app.nats.cron_backup_location_update)
+                     interval=config_app.nats.cron_backup_location_update,
+                     sources=(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural,))
 
         self.add_job(endpoint="/v1/vsl",
                      credential=True,
@@ -40,7 +48,8 @@ class NatsCronJobs:
 
         self.add_job(endpoint="/v1/repos",
                      credential=True,
-                     interval=config_app.nats.cron_repository_update)
+                     interval=config_app.nats.cron_repository_update,
+                     sources=(RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural,))
 
         self.add_job(endpoint="/v1/sc-mapping",
                      credential=True,
@@ -54,11 +63,12 @@ class NatsCronJobs:
                      credential=True,
                      interval=config_app.nats.cron_storage_classes_mapping_update)
 
-    def add_job(self, endpoint: str, credential: bool, interval: int):
+    def add_job(self, endpoint: str, credential: bool, interval: int, sources: tuple = ()):
         if len(endpoint) and interval > 0:
             jobs = NatsCronJob(endpoint=endpoint,
                                credential_required=credential,
-                               interval=interval)
+                               interval=interval,
+                               sources=sources)
             self.jobs[jobs.endpoint] = jobs
             logger.debug(f"add_job. jobs added with success, endpoint:{endpoint}")
             return True
@@ -73,11 +83,6 @@ class NatsCronJobs:
         else:
             raise KeyError(f"No timer found with the name: {name}")
 
-    def add_tick_to_interval(self, interval: int):
-        # self.print_ls.debug(f"add_tick_to_interval")
-        for key, job in self.jobs.items():
-            job.time_elapsed = interval
-
     def print_info(self):
         # self.print_ls.debug(f"add_tick_to_interval")
         if not self.jobs:
@@ -86,4 +91,5 @@ class NatsCronJobs:
             for name, job in self.jobs.items():
                 logger.debug(f"api: {job.endpoint} "
                              f"interval sec: {job.interval} "
+                             f"sources: {', '.join(job.sources) or '-'} "
                              f"key: {job.ky_key} ")
@@ -0,0 +1,46 @@
+import gzip
+import hashlib
+import os
+from typing import Optional, Tuple
+
+from utils.event_envelope import dumps
+
+NATS_KV_COMPRESSION = os.getenv('NATS_KV_COMPRESSION', 'false').lower() == 'true'
+NATS_KV_COMPRESS_MIN_BYTES = int(os.getenv('NATS_KV_COMPRESS_MIN_BYTES', '65536'))
+
+# Header set on the compressed values, the readers decompress when it is present
+KV_ENCODING_HEADER = 'Content-Encoding'
+KV_ENCODING_GZIP = 'gzip'
+
+
+def encode_kv_value(value) -> Tuple[bytes, str]:
+    """
+    Serialize a KV value once and return it with the SHA-256 of its content.
+
+    📌 The `metadata` of the cron payloads (publish timestamp and source) is excluded from the digest, so a value
+    whose data did not change has the same digest at every publish.
+    """
+    if isinstance(value, bytes):
+        return value, hashlib.sha256(value).hexdigest()
+    if isinstance(value, str):
+        data = value.encode()
+        return data, hashlib.sha256(data).hexdigest()
+    if not isinstance(value, dict) or 'metadata' not in value:
+        data = dumps(value)
+        return data, hashlib.sha256(data).hexdigest()
+
+    content = dumps({key: item for key, item in value.items() if key != 'metadata'})
+    digest = hashlib.sha256(content).hexdigest()
+    metadata = b'"metadata":' + dumps(value['metadata'])
+    # the metadata is appended to the serialized content instead of serializing the whole payload again
+    data = b'{' + metadata + b'}' if content == b'{}' else content[:-1] + b',' + metadata + b'}'
+    return data, digest
+
+
+def compress_kv_value(data: bytes,
+                      enabled: bool = NATS_KV_COMPRESSION,
+                      min_bytes: int = NATS_KV_COMPRESS_MIN_BYTES) -> Tuple[bytes, Optional[dict]]:
+    """Gzip the values above the threshold, returning the headers that flag the encoding"""
+    if not enabled or len(data) < min_bytes:
+        return data, None
+    return gzip.compress(data, compresslevel=6), {KV_ENCODING_HEADER: KV_ENCODING_GZIP}
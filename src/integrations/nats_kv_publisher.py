@@ -0,0 +1,138 @@
+import asyncio
+import os
+import random
+import time
+
+from vui_common.logger.logger_proxy import logger
+
+from integrations.nats_cron_job import NatsCronJob
+from integrations.nats_cron_jobs import NatsCronJobs
+from k8s.k8s_resource_cache import ResourceIndexer, resource_cache
+
+NATS_KV_DEBOUNCE_SEC = float(os.getenv('NATS_KV_DEBOUNCE_SEC', '2'))
+NATS_CRON_MAX_CONCURRENT_JOBS = int(os.getenv('NATS_CRON_MAX_CONCURRENT_JOBS', '4'))
+NATS_CRON_JOB_TIMEOUT_SEC = float(os.getenv('NATS_CRON_JOB_TIMEOUT_SEC', '60'))
+NATS_CRON_JITTER_SEC = float(os.getenv('NATS_CRON_JITTER_SEC', '2'))
+
+
+class _StoreChangeListener(ResourceIndexer):
+    """Reports every change of a watch-fed store"""
+
+    def __init__(self, plural: str, on_change):
+        self.plural = plural
+        self.on_change = on_change
+
+    def rebuild(self, items):
+        self.on_change(self.plural)
+
+    def add(self, key, obj):
+        self.on_change(self.plural)
+
+    def remove(self, key):
+        self.on_change(self.plural)
+
+
+class NatsKvPublisher:
+    """
+    Publishes the NATS cron jobs to the KV bucket, driven by the watch-fed resource cache.
+
+    📌 A job with watch sources is published when one of its source stores changes, debounced per key.
+    📌 The job interval is only a max-staleness fallback: every key is published again at least once per interval.
+    📌 A failed publish is retried with an exponential backoff (capped to the job interval).
+    📌 Jobs run concurrently (at most `max_concurrent_jobs`), each bounded by a timeout; the interval runs are
+    spread by a random jitter. Duration, successes and failures are recorded per job (see `metrics`).
+    """
+
+    def __init__(self, jobs: NatsCronJobs, publish_job,
+                 debounce: float = NATS_KV_DEBOUNCE_SEC,
+                 max_concurrent_jobs: int = NATS_CRON_MAX_CONCURRENT_JOBS,
+                 timeout: float = NATS_CRON_JOB_TIMEOUT_SEC,
+                 jitter: float = NATS_CRON_JITTER_SEC):
+        self.jobs = jobs
+        # async callback (job, source) publishing the data of a job, True when published
+        self.publish_job = publish_job
+        self.debounce = debounce
+        self.timeout = timeout
+        self.jitter = max(0.0, jitter)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent_jobs))
+        self._debounced = {}
+        self._scheduled = {}
+        self._locks = {}
+        self._listening = False
+
+    def _listen(self):
+        if self._listening:
+            return
+        for plural in sorted({plural for job in self.jobs.jobs.values() for plural in job.sources}):
+            resource_cache.store(plural).add_indexer(_StoreChangeListener(plural, self.mark_changed))
+        # the first publish of every key is done by the run loop
+        self._listening = True
+
+    def mark_changed(self, plural: str):
+        if not self._listening:
+            return
+        for job in self.jobs.jobs.values():
+            if plural in job.sources and job.endpoint not in self._debounced:
+                self._debounced[job.endpoint] = asyncio.create_task(self._publish_debounced(job))
+
+    async def _publish_debounced(self, job: NatsCronJob):
+        try:
+            await asyncio.sleep(self.debounce)
+        finally:
+            # the changes received from now on schedule a new publish
+            self._debounced.pop(job.endpoint, None)
+        await self._publish(job, 'watch')
+
+    async def _publish(self, job: NatsCronJob, source: str) -> bool:
+        lock = self._locks.setdefault(job.endpoint, asyncio.Lock())
+        async with lock, self._semaphore:
+            started = time.monotonic()
+            try:
+                published = await asyncio.wait_for(self.publish_job(job, source), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"NatsKvPublisher publish {job.ky_key} timed out after {self.timeout} seconds")
+                job.stats.record_failure(time.monotonic() - started, 'timeout', timeout=True)
+                return False
+            except Exception as e:
+                logger.error(f"NatsKvPublisher publish {job.ky_key} ({str(e)})")
+                job.stats.record_failure(time.monotonic() - started, str(e))
+                return False
+
+            if not published:
+                job.stats.record_failure(time.monotonic() - started, 'no data published')
+                return False
+            # the max-staleness interval restarts only from a successful publish: a failed one is retried
+            job.reset_timer()
+            job.stats.record_success(time.monotonic() - started)
+            return True
+
+    async def _publish_scheduled(self, job: NatsCronJob):
+        try:
+            # jitter: the jobs with the same interval do not hit the API server at the same moment
+            await asyncio.sleep(random.uniform(0, self.jitter))
+            if not await self._publish(job, 'cron job'):
+                # retry backoff: the job stays scheduled, so the run loop does not dispatch it again meanwhile
+                await asyncio.sleep(min(job.interval, 2 ** min(job.stats.consecutive_failures, 10)))
+        finally:
+            self._scheduled.pop(job.endpoint, None)
+
+    def metrics(self):
+        return {job.ky_key: {'endpoint': job.endpoint,
+                             'interval': job.interval,
+                             'sources': list(job.sources),
+                             **job.stats.as_dict()}
+                for job in self.jobs.jobs.values()}
+
+    async def run(self):
+        self._listen()
+        while True:
+            # the due jobs run concurrently (bounded by the semaphore): a slow endpoint does not delay the others
+            for job in list(self.jobs.jobs.values()):
+                if job.is_elapsed and job.endpoint not in self._scheduled:
+                    logger.debug(f"NatsKvPublisher. max staleness reached {job.ky_key}")
+                    self._scheduled[job.endpoint] = asyncio.create_task(self._publish_scheduled(job))
+
+            # sleep until the next interval expires (watch-driven publishes push it forward)
+            next_due = min((job.next_due for job in self.jobs.jobs.values() if job.endpoint not in self._scheduled),
+                           default=60)
+            await asyncio.sleep(max(1.0, next_due))
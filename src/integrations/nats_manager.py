@@ -1,12 +1,8 @@
 from datetime import datetime
 import socket
 import os
-from fastapi import FastAPI, Request
-from fastapi.routing import APIRoute, Mount
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from nats.js.api import KeyValueConfig
-from pydantic import BaseModel
-from inspect import signature
 
 import asyncio
 import json
@@ -16,6 +12,9 @@ from nats.aio.errors import ErrTimeout, ErrNoServers
 from nats.errors import NoRespondersError
 
 from integrations.nats_cron_jobs import NatsCronJobs
+from integrations.nats_kv_codec import compress_kv_value, encode_kv_value
+from integrations.nats_kv_publisher import NatsKvPublisher
+from integrations.nats_route_table import NatsRouteTable
 from vui_common.models.db.user import User
 
 from vui_common.contexts.context import current_user_var, cp_user
@@ -24,6 +23,7 @@ from vui_common.configs.config_proxy import config_app
 from vui_common.logger.logger_proxy import logger
 
 from k8s import k8s_watcher_proxy
+from utils.event_envelope import EventEnvelope
 
 class NatsManager:
     _instance = None
@@ -39,8 +39,13 @@ class NatsManager:
         self.js = None
 
         self.kv_bucket_name = f"kv-{config_app.k8s.cluster_id}"
+        self.kv = None
+        self.route_table = None
+        # SHA-256 of the last value put for every key
+        self.kv_digests = {}
 
         self.kv_job_cron = NatsCronJobs()
+        self.kv_publisher = NatsKvPublisher(self.kv_job_cron, self.__publish_job_to_kv)
         self.channel_id = config_app.k8s.cluster_id
 
         self.retry_registration_sec = config_app.nats.retry_registration
@@ -53,7 +58,10 @@ class NatsManager:
         it returns the data as is. If not, it encodes the data.
         """
         logger.debug(f"__ensure_encoded")
-        if isinstance(data, bytes):
+        if isinstance(data, EventEnvelope):
+            # Event serialized once for all the sinks
+            return data.data
+        elif isinstance(data, bytes):
             # Data is already encoded
             return data
         elif isinstance(data, str):
@@ -127,6 +135,9 @@ class NatsManager:
     async def __create_bucket_store(self, key_value, max_size=16777216):
         logger.info(f"create_bucket_store {key_value} ")
         self.js = self.nc.jetstream()
+        # new connection or bucket: the handle and the stored values are not known anymore
+        self.kv = None
+        self.kv_digests = {}
         bucket_name = f"{key_value}"
         interval = 2
         exists = False
@@ -320,36 +331,12 @@ class NatsManager:
     #             KEY VALUE JETSTREAM DATA
     # ------------------------------------------------------------------------------------------------
 
-    @staticmethod
-    def __get_endpoint_function_by_path(app_fastapi: FastAPI, path: str, method:str, debug=False):
-        # Helper function to search routes
-        def search_routes(routes, path, method):
-            for route in routes:
-                if isinstance(route, APIRoute):
-                    if debug:
-                        print(f"route: {route.path} - methods: {route.methods} - find: {path} [{method}]")
-                    if route.path == path and method.upper() in route.methods:
-                        return route.endpoint
-                elif isinstance(route, Mount):
-                    if debug:
-                        print(f"route mount:{route}-find:{path}")
-                    # Check mounted sub-application routes
-                    sub_app = route.app
-                    if debug:
-                        print(f"route:{route}-sun_app:{sub_app}-find:{path}")
-                    sub_path = path[len(route.path.rstrip("/")):]
-                    if sub_path:
-                        if debug:
-                            print(f"sub_path:{route}-sun_app:{sub_app}-find:{path}")
-                        sub_endpoint = search_routes(sub_app.routes, sub_path, method)
-                        if sub_endpoint:
-                            return sub_endpoint
-                else:
-                    if debug:
-                        print(f"no found type:{route}")
-            return None
-
-        return search_routes(app_fastapi.routes, path, method)
+    def __routes(self) -> NatsRouteTable:
+        """Route table of the app, built at the first request (all the routers are included by then)"""
+        if self.route_table is None:
+            self.route_table = NatsRouteTable(self.app)
+            logger.debug(f"nats route table built with {len(self.route_table)} routes")
+        return self.route_table
 
     # ------------------------------------------------------------------------------------------------
     #             API UTILS
@@ -368,8 +355,12 @@ class NatsManager:
                 current_user_var.set(user)
                 cp_user.set("local-nats")
 
-            endpoint_function = self.__get_endpoint_function_by_path(self.app, path, method)
-            response = await endpoint_function()
+            route = self.__routes().resolve(method, path)
+            if route is None:
+                logger.warning(f"__get_data_from_api no endpoint found for path: {path}")
+                return None
+            binding, path_params = route
+            response = await binding.call_get(path_params, {})
 
             if isinstance(response, JSONResponse):
                 return json.loads(response.body.decode())
@@ -427,9 +418,10 @@ class NatsManager:
             await self.nc.publish(msg.reply, "error".encode())
         logger.debug(f"message_handle.command {command['method']} \tpath:{command['path']} ")
         # path = "/api/info/get"
-        endpoint_function = self.__get_endpoint_function_by_path(self.app, command['path'], command['method'])
+        route = self.__routes().resolve(command['method'], command['path'])
 
-        if endpoint_function is not None:
+        if route is not None:
+            binding, path_params = route
             logger.debug(f"message_handle.endpoint_function is ok ")
 
             # access_token = create_access_token(
@@ -452,64 +444,30 @@ class NatsManager:
                 if command['method'] == 'GET':
                     logger.debug(f"message_handle.command {command['method']}")
 
-                    # Call endpoint function with TestClient
-                    # response = TestClient(self.app).get(command['path'],
-                    #                                     params=command['params'],
-                    #                                     headers={"Authorization": f"Bearer {access_token}",
-                    #                                              "cp_user": command["user"]})
-
+                    query_dict = {}
                     if 'params' in command and len(command['params']) > 0:
                         query_dict = self.__query_string_to_dict(command['params'])
-                        response = await endpoint_function(**query_dict)
-                    else:
-                        response = await endpoint_function()
+                    response = await binding.call_get(path_params, query_dict)
 
-                    if isinstance(response, JSONResponse):
-                        response = json.loads(response.body.decode())
-
-                elif command['method'] == 'POST' or command['method'] == 'PATCH' or command['method'] == 'PUT' or command['method'] == 'DELETE':
+                else:
                     logger.debug(f"message_handle.command {command['method']}")
 
-                    # Call endpoint function with TestClient
-                    # response = TestClient(self.app).post(command['path'],
-                    #                                      json=command['params'],
-                    #                                      headers={"Authorization": f"Bearer {access_token}",
-                    #                                               "cp_user": command["user"]})
-
-                    # get function signature
-                    sig = signature(endpoint_function)
-
-                    params = list(sig.parameters.values())
-
-                    if not params:
-                        response = await endpoint_function()
-                    else:
-                        first_param = next(iter(sig.parameters.values()))
-                        # get first param of endpoint
-                        if first_param.annotation == Request:
-                            # Create fake Request Object
-                            request_scope = {
-                                "type": "http",
-                                "method": command['method'],
-                                "path": command["path"],
-                                "headers": {},
-                            }
-                            request = Request(request_scope)
-                            request._json = command['params']
-
-                            # call endpoint with Request object
-                            response = await endpoint_function(request)
-                        elif issubclass(first_param.annotation, BaseModel):
-                            # Create Pydantic schemas
-                            model_instance = first_param.annotation(**command['params'])
-                            # call endpoint with Pydantic object
-                            response = await endpoint_function(model_instance)
-                        # else:
-                        #     raise HTTPException(status_code=400, detail="Unsupported parameter type")
-
-                        # If the response is a JSONResponse object, get content
-                        if isinstance(response, JSONResponse):
-                            response = json.loads(response.body.decode())
+                    # the binding plan (Request, Pydantic body or keyword arguments) is resolved once per route
+                    response = await binding.call_with_body(command['method'], command['path'],
+                                                            command.get('params'), path_params)
+
+                # If the response is a JSONResponse object, get content
+                if isinstance(response, JSONResponse):
+                    response = json.loads(response.body.decode())
+                elif isinstance(response, StreamingResponse):
+                    # a streamed body cannot be sent as a single reply: its source is released
+                    if response.background is not None:
+                        await response.background()
+                    response = {'success': False, 'error': {'title': 'message_handler',
+                                                            'description': f"Streamed response not available over "
+                                                                           f"NATS: {command['path']}"
+                                                            }
+                                }
 
                 content = json.dumps(response)
 
@@ -521,7 +479,7 @@ class NatsManager:
                         }
                 content = json.dumps(data)
                 logger.warning(f"message_handler:{content}")
-        else:  # endpoint_function is None
+        else:  # route is None
             data = {'success': False, 'error': {'title': 'message_handler',
                                                 'description': f"No endpoint found for path: {command['path']}"
                                                 }
@@ -566,18 +524,30 @@ class NatsManager:
     #             PUBLISH CRON KEY VALUE IN JETSTREAM
     # ------------------------------------------------------------------------------------------------
 
+    async def __key_value(self):
+        """KV bucket handle, looked up once per connection"""
+        if self.kv is None:
+            self.kv = await self.js.key_value(self.kv_bucket_name)
+        return self.kv
+
     async def __publish_kv_pair(self, key, value):
         try:
             logger.debug(f"__publish_kv_pair.key {key}")
             if self.nc is not None:
-                js = self.nc.jetstream()
-                kv = await js.key_value(self.kv_bucket_name)
-
-                data = self.__ensure_encoded(value)
-
-                # await kv.put(key, json.dumps(value).encode())
-                await kv.put(key, data)
-                logger.debug(f"__publish_kv_pair.published {key}")
+                data, digest = encode_kv_value(value)
+                if self.kv_digests.get(key) == digest:
+                    logger.debug(f"__publish_kv_pair.unchanged {key}")
+                    return True
+
+                kv = await self.__key_value()
+                data, headers = compress_kv_value(data)
+                if headers:
+                    # KeyValue.put does not accept headers: publish on the subject of the key
+                    await self.js.publish(f"$KV.{self.kv_bucket_name}.{key}", data, headers=headers)
+                else:
+                    await kv.put(key, data)
+                self.kv_digests[key] = digest
+                logger.debug(f"__publish_kv_pair.published {key} ({len(data)} bytes)")
                 return True
             else:
                 logger.warning("nats connections is not ready")
@@ -589,43 +559,34 @@ class NatsManager:
         except Exception as e:
             logger.warning(f"__publish_kv_pair ({str(e)})")
 
+        # the handle is looked up again at the next publish
+        self.kv = None
         return False
 
-    async def __publish_data_to_kv(self):
-        logger.info(f"__publish_data_to_kv.client {self.kv_bucket_name}")
-        interval = 1
-        self.kv_job_cron.print_info()
+    async def __publish_job_to_kv(self, job, source):
+        data = await self.__get_data_from_api(path=job.endpoint, credential=job.credential, method="GET")
+        if data is not None:
+            logger.info(f"set kv in jetstream {job.ky_key} {str(data)[:100]}...")
+            if isinstance(data, dict):
+                data['metadata'] = {
+                    'timestamp': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+                    'source': source
+                }
+            else:
+                logger.warning(f"Unexpected data format: {type(data)} - {str(data)[:100]}")
 
-        while True:
-            try:
-                self.kv_job_cron.add_tick_to_interval(1)
-                for name, job in self.kv_job_cron.jobs.items():
-                    if job.is_elapsed:
-                        logger.debug(f"__publish_data_to_kv. batch {name}")
-                        job.reset_timer()
-                        data = await self.__get_data_from_api(path=job.endpoint, credential=job.credential, method="GET")
-                        if data is not None:
-                            logger.info(f"set kv in jetstream {job.ky_key} {str(data)[:100]}...")
-                            if isinstance(data, dict):
-                                data['metadata'] = {
-                                    'timestamp': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
-                                    'source': 'cron job'
-                                }
-                            else:
-                                logger.warning(f"Unexpected data format: {type(data)} - {str(data)[:100]}")
+            update = await self.__publish_kv_pair(key=job.ky_key, value=data)
 
-                            update = await self.__publish_kv_pair(key=job.ky_key, value=data)
+            logger.info(f"__publish_data_to_kv. update {job.ky_key} res: {update}")
+            return update
+        return False
 
-                            logger.info(f"__publish_data_to_kv. update {job.ky_key} res: {update}")
+    async def __publish_data_to_kv(self):
+        logger.info(f"__publish_data_to_kv.client {self.kv_bucket_name}")
+        self.kv_job_cron.print_info()
 
-            except ErrTimeout:
-                logger.error("__publish_data_to_kv No reply received from server (timeout)")
-            except ErrNoServers:
-                logger.error("__publish_data_to_kv No reply received (no nats server)")
-            except Exception as e:
-                logger.error(f"__publish_data_to_kv ({str(e)})")
-            finally:
-                await asyncio.sleep(interval)  # Publish every x seconds
+        # Keys are published when their watched resources change, the intervals are the max staleness
+        await self.kv_publisher.run()
 
     # ------------------------------------------------------------------------------------------------
     #             PUBLISH
@@ -0,0 +1,102 @@
+import inspect
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.routing import Mount, compile_path
+
+# `openapi_extra` of the routes not served over NATS (e.g. streamed responses, a NATS reply is a single message)
+NATS_EXCLUDED = {'x-nats-excluded': True}
+
+
+class RouteBinding:
+    """
+    Endpoint of a route with its parameter binding plan, resolved once from the signature.
+
+    📌 GET: path parameters and query parameters are passed as keyword arguments.
+    📌 POST/PUT/PATCH/DELETE: the body is passed as a `Request` or as the Pydantic model of the first parameter;
+    otherwise its keys matching the endpoint parameters are passed as keyword arguments.
+    """
+
+    __slots__ = ('endpoint', 'path', 'body_kind', 'body_model', 'parameters')
+
+    def __init__(self, endpoint, path: str):
+        self.endpoint = endpoint
+        self.path = path
+        self.body_model = None
+
+        parameters = list(inspect.signature(endpoint).parameters.values())
+        self.parameters = {parameter.name for parameter in parameters}
+        first = parameters[0].annotation if parameters else None
+        if not parameters:
+            self.body_kind = 'none'
+        elif first is Request:
+            self.body_kind = 'request'
+        elif inspect.isclass(first) and issubclass(first, BaseModel):
+            self.body_kind = 'model'
+            self.body_model = first
+        else:
+            self.body_kind = 'kwargs'
+
+    async def call_get(self, path_params: dict, query: dict):
+        return await self.endpoint(**path_params, **query)
+
+    async def call_with_body(self, method: str, path: str, body, path_params: dict):
+        if self.body_kind == 'none':
+            return await self.endpoint()
+        if self.body_kind == 'request':
+            # Create fake Request Object
+            request = Request({"type": "http", "method": method, "path": path, "headers": {}})
+            request._json = body
+            return await self.endpoint(request)
+        if self.body_kind == 'model':
+            return await self.endpoint(self.body_model(**body))
+        arguments = {key: value for key, value in (body or {}).items() if key in self.parameters} \
+            if isinstance(body, dict) else {}
+        return await self.endpoint(**path_params, **arguments)
+
+
+class NatsRouteTable:
+    """
+    (method, path) -> endpoint table of the FastAPI routes, built once.
+
+    📌 Static paths are a dict lookup; the paths with parameters (e.g. /v1/backups/{name}) are matched with the
+    compiled regex of their route, converted as FastAPI does.
+    """
+
+    def __init__(self, app: FastAPI):
+        self._static: Dict[Tuple[str, str], RouteBinding] = {}
+        self._dynamic: Dict[str, List[Tuple[object, dict, RouteBinding]]] = {}
+        self._add_routes(app.routes, '')
+
+    def _add_routes(self, routes, prefix: str):
+        for route in routes:
+            if isinstance(route, APIRoute):
+                if (route.openapi_extra or {}).get('x-nats-excluded'):
+                    continue
+                path = prefix + route.path
+                binding = RouteBinding(route.endpoint, path)
+                path_regex, _, convertors = compile_path(path)
+                for method in route.methods:
+                    if convertors:
+                        self._dynamic.setdefault(method, []).append((path_regex, convertors, binding))
+                    else:
+                        # the first declared route wins, as in the routing of the app
+                        self._static.setdefault((method, path), binding)
+            elif isinstance(route, Mount) and hasattr(route.app, 'routes'):
+                self._add_routes(route.app.routes, prefix + route.path.rstrip('/'))
+
+    def resolve(self, method: str, path: str) -> Optional[Tuple[RouteBinding, dict]]:
+        method = method.upper()
+        binding = self._static.get((method, path))
+        if binding is not None:
+            return binding, {}
+        for path_regex, convertors, binding in self._dynamic.get(method, ()):
+            match = path_regex.match(path)
+            if match:
+                return binding, {name: convertors[name].convert(value) for name, value in match.groupdict().items()}
+        return None
+
+    def __len__(self):
+        return len(self._static) + sum(len(routes) for routes in self._dynamic.values())
@@ -0,0 +1,197 @@
+import bisect
+import calendar
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import ResourceIndexer, resource_cache
+
+SCHEDULE_LABEL = 'velero.io/schedule-name'
+IN_PROGRESS_WINDOW_SEC = 180
+
+Key = Tuple[str, str]
+
+
+def parse_k8s_timestamp(value: Optional[str]) -> Optional[float]:
+    """Convert a Kubernetes RFC3339 timestamp (e.g. 2024-01-01T00:00:00Z) into epoch seconds"""
+    if not value:
+        return None
+    try:
+        return float(calendar.timegm(time.strptime(value, '%Y-%m-%dT%H:%M:%SZ')))
+    except (TypeError, ValueError):
+        return None
+
+
+class BackupIndex(ResourceIndexer):
+    """
+    Secondary indexes over the backups, maintained incrementally from the watch events.
+
+    📌 by schedule name (None for manual backups), lower-cased phase and storage location.
+    📌 latest backup (by creationTimestamp) of every schedule.
+    📌 completion timestamps kept sorted, so "completed in the last N seconds" is a bisect.
+    """
+
+    def __init__(self):
+        self.objects: Dict[Key, dict] = {}
+        self.by_schedule: Dict[Optional[str], Set[Key]] = defaultdict(set)
+        self.by_phase: Dict[str, Set[Key]] = defaultdict(set)
+        self.by_storage_location: Dict[Optional[str], Set[Key]] = defaultdict(set)
+        self.latest_per_schedule: Dict[str, Key] = {}
+        self._completion: Dict[Key, float] = {}
+        self._completion_times: List[float] = []
+        self._completion_keys: List[Key] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> 'BackupIndex':
+        index = cls()
+        index.rebuild({(item.get('metadata', {}).get('namespace', ''),
+                        item.get('metadata', {}).get('name', '')): item for item in items})
+        return index
+
+    @staticmethod
+    def schedule_of(obj: dict) -> Optional[str]:
+        return (obj.get('metadata', {}).get('labels') or {}).get(SCHEDULE_LABEL) or None
+
+    @staticmethod
+    def phase_of(obj: dict) -> str:
+        return (obj.get('status', {}).get('phase') or '').lower()
+
+    @staticmethod
+    def storage_location_of(obj: dict) -> Optional[str]:
+        return obj.get('spec', {}).get('storageLocation')
+
+    @staticmethod
+    def _discard(index: dict, value, key: Key):
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[value]
+
+    def _creation(self, key: Key) -> str:
+        return self.objects[key].get('metadata', {}).get('creationTimestamp') or ''
+
+    def _is_newer(self, key: Key, other: Key) -> bool:
+        """Most recent creationTimestamp wins, ties go to the first (namespace, name) as in a LIST"""
+        creation, other_creation = self._creation(key), self._creation(other)
+        return creation > other_creation or (creation == other_creation and key < other)
+
+    def _latest_of(self, keys: Iterable[Key]) -> Optional[Key]:
+        latest = None
+        for key in keys:
+            if latest is None or self._is_newer(key, latest):
+                latest = key
+        return latest
+
+    def rebuild(self, items: Dict[Key, dict]):
+        self.__init__()
+        for key, obj in items.items():
+            self.add(key, obj)
+
+    def add(self, key: Key, obj: dict):
+        self.objects[key] = obj
+        schedule = self.schedule_of(obj)
+        self.by_schedule[schedule].add(key)
+        self.by_phase[self.phase_of(obj)].add(key)
+        self.by_storage_location[self.storage_location_of(obj)].add(key)
+
+        if schedule is not None:
+            latest = self.latest_per_schedule.get(schedule)
+            if latest is None or self._is_newer(key, latest):
+                self.latest_per_schedule[schedule] = key
+
+        completion = parse_k8s_timestamp(obj.get('status', {}).get('completionTimestamp'))
+        if completion is not None:
+            position = bisect.bisect_right(self._completion_times, completion)
+            self._completion_times.insert(position, completion)
+            self._completion_keys.insert(position, key)
+            self._completion[key] = completion
+
+    def remove(self, key: Key):
+        obj = self.objects.get(key)
+        if obj is None:
+            return
+
+        schedule = self.schedule_of(obj)
+        self._discard(self.by_schedule, schedule, key)
+        self._discard(self.by_phase, self.phase_of(obj), key)
+        self._discard(self.by_storage_location, self.storage_location_of(obj), key)
+
+        completion = self._completion.pop(key, None)
+        if completion is not None:
+            position = bisect.bisect_left(self._completion_times, completion)
+            while self._completion_keys[position] != key:
+                position += 1
+            del self._completion_times[position]
+            del self._completion_keys[position]
+
+        del self.objects[key]
+
+        # only the schedule that lost its latest backup is rescanned
+        if schedule is not None and self.latest_per_schedule.get(schedule) == key:
+            remaining = self.by_schedule.get(schedule)
+            if remaining:
+                self.latest_per_schedule[schedule] = self._latest_of(remaining)
+            else:
+                del self.latest_per_schedule[schedule]
+
+    def completed_since(self, since: float) -> List[Key]:
+        """Keys of the backups completed after `since` (epoch seconds), most recent first"""
+        position = bisect.bisect_right(self._completion_times, since)
+        return self._completion_keys[position:][::-1]
+
+    def latest_completed(self, count: int) -> List[Key]:
+        """Keys of the last `count` completed backups, most recent first"""
+        return self._completion_keys[-count:][::-1] if count > 0 else []
+
+    def in_progress_keys(self, now: Optional[float] = None) -> Set[Key]:
+        """Backups still running, or completed in the last IN_PROGRESS_WINDOW_SEC seconds"""
+        now = time.time() if now is None else now
+        keys = set(self.completed_since(now - IN_PROGRESS_WINDOW_SEC))
+        for phase, phase_keys in self.by_phase.items():
+            if phase.endswith('ing') or phase == 'inprogress':
+                keys |= phase_keys
+        return keys
+
+    def query(self,
+              schedule_name: Optional[str] = None,
+              latest_per_schedule: bool = False,
+              in_progress: bool = False,
+              storage_location: Optional[str] = None) -> List[dict]:
+        """Apply the backup list filters through the indexes, results are ordered by (namespace, name)"""
+        candidates: Optional[Set[Key]] = None
+
+        def narrow(keys: Set[Key]):
+            nonlocal candidates
+            candidates = set(keys) if candidates is None else candidates & keys
+
+        if schedule_name:
+            narrow(self.by_schedule.get(schedule_name, set()))
+        if storage_location:
+            narrow(self.by_storage_location.get(storage_location, set()))
+        if in_progress:
+            narrow(self.in_progress_keys())
+
+        if latest_per_schedule:
+            if candidates is None:
+                candidates = set(self.by_schedule.get(None, set()))
+                candidates.update(self.latest_per_schedule.values())
+            else:
+                latest: Dict[str, Key] = {}
+                manual: Set[Key] = set()
+                for key in candidates:
+                    schedule = self.schedule_of(self.objects[key])
+                    if schedule is None:
+                        manual.add(key)
+                    elif schedule not in latest or self._is_newer(key, latest[schedule]):
+                        latest[schedule] = key
+                candidates = manual | set(latest.values())
+        elif candidates is None:
+            candidates = self.objects.keys()
+
+        return [self.objects[key] for key in sorted(candidates)]
+
+
+backup_index = BackupIndex()
+resource_cache.store(RESOURCES[ResourcesNames.BACKUP].plural).add_indexer(backup_index)
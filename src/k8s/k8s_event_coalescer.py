@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from vui_common.logger.logger_proxy import logger
+
+from k8s.k8s_resource_cache import ResourceStore
+from utils.event_envelope import EventEnvelope
+
+WATCH_COALESCE_WINDOW_SEC = float(os.getenv('WATCH_COALESCE_WINDOW_SEC', '1'))
+WATCH_BROADCAST_DELTAS = os.getenv('WATCH_BROADCAST_DELTAS', 'false').lower() == 'true'
+
+# Annotations rewritten by the clients on every apply, useless to the UI
+NOISY_ANNOTATIONS = ('kubectl.kubernetes.io/last-applied-configuration',)
+
+
+def strip_noise(obj: dict) -> dict:
+    """Copy of a resource without managedFields and the noisy annotations (the cached object is left untouched)"""
+    metadata = obj.get('metadata')
+    if not metadata:
+        return obj
+    metadata = {key: value for key, value in metadata.items() if key != 'managedFields'}
+    annotations = metadata.get('annotations')
+    if annotations and any(name in annotations for name in NOISY_ANNOTATIONS):
+        metadata['annotations'] = {name: value for name, value in annotations.items()
+                                   if name not in NOISY_ANNOTATIONS}
+    return {**obj, 'metadata': metadata}
+
+
+def _escape(key: str) -> str:
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def json_diff(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """
+    RFC 6902 JSON patch turning `old` into `new`.
+
+    📌 Objects are compared key by key, lists and scalars are replaced as a whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            if key not in new:
+                operations.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key, value in new.items():
+            if key not in old:
+                operations.append({'op': 'add', 'path': f'{path}/{_escape(key)}', 'value': value})
+            else:
+                operations += json_diff(old[key], value, f'{path}/{_escape(key)}')
+        return operations
+    if old == new and type(old) is type(new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _without_resource_version(obj: dict) -> dict:
+    metadata = {key: value for key, value in obj.get('metadata', {}).items() if key != 'resourceVersion'}
+    return {**obj, 'metadata': metadata}
+
+
+def _content_digest(obj: dict) -> str:
+    content = json.dumps(_without_resource_version(obj), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class BroadcastCoalescer:
+    """
+    Batches the broadcast events of a plural.
+
+    📌 Events of the same object received within the window are merged, the last one wins (an ADDED followed by
+    MODIFIED is still sent as ADDED).
+    📌 Updates that change nothing but resourceVersion and the stripped fields are not sent at all.
+    📌 With deltas enabled, MODIFIED events carry a JSON patch against the previously sent version
+    (`base_resource_version`) instead of the whole object.
+    📌 Only the deltas need the previously sent objects: without them a digest per object is kept.
+    """
+
+    def __init__(self, plural: str, send_message, window: float = WATCH_COALESCE_WINDOW_SEC,
+                 deltas: bool = WATCH_BROADCAST_DELTAS):
+        self.plural = plural
+        self.send_message = send_message
+        self.window = max(0.0, window)
+        self.deltas = deltas
+        self.received = 0
+        self.sent = 0
+        self._pending: OrderedDict = OrderedDict()
+        # previously sent object (deltas) or its digest
+        self._last_sent: Dict[Tuple[str, str], Union[dict, str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def submit(self, event_type: str, obj: dict):
+        self.received += 1
+        key = ResourceStore.key(obj)
+        pending = self._pending.get(key)
+        if pending is not None and pending[0] == 'ADDED' and event_type == 'MODIFIED':
+            event_type = 'ADDED'
+        self._pending[key] = (event_type, strip_noise(obj))
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def cancel(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        self._pending.clear()
+        self._last_sent.clear()
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, OrderedDict()
+        for key, (event_type, obj) in pending.items():
+            payload = self._payload(key, event_type, obj)
+            if payload is None:
+                continue
+            message = EventEnvelope.build("global_watch", "event", payload)
+            logger.watch(f"📢 Event on {self.plural}: {message}")
+            try:
+                await self.send_message(message)
+                self.sent += 1
+            except Exception as e:
+                logger.error(f"⚠️ Error broadcasting the {self.plural} event: {e}")
+
+    def _payload(self, key, event_type: str, obj: dict) -> Optional[dict]:
+        previous = self._last_sent.get(key)
+        current = obj if self.deltas else _content_digest(obj)
+        if event_type == 'MODIFIED' and previous is not None:
+            unchanged = (_without_resource_version(previous) == _without_resource_version(obj) if self.deltas
+                         else previous == current)
+            if unchanged:
+                # the clients keep the version they have, deltas stay based on it
+                return None
+
+        if event_type == 'DELETED':
+            self._last_sent.pop(key, None)
+        else:
+            self._last_sent[key] = current
+
+        if event_type == 'MODIFIED' and previous is not None and self.deltas:
+            return {"resources": self.plural,
+                    "event_type": event_type,
+                    "name": key[1],
+                    "namespace": key[0],
+                    "base_resource_version": previous.get('metadata', {}).get('resourceVersion'),
+                    "patch": json_diff(previous, obj)}
+
+        return {"resources": self.plural,
+                "event_type": event_type,
+                "resource": obj}
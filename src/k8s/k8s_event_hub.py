@@ -0,0 +1,124 @@
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+from vui_common.logger.logger_proxy import logger
+
+from k8s.k8s_event_coalescer import strip_noise
+from k8s.k8s_resource_cache import ResourceStore
+from utils.event_envelope import EventEnvelope
+
+WATCH_SUBSCRIBER_QUEUE_SIZE = int(os.getenv('WATCH_SUBSCRIBER_QUEUE_SIZE', '100'))
+WATCH_SUBSCRIBER_POLICY = os.getenv('WATCH_SUBSCRIBER_POLICY', 'coalesce')
+
+
+class WatchEvent:
+    """Event published to the subscribers, its user message is serialized once for all of them"""
+
+    __slots__ = ('plural', 'event_type', 'obj', '_envelope')
+
+    def __init__(self, plural: str, event_type: str, obj: dict):
+        self.plural = plural
+        self.event_type = event_type
+        self.obj = obj
+        self._envelope = None
+
+    def envelope(self) -> EventEnvelope:
+        if self._envelope is None:
+            self._envelope = EventEnvelope.build("user_watch", "event", {
+                "resources": self.plural,
+                "event_type": self.event_type,
+                "resource": strip_noise(self.obj)
+            })
+        return self._envelope
+
+
+class Subscription:
+    """
+    Bounded queue of the watch events of a single subscriber.
+
+    📌 coalesce: pending events of the same object are replaced by the last one, the oldest is dropped when full.
+    📌 drop_oldest / drop_newest: every event is queued, the oldest / the incoming one is dropped when full.
+    """
+
+    POLICIES = ('coalesce', 'drop_oldest', 'drop_newest')
+
+    def __init__(self, topic: Tuple[str, str], max_queue: int = WATCH_SUBSCRIBER_QUEUE_SIZE,
+                 policy: str = WATCH_SUBSCRIBER_POLICY):
+        if policy not in self.POLICIES:
+            logger.warning(f"⚠️ Unknown watch subscriber policy {policy}, using coalesce")
+            policy = 'coalesce'
+        self.topic = topic
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._pending: OrderedDict = OrderedDict()
+        self._sequence = 0
+        self._ready = asyncio.Event()
+
+    def put(self, event: WatchEvent):
+        if self.policy == 'coalesce':
+            key = ResourceStore.key(event.obj)
+        else:
+            self._sequence += 1
+            key = self._sequence
+
+        if key in self._pending:
+            # last write wins, the event keeps its position in the queue
+            self._pending[key] = event
+            self.coalesced += 1
+        else:
+            if len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                if self.policy == 'drop_newest':
+                    return
+                self._pending.popitem(last=False)
+            self._pending[key] = event
+        self._ready.set()
+
+    async def get(self) -> WatchEvent:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pending.popitem(last=False)[1]
+
+    def __len__(self):
+        return len(self._pending)
+
+
+class EventHub:
+    """In-process pub/sub of the watch events: one upstream watch per (plural, namespace), any number of subscribers"""
+
+    def __init__(self):
+        self._subscriptions: Dict[Tuple[str, str], Set[Subscription]] = {}
+
+    def subscribe(self, plural: str, namespace: str, **kwargs) -> Subscription:
+        subscription = Subscription((plural, namespace), **kwargs)
+        self._subscriptions.setdefault(subscription.topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.topic)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.topic]
+
+    def topics(self) -> List[Tuple[str, str]]:
+        return list(self._subscriptions)
+
+    def subscribers(self, plural: str, namespace: str) -> int:
+        return len(self._subscriptions.get((plural, namespace), ()))
+
+    def publish(self, plural: str, namespace: str, event_type: str, obj: dict):
+        subscriptions = self._subscriptions.get((plural, namespace))
+        if not subscriptions:
+            return
+        event = WatchEvent(plural, event_type, obj)
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+event_hub = EventHub()
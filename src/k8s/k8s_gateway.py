@@ -0,0 +1,120 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from fastapi import HTTPException
+from kubernetes import client
+
+from vui_common.logger.logger_proxy import logger
+
+K8S_GATEWAY_MAX_WORKERS = int(os.getenv('K8S_GATEWAY_MAX_WORKERS', '16'))
+K8S_GATEWAY_MAX_LIST_CALLS = int(os.getenv('K8S_GATEWAY_MAX_LIST_CALLS', '4'))
+K8S_GATEWAY_TIMEOUT_SEC = float(os.getenv('K8S_GATEWAY_TIMEOUT_SEC', '30'))
+
+
+class K8sGateway:
+    """
+    Runs the blocking `kubernetes` client calls on a bounded thread pool so the event loop never waits on
+    the API server.
+
+    📌 Every call is bounded by a timeout (also forwarded to the client as `_request_timeout`).
+    📌 LIST calls share a smaller concurrency budget, so heavy collections cannot starve the other requests.
+    """
+
+    def __init__(self,
+                 max_workers: int = K8S_GATEWAY_MAX_WORKERS,
+                 max_list_calls: int = K8S_GATEWAY_MAX_LIST_CALLS,
+                 timeout: float = K8S_GATEWAY_TIMEOUT_SEC):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='k8s-gateway')
+        self._calls_semaphore = asyncio.Semaphore(max_workers)
+        self._list_semaphore = asyncio.Semaphore(max(1, min(max_list_calls, max_workers)))
+
+    async def call(self, fn, *args, timeout: float | None = None, **kwargs):
+        """Execute a blocking client method in the pool and return its result"""
+        timeout = timeout or self.timeout
+        kwargs.setdefault('_request_timeout', timeout)
+
+        is_list = getattr(fn, '__name__', '').startswith('list_')
+        semaphores = [self._calls_semaphore] + ([self._list_semaphore] if is_list else [])
+        try:
+            return await self._execute(partial(fn, *args, **kwargs), semaphores, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"⏳ Kubernetes call {getattr(fn, '__name__', fn)} timed out after {timeout} seconds")
+            raise HTTPException(status_code=504,
+                                detail=f"Kubernetes API call timed out after {timeout} seconds")
+
+    async def run(self, fn, *args, timeout: float | None = None, **kwargs):
+        """Execute any blocking function in the pool (no `_request_timeout` is injected)"""
+        timeout = timeout or self.timeout
+        try:
+            return await self._execute(partial(fn, *args, **kwargs), [self._calls_semaphore], timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"⏳ Kubernetes task {getattr(fn, '__name__', fn)} timed out after {timeout} seconds")
+            raise HTTPException(status_code=504,
+                                detail=f"Kubernetes API call timed out after {timeout} seconds")
+
+    async def _execute(self, job, semaphores, timeout: float):
+        """
+        Run a job in the pool holding the semaphores until its thread completes.
+
+        📌 A timeout (or a cancellation) only stops the wait: the thread keeps running, so its slots are released
+        by the executor future, never before, and the pool is not oversubscribed.
+        """
+        acquired = []
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            future = asyncio.get_running_loop().run_in_executor(self._executor, job)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+
+        def release(_):
+            for semaphore in acquired:
+                semaphore.release()
+
+        future.add_done_callback(release)
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+
+    def api(self, api_class, *args, **kwargs):
+        """Return an awaitable wrapper around a `kubernetes.client` API class"""
+        return AsyncApi(self, api_class(*args, **kwargs))
+
+
+class AsyncApi:
+    """
+    Awaitable proxy of a synchronous `kubernetes.client` API instance.
+
+    `await AsyncApi(gateway, client.CoreV1Api()).list_namespace()` behaves as the original method, executed
+    through the gateway.
+    """
+
+    def __init__(self, gateway: K8sGateway, api):
+        self._gateway = gateway
+        self._api = api
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+
+        async def _call(*args, **kwargs):
+            return await self._gateway.call(attr, *args, **kwargs)
+
+        _call.__name__ = name
+        return _call
+
+
+k8s_gateway = K8sGateway()
+
+
+def custom_objects_api() -> AsyncApi:
+    return k8s_gateway.api(client.CustomObjectsApi)
+
+
+def core_v1_api() -> AsyncApi:
+    return k8s_gateway.api(client.CoreV1Api)
@@ -0,0 +1,67 @@
+from typing import Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from k8s.k8s_resource_cache import ResourceIndexer, ResourceStore, resource_cache
+
+Model = TypeVar('Model', bound=BaseModel)
+
+
+class ModelCache(ResourceIndexer):
+    """
+    Pydantic models of the resources of a plural, validated once per resourceVersion.
+
+    📌 Data coming from the API server is validated the first time it is seen, the following requests reuse the
+    same model instance until the object changes: callers must not mutate the returned models.
+    📌 Registered on the plural store, so entries are dropped when the object is modified or deleted.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], Dict[type, Tuple[str, BaseModel]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def rebuild(self, items):
+        self._models = {key: models for key, models in self._models.items() if key in items}
+
+    def add(self, key, obj):
+        pass
+
+    def remove(self, key):
+        self._models.pop(key, None)
+
+    def validate(self, schema: Type[Model], item: dict) -> Model:
+        resource_version = item.get('metadata', {}).get('resourceVersion')
+        if not resource_version:
+            return schema.model_validate(item)
+
+        models = self._models.setdefault(ResourceStore.key(item), {})
+        cached = models.get(schema)
+        if cached is not None and cached[0] == resource_version:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        model = schema.model_validate(item)
+        models[schema] = (resource_version, model)
+        return model
+
+
+_model_caches: Dict[str, ModelCache] = {}
+
+
+def model_cache(plural: str) -> ModelCache:
+    if plural not in _model_caches:
+        _model_caches[plural] = ModelCache()
+        resource_cache.store(plural).add_indexer(_model_caches[plural])
+    return _model_caches[plural]
+
+
+def build_models(plural: str, schema: Type[Model], items: List[dict]) -> List[Model]:
+    """Response models of trusted K8s items, reusing the ones already validated for the same resourceVersion"""
+    cache = model_cache(plural)
+    return [cache.validate(schema, item) for item in items]
+
+
+def build_model(plural: str, schema: Type[Model], item: dict) -> Model:
+    return model_cache(plural).validate(schema, item)
@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+from constants.velero import VELERO
+from k8s.k8s_gateway import custom_objects_api
+
+custom_objects = custom_objects_api()
+
+
+class ResourceIndexer(ABC):
+    """Secondary index kept in sync by a `ResourceStore` (see `ResourceStore.add_indexer`)"""
+
+    @abstractmethod
+    def rebuild(self, items: Dict[Tuple[str, str], dict]):
+        ...
+
+    @abstractmethod
+    def add(self, key: Tuple[str, str], obj: dict):
+        ...
+
+    @abstractmethod
+    def remove(self, key: Tuple[str, str]):
+        ...
+
+
+class ResourceStore:
+    """
+    Informer-style local copy of a single Velero plural.
+
+    📌 It is filled by the initial LIST of the global watch and kept up to date by its ADDED/MODIFIED/DELETED events.
+    📌 Items are stored as received from the API server, keyed by (namespace, name): callers must not mutate them.
+    """
+
+    def __init__(self, plural: str):
+        self.plural = plural
+        self.resource_version: Optional[str] = None
+        self.synced = False
+        self.generation = 0
+        self._items: Dict[Tuple[str, str], dict] = {}
+        self._indexers: List[ResourceIndexer] = []
+
+    @staticmethod
+    def key(obj: dict) -> Tuple[str, str]:
+        metadata = obj.get('metadata', {})
+        return metadata.get('namespace', ''), metadata.get('name', '')
+
+    def add_indexer(self, indexer: ResourceIndexer):
+        indexer.rebuild(self._items)
+        self._indexers.append(indexer)
+
+    def replace(self, items: List[dict], resource_version: Optional[str]):
+        """Replace the whole content with the result of a LIST"""
+        self._items = {self.key(item): item for item in items}
+        for indexer in self._indexers:
+            indexer.rebuild(self._items)
+        self.resource_version = resource_version
+        self.synced = True
+        self.generation += 1
+        logger.watch(f"🗃️ Cache {self.plural} synced with {len(self._items)} items at resourceVersion "
+                     f"{resource_version}")
+
+    def apply(self, event_type: str, obj: dict):
+        """Apply a single watch event"""
+        resource_version = obj.get('metadata', {}).get('resourceVersion')
+
+        if event_type == 'BOOKMARK':
+            self.resource_version = resource_version
+            return
+
+        key = self.key(obj)
+        if key in self._items:
+            for indexer in self._indexers:
+                indexer.remove(key)
+
+        if event_type == 'DELETED':
+            self._items.pop(key, None)
+        else:
+            self._items[key] = obj
+            for indexer in self._indexers:
+                indexer.add(key, obj)
+
+        self.resource_version = resource_version
+        self.generation += 1
+
+    def invalidate(self):
+        """Mark the store as stale: readers fall back to the API server until the next LIST"""
+        self.synced = False
+
+    def list(self, namespace: Optional[str] = None) -> List[dict]:
+        if namespace is None:
+            return list(self._items.values())
+        return [item for (ns, _), item in self._items.items() if ns == namespace]
+
+    def get(self, name: str, namespace: str) -> Optional[dict]:
+        return self._items.get((namespace, name))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class K8sResourceCache:
+    def __init__(self):
+        self.stores: Dict[str, ResourceStore] = {}
+
+    def store(self, plural: str) -> ResourceStore:
+        if plural not in self.stores:
+            self.stores[plural] = ResourceStore(plural)
+        return self.stores[plural]
+
+    def synced_store(self, plural: str) -> Optional[ResourceStore]:
+        store = self.stores.get(plural)
+        return store if store is not None and store.synced else None
+
+    def invalidate_all(self):
+        for store in self.stores.values():
+            store.invalidate()
+
+
+resource_cache = K8sResourceCache()
+
+
+async def list_velero_resources(plural: str) -> List[dict]:
+    """Return the items of a Velero plural, from the local cache when it is in sync"""
+    store = resource_cache.synced_store(plural)
+    if store is not None:
+        return store.list(config_app.k8s.velero_namespace)
+
+    response = await custom_objects.list_namespaced_custom_object(
+        group=VELERO["GROUP"],
+        version=VELERO["VERSION"],
+        namespace=config_app.k8s.velero_namespace,
+        plural=plural
+    )
+    return response.get("items", [])
+
+
+async def get_velero_resource(plural: str, name: str) -> dict:
+    """Return a single Velero resource, from the local cache when it is in sync"""
+    store = resource_cache.synced_store(plural)
+    if store is not None:
+        item = store.get(name, config_app.k8s.velero_namespace)
+        if item is not None:
+            return item
+
+    return await custom_objects.get_namespaced_custom_object(
+        group=VELERO["GROUP"],
+        version=VELERO["VERSION"],
+        namespace=config_app.k8s.velero_namespace,
+        plural=plural,
+        name=name
+    )
@@ -1,17 +1,31 @@
 import asyncio
-import json
-from datetime import datetime
 import traceback
 from kubernetes_asyncio import client, config, watch
 from vui_common.logger.logger_proxy import logger
 from vui_common.configs.config_proxy import config_app
 
+from k8s.k8s_event_coalescer import BroadcastCoalescer
+from k8s.k8s_event_hub import event_hub
+from k8s.k8s_resource_cache import resource_cache
+from k8s.k8s_watch_metrics import WATCH_STALE_AFTER_FAILURES, WATCH_TIMEOUT_SEC, WatchMetrics, backoff_delay
+
 
 class K8sWatchManager:
     def __init__(self, send_global_callback, send_user_callback):
         self.watch_running = False
         self.watch_tasks = []
         self.user_watch_tasks = {}
+        # Upstream watches started on demand for the user subscriptions not covered by the Global Watch
+        self.shared_watch_tasks = {}
+        self.watch_metrics = {}
+        # Broadcast events of the Global Watch, batched per plural
+        self.coalescers = {}
+        self._kube_config_loaded = False
+        self._kube_config_lock = asyncio.Lock()
+
+        self.resources = ["backups", "restores", "serverstatusrequests", "downloadrequests", "deletebackuprequests"]
+        # Resources watched only to keep the local cache in sync (no broadcast)
+        self.cache_only_resources = ["schedules", "backupstoragelocations", "backuprepositories"]
 
         self.send_global_message = send_global_callback
         self.send_user_message = send_user_callback
@@ -21,12 +35,20 @@ class K8sWatchManager:
         if not self.watch_running:
             logger.watch("🟢 Starting Global Watch...")
             self.watch_running = True
-            resources = ["backups", "restores", "serverstatusrequests", "downloadrequests", "deletebackuprequests"]
 
             # Start a task for each resource and keep them in the list
             self.watch_tasks = [
                 asyncio.create_task(self.watch_velero_resource(resource, config_app.k8s.velero_namespace)) for resource
-                in resources]
+                in self.resources]
+            self.watch_tasks += [
+                asyncio.create_task(self.watch_velero_resource(resource, config_app.k8s.velero_namespace,
+                                                               broadcast=False))
+                for resource in self.cache_only_resources]
+
+            # The shared watches of the globally watched plurals are now redundant
+            for plural, namespace in list(self.shared_watch_tasks):
+                if self._globally_watched(plural, namespace):
+                    self.shared_watch_tasks.pop((plural, namespace)).cancel()
 
     async def stop_global_watch_tasks(self):
         """Stop all Global Watch."""
@@ -36,86 +58,161 @@ class K8sWatchManager:
             for task in self.watch_tasks:
                 task.cancel()
             self.watch_tasks.clear()
-
-    async def watch_velero_resource(self, plural, namespace):
-        """Monitor a single Velero resource and send WebSocket notifications without blocking the loop"""
-        # Load Kubernetes configuration
-        try:
-            config.load_incluster_config()
-            # logger.info("Kubernetes in cluster mode....")
-        except config.ConfigException:
-            # Use local kubeconfig file if running locally
-            await config.load_kube_config(config_file=config_app.k8s.kube_config)
-            # logger.info("Kubernetes load local kube config...")
-
-        crd_api = client.CustomObjectsApi()
-        w = watch.Watch()
-
-        try:
-            # Get the latest version to avoid duplicate events
-            response = await crd_api.list_namespaced_custom_object(
-                group="velero.io",
-                version="v1",
-                namespace=namespace,
-                plural=plural
-            )
-            last_resource_version = response.get("metadata", {}).get("resourceVersion")
-
-            logger.watch(f"📌 Beginning monitoring of {plural} from resourceVersion: {last_resource_version}")
-
-            while self.watch_running:
-                try:
-                    async for event in w.stream(
-                            crd_api.list_namespaced_custom_object,
-                            group='velero.io',
-                            version='v1',
-                            namespace=namespace,
-                            plural=plural,
-                            resource_version=last_resource_version,
-                            timeout_seconds=60
-                    ):
-                        event_type = event["type"]
-                        resource_name = event["object"]["metadata"]["name"]
-
-                        # Update resourceVersion to avoid duplicate events
-                        last_resource_version = event["object"]["metadata"]["resourceVersion"]
-
-                        message = json.dumps({
-                            "type": "global_watch",
-                            "kind": "event",
-                            "payload": {
-                                "resources": plural,
-                                "resource": event["object"]
-                            },
-                            'timestamp': datetime.utcnow().isoformat(),
-                            'agent_name': config_app.k8s.cluster_id
-                        })
-
-                        logger.watch(f"📢 Event on {plural}: {message}")
-                        # await self.broadcast(message)
-                        await self.send_global_message(message)
-
-                except client.exceptions.ApiException as e:
-                    logger.error(f"❌ Unexpected error: {str(e)}\n{traceback.format_exc()}")
-                    if e.status == 410:  # ResourceVersion too old
-                        logger.watch(f"⚠️ ResourceVersion expired for {plural}, reset...")
-                        return await self.watch_velero_resource(plural, namespace)  # Restart the watch
-                    else:
-                        logger.error(f"❌ API error in the watch of {plural}: {e}")
-                except Exception as e:
-                    logger.error(f"❌ Unexpected error: {str(e)}\n{traceback.format_exc()}")
-                    logger.error(f"⚠️ General error in the watch of {plural}: {e}")
-                finally:
-                    # TODO: check why it disconnects
-                    logger.info(f"🔄 Reconnection to {plural} in 2 seconds...")
+            for coalescer in self.coalescers.values():
+                coalescer.cancel()
+            self.coalescers.clear()
+            resource_cache.invalidate_all()
+
+            # Keep feeding the users still subscribed to the globally watched plurals
+            for plural, namespace in event_hub.topics():
+                self._acquire_upstream_watch(plural, namespace)
+
+    async def _load_kube_config(self):
+        """Load the Kubernetes configuration once for all the watches"""
+        async with self._kube_config_lock:
+            if self._kube_config_loaded:
+                return
+            try:
+                config.load_incluster_config()
+                # logger.info("Kubernetes in cluster mode....")
+            except config.ConfigException:
+                # Use local kubeconfig file if running locally
+                await config.load_kube_config(config_file=config_app.k8s.kube_config)
+                # logger.info("Kubernetes load local kube config...")
+            self._kube_config_loaded = True
+
+    def _coalescer(self, plural):
+        if plural not in self.coalescers:
+            self.coalescers[plural] = BroadcastCoalescer(plural, self.send_global_message)
+        return self.coalescers[plural]
+
+    def metrics(self):
+        """Metrics of every watch, keyed by `plural/namespace`"""
+        return {f"{plural}/{namespace}": metrics.as_dict()
+                for (plural, namespace), metrics in self.watch_metrics.items()}
+
+    async def watch_velero_resource(self, plural, namespace, broadcast=True, shared=False):
+        """Monitor a single Velero resource, keep its local cache in sync, feed the event hub of the user
+        subscriptions and send WebSocket notifications without blocking the loop.
+
+        📌 The watch resumes from the last event or bookmark resourceVersion: the collection is listed again only at
+        startup and when the API server answers 410 Gone.
+        📌 Errors are retried with exponential backoff and jitter, the loop never recurses.
+        📌 `shared` watches are started for the user subscriptions only and run until they are cancelled."""
+        # the resource cache mirrors the velero namespace only: the shared watches of the other namespaces feed
+        # the event hub and never the cache
+        store = resource_cache.store(plural) if namespace == config_app.k8s.velero_namespace else None
+        metrics = self.watch_metrics.setdefault((plural, namespace), WatchMetrics())
+        resource_version = None
+        failures = 0
+
+        while self.watch_running or shared:
+            w = None
+            try:
+                await self._load_kube_config()
+                crd_api = client.CustomObjectsApi()
+
+                if resource_version is None:
+                    response = await crd_api.list_namespaced_custom_object(
+                        group="velero.io",
+                        version="v1",
+                        namespace=namespace,
+                        plural=plural
+                    )
+                    resource_version = response.get("metadata", {}).get("resourceVersion")
+                    if store is not None:
+                        store.replace(response.get("items", []), resource_version)
+                    metrics.relists += 1
+                    metrics.resource_version = resource_version
+                    logger.watch(f"📌 Beginning monitoring of {plural} from resourceVersion: {resource_version}")
+                else:
+                    metrics.reconnects += 1
+
+                w = watch.Watch()
+                async for event in w.stream(
+                        crd_api.list_namespaced_custom_object,
+                        group='velero.io',
+                        version='v1',
+                        namespace=namespace,
+                        plural=plural,
+                        resource_version=resource_version,
+                        allow_watch_bookmarks=True,
+                        timeout_seconds=WATCH_TIMEOUT_SEC
+                ):
+                    failures = 0
+                    event_type = event["type"]
+
+                    # Resume point of the next stream, bookmarks included
+                    resource_version = event["object"]["metadata"]["resourceVersion"]
+                    metrics.observe(event_type, event["object"])
+                    if store is not None:
+                        store.apply(event_type, event["object"])
+
+                    if event_type == "BOOKMARK":
+                        continue
+
+                    event_hub.publish(plural, namespace, event_type, event["object"])
+
+                    if broadcast:
+                        self._coalescer(plural).submit(event_type, event["object"])
+
+                # Server side timeout: resume immediately from the last resourceVersion
+                continue
+
+            except client.exceptions.ApiException as e:
+                metrics.errors += 1
+                if e.status == 410:  # ResourceVersion too old
+                    logger.watch(f"⚠️ ResourceVersion expired for {plural}, relisting...")
+                    resource_version = None
+                    continue
+                logger.error(f"❌ API error in the watch of {plural}: {e}")
+                if resource_version is None and store is not None:
+                    store.invalidate()
+            except Exception as e:
+                metrics.errors += 1
+                logger.error(f"❌ Unexpected error: {str(e)}\n{traceback.format_exc()}")
+                logger.error(f"⚠️ General error in the watch of {plural}: {e}")
+                if resource_version is None and store is not None:
+                    store.invalidate()
+            finally:
+                if w is not None:
                     await w.close()
-                    await asyncio.sleep(2)
 
-        except Exception as e:
-            logger.error(f"⚠️ Watch startup error for {plural}: {e}")
+            failures += 1
+            if failures >= WATCH_STALE_AFTER_FAILURES and store is not None and store.synced:
+                # the watch keeps failing: stop serving the cache and relist once it is back
+                logger.watch(f"⚠️ Cache {plural} marked stale after {failures} consecutive watch failures")
+                store.invalidate()
+                resource_version = None
+            delay = backoff_delay(failures)
+            logger.info(f"🔄 Reconnection to {plural} in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
 
     # User k8s watch
 
+    def _globally_watched(self, plural, namespace):
+        return (self.watch_running and namespace == config_app.k8s.velero_namespace
+                and plural in self.resources + self.cache_only_resources)
+
+    def _acquire_upstream_watch(self, plural, namespace):
+        """Make sure a single upstream watch feeds the event hub for (plural, namespace)"""
+        topic = (plural, namespace)
+        if self._globally_watched(plural, namespace) or topic in self.shared_watch_tasks:
+            return
+        logger.watch(f"🟢 Starting shared watch for {plural} in {namespace}...")
+        self.shared_watch_tasks[topic] = asyncio.create_task(
+            self.watch_velero_resource(plural, namespace, broadcast=False, shared=True))
+
+    def _release_upstream_watch(self, plural, namespace):
+        """Stop the shared watch of (plural, namespace) when its last subscriber is gone"""
+        topic = (plural, namespace)
+        if event_hub.subscribers(plural, namespace) or topic not in self.shared_watch_tasks:
+            return
+        logger.watch(f"🛑 Stopping shared watch for {plural} in {namespace}...")
+        self.shared_watch_tasks.pop(topic).cancel()
+        if namespace == config_app.k8s.velero_namespace and not self._globally_watched(plural, namespace):
+            resource_cache.store(plural).invalidate()
+
     async def clear_watch_user_resource(self, user_id):
         """
         Stops and removes all active watches for a given user.
@@ -132,7 +229,9 @@ class K8sWatchManager:
         """
         Allows a user to watch multiple resources (plurals) simultaneously.
 
-        📌 Each `plural` is watched separately, and a user can have multiple active watches.
+        📌 Each `plural` is a subscription to the event hub: all the users share the same upstream watch, started on
+        demand when the plural is not covered by the Global Watch.
+        📌 Every subscription has its own bounded queue, a slow user drops or coalesces its own events only.
         📌 If a user is already watching the requested resource type, the existing watch is not interrupted.
         """
 
@@ -150,93 +249,29 @@ class K8sWatchManager:
             logger.watch(f"ℹ️ [{user_id}] Already watching {plural}. No action taken.")
             return
 
-        # 📌 Load Kubernetes configuration
-        try:
-            config.load_incluster_config()
-            # logger.info("Kubernetes in cluster mode....")
-        except config.ConfigException:
-            # Use local kubeconfig file if running locally
-            await config.load_kube_config(config_file=config_app.k8s.kube_config)
-            # logger.info("Kubernetes load local kube config...")
-
-        crd_api = client.CustomObjectsApi()
-        w = watch.Watch()
-        last_resource_version = None
-        watch_target = f"all resources of type {plural}"
-
-        try:
-            # 📌 Get the latest resourceVersion to avoid duplicate events
-            response = await crd_api.list_namespaced_custom_object(
-                group="velero.io",
-                version="v1",
-                namespace=namespace,
-                plural=plural
-            )
-            last_resource_version = response.get("metadata", {}).get("resourceVersion")
-
-            logger.watch(
-                f"📌 [{user_id}] Starting watch for {watch_target} from resourceVersion: {last_resource_version}")
-
-        except client.exceptions.ApiException as e:
-            logger.watch(f"⚠️ [{user_id}] Error fetching resourceVersion for {watch_target}: {e}")
-            return
-        except Exception as e:
-            logger.watch(f"⚠️ [{user_id}] Unexpected error while fetching resourceVersion: {e}")
-            return
+        subscription = event_hub.subscribe(plural, namespace)
+        self._acquire_upstream_watch(plural, namespace)
 
         async def user_watch():
-            """Watches the selected resource type and sends updates to the user via WebSocket."""
-            nonlocal last_resource_version
-
-            # while user_id in self.active_connections:
-            while True:
-                try:
-                    async for event in w.stream(
-                            crd_api.list_namespaced_custom_object,
-                            group="velero.io",
-                            version="v1",
-                            namespace=namespace,
-                            plural=plural,
-                            resource_version=last_resource_version,
-                            timeout_seconds=10
-                    ):
-                        event_type = event["type"]
-                        event_resource = event["object"]
-
-                        # 🔄 Update resourceVersion to avoid processing old events
-                        last_resource_version = event_resource["metadata"]["resourceVersion"]
-
-                        message = json.dumps({
-                            "type": "user_watch",
-                            "kind": "event",
-                            "payload": {
-                                "resources": plural,
-                                "event_type": event_type,
-                                "resource": event_resource
-                            },
-                            'timestamp': datetime.utcnow().isoformat(),
-                            'agent_name': config_app.k8s.cluster_id
-                        })
-
-                        logger.watch(f"📢 [{user_id}] New event: {message}")
-                        # await self.send_personal_message(user_id, message)
+            """Sends the events of the subscription to the user via WebSocket."""
+            try:
+                while True:
+                    # the message is serialized once for all the subscribers of the event
+                    message = (await subscription.get()).envelope()
+
+                    logger.watch(f"📢 [{user_id}] New event: {message}")
+                    try:
                         await self.send_user_message(user_id, message)
-
-                except client.exceptions.ApiException as e:
-                    if e.status == 410:  # ResourceVersion too old, reset the watch
-                        logger.error(f"⚠️ [{user_id}] ResourceVersion expired for {watch_target}, restarting watch...")
-                        return await self.watch_user_resource(user_id, plural=plural, namespace=namespace)
-                    else:
-                        logger.error(f"❌ [{user_id}] API Error in watch for {watch_target}: {e}")
-                except Exception as e:
-                    logger.error(f"⚠️ [{user_id}] General error in watch for {watch_target}: {e}")
-                finally:
-                    # TODO: check why it disconnects
-                    logger.info(f"🔄 [{user_id}] Reconnecting to {watch_target} in 2 seconds...")
-                    await w.close()
-                    await asyncio.sleep(2)
-
-        # 📌 Start the watch as a separate async task and store it in the user's watch list
+                    except Exception as e:
+                        logger.error(f"⚠️ [{user_id}] Error sending {plural} event: {e}")
+            finally:
+                if subscription.dropped:
+                    logger.watch(f"⚠️ [{user_id}] {subscription.dropped} events of {plural} dropped by the slow "
+                                 f"consumer policy")
+                event_hub.unsubscribe(subscription)
+                self._release_upstream_watch(plural, namespace)
+
+        # 📌 Start the subscriber as a separate async task and store it in the user's watch list
         self.user_watch_tasks[user_id][plural] = asyncio.create_task(user_watch())
 
         logger.info(f"✅ [{user_id}] Now watching {plural}.")
@@ -0,0 +1,67 @@
+import os
+import random
+import time
+from typing import Optional
+
+from k8s.k8s_backup_index import parse_k8s_timestamp
+
+WATCH_TIMEOUT_SEC = int(os.getenv('WATCH_TIMEOUT_SEC', '300'))
+WATCH_BACKOFF_BASE_SEC = float(os.getenv('WATCH_BACKOFF_BASE_SEC', '1'))
+WATCH_BACKOFF_MAX_SEC = float(os.getenv('WATCH_BACKOFF_MAX_SEC', '60'))
+# Consecutive watch failures after which the cache is considered stale (readers fall back to the API server)
+WATCH_STALE_AFTER_FAILURES = int(os.getenv('WATCH_STALE_AFTER_FAILURES', '3'))
+
+
+def backoff_delay(failures: int,
+                  base: float = WATCH_BACKOFF_BASE_SEC,
+                  maximum: float = WATCH_BACKOFF_MAX_SEC) -> float:
+    """Exponential backoff with jitter: half of the delay is fixed, the other half random"""
+    delay = min(maximum, base * 2 ** max(0, failures - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _last_write(obj: dict) -> Optional[float]:
+    """Most recent write time known for an object (managedFields, or its creation)"""
+    metadata = obj.get('metadata', {})
+    times = [parse_k8s_timestamp(field.get('time')) for field in metadata.get('managedFields') or []]
+    times = [value for value in times if value is not None]
+    return max(times) if times else parse_k8s_timestamp(metadata.get('creationTimestamp'))
+
+
+class WatchMetrics:
+    """
+    Counters of a single watch (plural, namespace).
+
+    📌 reconnects: watch streams opened again after a timeout or an error, relists: full LIST requests (startup and
+    410 Gone only).
+    📌 event lag: delay between the last write of the object on the API server and the reception of its event
+    (second resolution, as the K8s timestamps).
+    """
+
+    def __init__(self):
+        self.resource_version = None
+        self.reconnects = 0
+        self.relists = 0
+        self.errors = 0
+        self.events = 0
+        self.bookmarks = 0
+        self.last_event_at = None
+        self.last_event_lag_sec = None
+        self.max_event_lag_sec = 0.0
+
+    def observe(self, event_type: str, obj: dict, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.resource_version = obj.get('metadata', {}).get('resourceVersion') or self.resource_version
+        if event_type == 'BOOKMARK':
+            self.bookmarks += 1
+            return
+
+        self.events += 1
+        self.last_event_at = now
+        written = _last_write(obj)
+        if written is not None:
+            self.last_event_lag_sec = max(0.0, now - written)
+            self.max_event_lag_sec = max(self.max_event_lag_sec, self.last_event_lag_sec)
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
@@ -6,13 +6,14 @@ from vui_common.app import create_base_app
 from api.common.app_health import appAgentHealth
 from api.v1.api_v1 import v1
 
-from startup_watchers import init_watchers
+from startup_watchers import init_watchers, stop_watchers
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_watchers(app)
     yield
+    await stop_watchers()
 
 
 app = create_base_app(component='agent', lifespan=lifespan)
@@ -0,0 +1,14 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from vui_common.schemas.response.successful_request import SuccessfulRequest
+
+
+class ListPagination(BaseModel):
+    continue_token: Optional[str] = None
+    remaining_item_count: Optional[int] = None
+
+
+class SuccessfulProjectedListResponse(SuccessfulRequest[List[Dict[str, Any]]]):
+    pagination: Optional[ListPagination] = None
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from models.k8s.restore import RestoreResponseSchema
 from vui_common.schemas.response.successful_request import SuccessfulRequest
+from schemas.response.successful_list import ListPagination
 
 
 class SuccessfulRestoreResponse(SuccessfulRequest[List[RestoreResponseSchema]]):
-    pass
+    pagination: Optional[ListPagination] = None
@@ -4,3 +4,17 @@ from pydantic import BaseModel
 
 class VeleroLog(BaseModel):
     logs: Optional[List[str]] = None
+
+
+class VeleroLogRecord(BaseModel):
+    line: int
+    time: Optional[str] = None
+    level: Optional[str] = None
+    msg: Optional[str] = None
+    resource: Optional[str] = None
+    namespace: Optional[str] = None
+    error: Optional[str] = None
+
+
+class VeleroLogRecords(BaseModel):
+    records: List[VeleroLogRecord] = []
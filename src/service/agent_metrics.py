@@ -0,0 +1,15 @@
+from vui_common.configs.config_proxy import config_app
+
+from integrations import nats_manager_proxy
+from k8s import k8s_watcher_proxy
+
+
+async def get_agent_metrics_service():
+    """Metrics of the background tasks of the agent: K8s watches and NATS cron jobs"""
+    watcher = k8s_watcher_proxy.k8s_watcher_manager
+    nats_manager = nats_manager_proxy.nat_manager
+    return {
+        'watches': watcher.metrics() if watcher is not None else {},
+        'nats_cron_jobs': nats_manager.kv_publisher.metrics()
+        if config_app.nats.enable and nats_manager is not None else {}
+    }
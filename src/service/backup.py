@@ -1,11 +1,16 @@
-from typing import List
+import copy
+from typing import List, Tuple
 
 from datetime import datetime
 
 from fastapi import HTTPException
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_model_cache import build_model, build_models
+from k8s.k8s_resource_cache import list_velero_resources, get_velero_resource, resource_cache
+from k8s.k8s_backup_index import BackupIndex, backup_index
 
 from service.utils.download_request import create_download_request
+from service.utils.list_options import paginate, project, projection_paths
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 from vui_common.configs.config_proxy import config_app
@@ -18,81 +23,85 @@ from schemas.request.create_backup import CreateBackupRequestSchema
 from models.k8s.backup import BackupResponseSchema
 from vui_common.logger.logger_proxy import logger
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
+
+
+BACKUP_SUMMARY_FIELDS = [('metadata', 'name'),
+                         ('metadata', 'namespace'),
+                         ('metadata', 'uid'),
+                         ('metadata', 'creationTimestamp'),
+                         ('metadata', 'labels', 'velero.io/schedule-name'),
+                         ('spec', 'storageLocation'),
+                         ('status', 'phase'),
+                         ('status', 'startTimestamp'),
+                         ('status', 'completionTimestamp'),
+                         ('status', 'expiration'),
+                         ('status', 'errors'),
+                         ('status', 'warnings'),
+                         ('status', 'validationErrors'),
+                         ('status', 'failureReason')]
+
+
+async def list_backups(schedule_name: str | None = None, latest_per_schedule: bool = False,
+                        in_progress: bool = False, storage_location: str | None = None) -> List[dict]:
+    """Velero backups matching the filters as raw items, ordered by (namespace, name)"""
+    plural = RESOURCES[ResourcesNames.BACKUP].plural
+
+    # The watch-fed cache keeps the indexes up to date, otherwise they are built on the listed items
+    if resource_cache.synced_store(plural) is not None:
+        index = backup_index
+    else:
+        index = BackupIndex.from_items(await list_velero_resources(plural))
+
+    return index.query(schedule_name=schedule_name,
+                       latest_per_schedule=latest_per_schedule,
+                       in_progress=in_progress,
+                       storage_location=storage_location)
 
 
 # @trace_k8s_async_method(description="Get backups list")
 async def get_backups_service(schedule_name: str | None = None, latest_per_schedule: bool = False,
-                              in_progress: bool = False) -> List[BackupResponseSchema]:
+                              in_progress: bool = False,
+                              storage_location: str | None = None) -> List[BackupResponseSchema]:
     """Retrieve all Velero backups"""
-    backups = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP].plural
-    )
-
-    filtered_backups = {}
-    now = datetime.utcnow()
-
-    for item in backups.get("items", []):
-        metadata = item["metadata"]
-        labels = metadata.get("labels", {})
-        backup_schedule_name = labels.get("velero.io/schedule-name")
-        creation_timestamp = metadata.get("creationTimestamp")
-        status = item.get("status", {})
-        phase = status.get("phase", "").lower()
-        completion_timestamp = status.get("completionTimestamp")
-
-        # If a `schedule_name` filter is specified, it skips backups that do not match
-        if schedule_name and backup_schedule_name != schedule_name:
-            continue
-
-        if in_progress:
-            has_completion_timestamp = completion_timestamp is not None
-            diff_in_seconds = None
-
-            if has_completion_timestamp:
-                datetime_completion_timestamp = datetime.strptime(completion_timestamp, '%Y-%m-%dT%H:%M:%SZ')
-                diff_in_seconds = (now - datetime_completion_timestamp).total_seconds()
-
-            if not (
-                    phase.endswith("ing") or
-                    phase == "inprogress" or
-                    (has_completion_timestamp and diff_in_seconds is not None and diff_in_seconds < 180)
-            ):
-                continue
-
-        # If `latest_per_schedule` is enabled, it saves only the last backup for each schedule
-        if latest_per_schedule and backup_schedule_name:
-            if backup_schedule_name in filtered_backups:
-                existing_timestamp = filtered_backups[backup_schedule_name]["metadata"]["creationTimestamp"]
-                if creation_timestamp > existing_timestamp:
-                    filtered_backups[backup_schedule_name] = item
-            else:
-                filtered_backups[backup_schedule_name] = item
-        else:
-            # If `latest_per_schedule` is disabled, add all backups
-            filtered_backups[metadata["uid"]] = item
+    backups = await list_backups(schedule_name=schedule_name,
+                                  latest_per_schedule=latest_per_schedule,
+                                  in_progress=in_progress,
+                                  storage_location=storage_location)
 
     # Let's build the backup list
-    backup_list = [BackupResponseSchema(**item) for item in filtered_backups.values()]
+    backup_list = build_models(RESOURCES[ResourcesNames.BACKUP].plural, BackupResponseSchema, backups)
     return backup_list
 
 
+async def get_backups_page_service(schedule_name: str | None = None, latest_per_schedule: bool = False,
+                                   in_progress: bool = False, storage_location: str | None = None,
+                                   limit: int | None = None, continue_token: str | None = None,
+                                   fields: str | None = None, summary: bool = False) -> Tuple[list, dict | None]:
+    """
+    Retrieve a page of Velero backups and its pagination info.
+
+    With `fields` or `summary` the items are projected raw dictionaries, otherwise `BackupResponseSchema`.
+    """
+    backups = await list_backups(schedule_name=schedule_name,
+                                  latest_per_schedule=latest_per_schedule,
+                                  in_progress=in_progress,
+                                  storage_location=storage_location)
+    backups, pagination = paginate(backups, limit, continue_token)
+
+    paths = projection_paths(fields, summary, BACKUP_SUMMARY_FIELDS)
+    if paths:
+        return [project(item, paths) for item in backups], pagination
+    return build_models(RESOURCES[ResourcesNames.BACKUP].plural, BackupResponseSchema, backups), pagination
+
+
 @trace_k8s_async_method(description="Get backup details")
 async def get_backup_details_service(backup_name: str) -> BackupResponseSchema:
     """Retrieve details of a single backup"""
 
-    backup = custom_objects.get_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP].plural,
-        name=backup_name
-    )
+    backup = await get_velero_resource(RESOURCES[ResourcesNames.BACKUP].plural, backup_name)
 
-    return BackupResponseSchema(**backup)
+    return build_model(RESOURCES[ResourcesNames.BACKUP].plural, BackupResponseSchema, backup)
 
 
 @trace_k8s_async_method(description="Delete backup")
@@ -113,7 +122,7 @@ async def delete_backup_service(backup_name: str):
         }
     }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -155,7 +164,7 @@ async def create_backup_service(backup_data: CreateBackupRequestSchema):
     if backup_data.resourcePolicy:
         backup_body['spec']["resourcePolicy"] = {'kind': 'configmap', 'name': backup_data.resourcePolicy}
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=backup_data.namespace,
@@ -169,13 +178,8 @@ async def create_backup_service(backup_data: CreateBackupRequestSchema):
 async def _get_schedule(schedule_name: str):
     """Retrieve Velero scheduling details"""
 
-    return custom_objects.get_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.SCHEDULE].plural,
-        name=schedule_name
-    )
+    # private copy: the backup body is built from it and the cached objects must not be changed
+    return copy.deepcopy(await get_velero_resource(RESOURCES[ResourcesNames.SCHEDULE].plural, schedule_name))
 
 @trace_k8s_async_method(description="Create backup from schedule name")
 async def create_backup_from_schedule_service(schedule_name: str):
@@ -237,7 +241,7 @@ async def create_backup_from_schedule_service(schedule_name: str):
         backup_body["spec"]["resourcePolicy"] = {"name": resource_policy.get("name")}
 
     # Create the backup using the Kubernetes API
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=namespace,
@@ -251,7 +255,7 @@ async def create_backup_from_schedule_service(schedule_name: str):
 @trace_k8s_async_method(description="Update backup expiration")
 async def update_backup_expiration_service(backup_name: str, expiration: str):
     # get backup object
-    backup = custom_objects.get_namespaced_custom_object(
+    backup = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -262,7 +266,7 @@ async def update_backup_expiration_service(backup_name: str, expiration: str):
     backup['status']['expiration'] = expiration
 
     # update ttl field
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
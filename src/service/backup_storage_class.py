@@ -1,16 +1,21 @@
 import os
 import json
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional
 
 from fastapi import HTTPException
 
-from service.utils.download_request import (create_download_request,
-                                            download_and_extract_backup)
+from service.utils.backup_content_cache import backup_content_cache
+from service.utils.backup_tar_stream import scan_tar_stream
+from service.utils.download_request import create_download_request
 
 from schemas.velero_storage_class import VeleroStorageClass
 
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
+# resources/persistentvolumeclaims/namespaces/<namespace>/<pvc>.json
+_PVC_MANIFEST_RE = re.compile(r'^resources/persistentvolumeclaims/namespaces/[^/]+/[^/]+\.json$')
+
 
 @trace_k8s_async_method(description="Get backup storage classes")
 async def get_backup_storage_classes_service(backup_name: str) -> VeleroStorageClass:
@@ -18,18 +23,14 @@ async def get_backup_storage_classes_service(backup_name: str) -> VeleroStorageC
     Retrieve the StorageClasses used in a Velero backup using a DownloadRequest.
     """
 
-    # Create a DownloadRequest to retrieve backup data
-    download_url = await create_download_request(backup_name, "BackupContents")
-    if not download_url:
-        raise HTTPException(status_code=400, detail=f"Create a DownloadRequest to retrieve backup data")
+    async with backup_content_cache.acquire_if_cached(backup_name) as extracted_path:
+        if extracted_path:
+            # Extracting StorageClasses from PVCs of the backup already extracted
+            storage_classes = await _extract_storage_classes_from_pvc_service(extracted_path)
 
-    # Download and extract the file containing the Kubernetes manifest
-    extracted_path = await download_and_extract_backup(download_url)
     if not extracted_path:
-        raise HTTPException(status_code=400, detail=f"Error while extracting backup '{backup_name}'")
-
-    # Extracting StorageClasses from PVCs
-    storage_classes = await _extract_storage_classes_from_pvc_service(extracted_path)
+        # Only the PVC manifests are read from the archive while it is downloaded, nothing is written to disk
+        storage_classes = await _stream_storage_classes_from_pvc_service(backup_name)
 
     # Cleaning the DownloadRequest after use
     # cleanup_download_request(backup_name)
@@ -40,6 +41,35 @@ async def get_backup_storage_classes_service(backup_name: str) -> VeleroStorageC
     return VeleroStorageClass(storage_classes=[])
 
 
+def _pvc_storage_class(pvc_data: dict) -> Optional[Dict]:
+    if "spec" in pvc_data and "storageClassName" in pvc_data["spec"]:
+        return {"name": pvc_data["metadata"]["name"], "storageClass": pvc_data["spec"]["storageClassName"]}
+    return None
+
+
+@trace_k8s_async_method(description="Stream storage classes from pvc")
+async def _stream_storage_classes_from_pvc_service(backup_name: str) -> List[Dict]:
+    """
+    Extracts StorageClasses from the PersistentVolumeClaims manifests, read from the backup archive stream.
+    """
+    # Create a DownloadRequest to retrieve backup data
+    download_url = await create_download_request(backup_name, "BackupContents")
+    if not download_url:
+        raise HTTPException(status_code=400, detail=f"Create a DownloadRequest to retrieve backup data")
+
+    scan = await scan_tar_stream(download_url, lambda path: _PVC_MANIFEST_RE.match(path) is not None)
+
+    storage_classes = []
+    for path in sorted(scan.files):
+        try:
+            storage_class = _pvc_storage_class(json.loads(scan.files[path]))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error reading PVC {path}: {e}")
+        if storage_class:
+            storage_classes.append(storage_class)
+    return storage_classes
+
+
 @trace_k8s_async_method(description="Extract storage classes from pvc")
 async def _extract_storage_classes_from_pvc_service(extracted_path: str) -> List[Dict]:
     """
@@ -51,23 +81,19 @@ async def _extract_storage_classes_from_pvc_service(extracted_path: str) -> List
     if not os.path.exists(pvc_path):
         return []
 
-    for namespace in os.listdir(pvc_path):
+    for namespace in sorted(os.listdir(pvc_path)):
         namespace_path = os.path.join(pvc_path, namespace)
         if not os.path.isdir(namespace_path):
             continue
 
-        for pvc_file in os.listdir(namespace_path):
+        for pvc_file in sorted(os.listdir(namespace_path)):
             pvc_file_path = os.path.join(namespace_path, pvc_file)
             try:
                 with open(pvc_file_path, "r") as f:
-                    pvc_data = json.load(f)
-
-                if "spec" in pvc_data and "storageClassName" in pvc_data["spec"]:
-                    # print(pvc_data)
-                    storage_classes.append(
-                        {"name": pvc_data["metadata"]["name"], "storageClass": pvc_data["spec"]["storageClassName"]})
-
+                    storage_class = _pvc_storage_class(json.load(f))
             except Exception as e:
                 raise HTTPException(status_code=400, detail=f"Error reading PVC {pvc_file_path}: {e}")
+            if storage_class:
+                storage_classes.append(storage_class)
 
     return storage_classes
@@ -4,7 +4,9 @@ from service.location_credentials import get_credential_service, get_default_cre
 
 from schemas.request.create_bsl import CreateBslRequestSchema
 
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_model_cache import build_models
+from k8s.k8s_resource_cache import list_velero_resources
 
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
@@ -12,19 +14,15 @@ from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 @trace_k8s_async_method(description="Gets bsls service")
 async def get_bsls_service():
-    bsls = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural
-    )
+    bsls = await list_velero_resources(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural)
 
-    bsl_list = [BackupStorageLocationResponseSchema(**item) for item in bsls.get("items", [])]
+    bsl_list = build_models(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural,
+                            BackupStorageLocationResponseSchema, bsls)
     return bsl_list
 
 
@@ -34,7 +32,7 @@ async def get_bsl_service(name: str):
     Retrieve an existing Backup Storage Location.
     """
 
-    bsl = custom_objects.get_namespaced_custom_object(
+    bsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -107,7 +105,7 @@ async def create_bsl_service(bsl_data: CreateBslRequestSchema):
             "key": bsl_data.credentialKey
         }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -124,7 +122,7 @@ async def create_bsl_service(bsl_data: CreateBslRequestSchema):
 @trace_k8s_async_method(description="Delete bsl")
 async def delete_bsl_service(bsl_name: str):
     """Delete a Velero BSL"""
-    response = custom_objects.delete_namespaced_custom_object(
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -137,7 +135,7 @@ async def delete_bsl_service(bsl_name: str):
 @trace_k8s_async_method(description="Set default bsl")
 async def set_default_bsl_service(bsl_name: str):
     # Recupera tutti i BSL esistenti per trovare quello attualmente predefinito
-    bsl_list = custom_objects.list_namespaced_custom_object(
+    bsl_list = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -162,7 +160,7 @@ async def set_default_bsl_service(bsl_name: str):
         }
     }
 
-    response = custom_objects.patch_namespaced_custom_object(
+    response = await custom_objects.patch_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -182,7 +180,7 @@ async def remove_default_bsl_service(bsl_name: str):
         }
     }
 
-    response = custom_objects.patch_namespaced_custom_object(
+    response = await custom_objects.patch_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -199,7 +197,7 @@ async def update_bsl_service(bsl_data: UpdateBslRequestSchema):
     Update a Backup Storage Location (BSL) in Kubernetes
     """
 
-    existing_bsl = custom_objects.get_namespaced_custom_object(
+    existing_bsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -247,7 +245,7 @@ async def update_bsl_service(bsl_data: UpdateBslRequestSchema):
         if "spec" in existing_bsl and isinstance(existing_bsl["spec"], dict) and 'credential' in existing_bsl["spec"]:
             existing_bsl['spec'].pop("credential")
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -1,12 +1,14 @@
 from fastapi import HTTPException
 from kubernetes import client
+
+from k8s.k8s_gateway import custom_objects_api
 from schemas.velero_describe import VeleroDescribe
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from vui_common.configs.config_proxy import config_app
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 @trace_k8s_async_method(description="Get velero resource details")
@@ -21,7 +23,7 @@ async def get_velero_resource_details_service(resource_name: str, resource_type:
         resource_enum = ResourcesNames[resource_type.upper()]
 
         # Retrieve resource details directly from Kubernetes
-        resource = custom_objects.get_namespaced_custom_object(
+        resource = await custom_objects.get_namespaced_custom_object(
             group=VELERO['GROUP'],
             version=VELERO['VERSION'],
             namespace=config_app.k8s.velero_namespace,
@@ -9,13 +9,15 @@ from constants.resources import RESOURCES, ResourcesNames
 from constants.velero import VELERO
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
+from k8s.k8s_gateway import k8s_gateway, core_v1_api, custom_objects_api
+
 from vui_common.logger.logger_proxy import logger
 import re
 
 @trace_k8s_async_method(description="Get k8s namespaces")
 async def get_namespaces_service():
     # Get namespaces list
-    namespace_list = client.CoreV1Api().list_namespace()
+    namespace_list = await core_v1_api().list_namespace()
     # Extract namespace list
     namespaces = [namespace.metadata.name for namespace in namespace_list.items]
     return namespaces
@@ -37,9 +39,9 @@ async def get_resources_service():
         # api_groups = discovery.get_api_versions().groups
 
         # Retrieve the list of available API groups
-        discovery = k8s_client.ApisApi(api_client)
+        discovery = k8s_gateway.api(k8s_client.ApisApi, api_client)
         try:
-            api_groups = discovery.get_api_versions().groups
+            api_groups = (await discovery.get_api_versions()).groups
             logger.debug(f"Retrieved API groups with success")
         except ApiException as e:
             logger.error(f"Exception when retrieving API groups {str(e)}")
@@ -61,10 +63,10 @@ async def get_resources_service():
                     #         if resource['name'] not in valid_resources:
                     #             valid_resources.append(resource['name'])
                     # Use the Kubernetes client to get the resources
-                    api_instance = k8s_client.CustomObjectsApi(api_client)
-                    api_resources = api_instance.list_cluster_custom_object(group=group.name,
-                                                                            version=version.version, plural='').get(
-                        'resources', [])
+                    api_instance = k8s_gateway.api(k8s_client.CustomObjectsApi, api_client)
+                    api_resources = (await api_instance.list_cluster_custom_object(group=group.name,
+                                                                                   version=version.version,
+                                                                                   plural='')).get('resources', [])
 
                     for resource in api_resources:
                         if '/' not in resource['name']:  # Only include resource names, not sub-resources
@@ -77,8 +79,8 @@ async def get_resources_service():
                     continue
 
         # Get core API resources
-        core_api = k8s_client.CoreV1Api(api_client)
-        core_resources = core_api.get_api_resources().resources
+        core_api = k8s_gateway.api(k8s_client.CoreV1Api, api_client)
+        core_resources = (await core_api.get_api_resources()).resources
         for resource in core_resources:
             if '/' not in resource.name:  # Only include resource names, not sub-resources
                 # valid_resources.append(resource.name)
@@ -103,7 +105,7 @@ async def get_resources_service():
 async def get_storage_classes_service():
     storage_classes = {}
 
-    storage_classes_list = client.StorageV1Api().list_storage_class()
+    storage_classes_list = await k8s_gateway.api(client.StorageV1Api).list_storage_class()
 
     if storage_classes_list is not None:
         for sc in storage_classes_list.items:
@@ -136,7 +138,7 @@ def _to_snake_case(phrase):
 @trace_k8s_async_method(description="Get resource manifest")
 async def get_velero_resource_manifest_service(resource_type: str, resource_name: str, neat=False):
     # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
+    api_instance = custom_objects_api()
 
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
@@ -147,7 +149,7 @@ async def get_velero_resource_manifest_service(resource_type: str, resource_name
 
     try:
         # API call to get backups
-        backups = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        backups = await api_instance.list_namespaced_custom_object(group, version, namespace, plural)
 
         # Filter objects by label velero.io/backup-uid
         filtered_items = [
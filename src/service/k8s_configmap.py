@@ -2,6 +2,8 @@
 from kubernetes import client
 from kubernetes.client import ApiException
 
+from k8s.k8s_gateway import core_v1_api
+
 from vui_common.configs.config_proxy import config_app
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 # from vui_common.logger.logger_proxy import logger
@@ -49,11 +51,11 @@ async def create_or_update_configmap_service(namespace, configmap_name, key, val
         dict: The updated or created ConfigMap.
     """
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
 
     try:
         # Try retrieving the existing ConfigMap
-        existing_configmap = v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
+        existing_configmap = await v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
         print(f"ConfigMap '{configmap_name}' found, update in progress...")
 
         # Update the value of the key
@@ -61,8 +63,8 @@ async def create_or_update_configmap_service(namespace, configmap_name, key, val
             existing_configmap.data = {}
 
         existing_configmap.data[key] = value
-        updated_configmap = v1.replace_namespaced_config_map(name=configmap_name, namespace=namespace,
-                                                             body=existing_configmap)
+        updated_configmap = await v1.replace_namespaced_config_map(name=configmap_name, namespace=namespace,
+                                                                   body=existing_configmap)
         print(f"ConfigMap '{configmap_name}' updated with {key}: {value}")
 
     except ApiException as e:
@@ -75,7 +77,7 @@ async def create_or_update_configmap_service(namespace, configmap_name, key, val
                 data={key: value}
             )
 
-            created_configmap = v1.create_namespaced_config_map(namespace=namespace, body=configmap)
+            created_configmap = await v1.create_namespaced_config_map(namespace=namespace, body=configmap)
             print(f"ConfigMap '{configmap_name}' created with {key}: {value}")
             return created_configmap
         else:
@@ -99,11 +101,11 @@ async def remove_key_from_configmap_service(namespace, configmap_name, key):
         dict | None: The updated ConfigMap or None if the ConfigMap has been deleted or does not exist.
     """
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
 
     try:
         # Retrieve the ConfigMap
-        configmap = v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
+        configmap = await v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
 
         # Check if the key exists
         if configmap.data is None or key not in configmap.data:
@@ -121,8 +123,8 @@ async def remove_key_from_configmap_service(namespace, configmap_name, key):
         #     return None  # Indicates that the ConfigMap has been deleted
 
         # Otherwise, update the ConfigMap
-        updated_configmap = v1.replace_namespaced_config_map(name=configmap_name, namespace=namespace,
-                                                             body=configmap)
+        updated_configmap = await v1.replace_namespaced_config_map(name=configmap_name, namespace=namespace,
+                                                                   body=configmap)
         return updated_configmap
 
     except ApiException as e:
@@ -147,7 +149,7 @@ async def create_configmap_service(namespace, configmap_name, data):
         dict: The ConfigMap created, or None if it already exists.
     """
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
 
     # Defines the ConfigMap
     configmap = client.V1ConfigMap(
@@ -157,14 +159,14 @@ async def create_configmap_service(namespace, configmap_name, data):
 
     try:
         # Check if the ConfigMap already exists
-        v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
+        await v1.read_namespaced_config_map(name=configmap_name, namespace=namespace)
         print(f"The ConfigMap '{configmap_name}' already exists in the namespace '{namespace}'.")
         return None  # Does not create a new ConfigMap if it already exists
 
     except ApiException as e:
         if e.status == 404:
             # If the ConfigMap does not exist, it creates it
-            created_configmap = v1.create_namespaced_config_map(namespace=namespace, body=configmap)
+            created_configmap = await v1.create_namespaced_config_map(namespace=namespace, body=configmap)
             print(f"ConfigMap '{configmap_name}' successfully created in the namespace '{namespace}'.")
             return created_configmap
         else:
@@ -172,7 +174,7 @@ async def create_configmap_service(namespace, configmap_name, data):
             return None
 
 
-def list_configmaps_service(namespace: str = config_app.k8s.velero_namespace):
+async def list_configmaps_service(namespace: str = config_app.k8s.velero_namespace):
     """
     Returns the list of ConfigMaps in a given namespace.
 
@@ -180,9 +182,9 @@ def list_configmaps_service(namespace: str = config_app.k8s.velero_namespace):
     :return: List of names of the ConfigMaps.
     """
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
     try:
-        configmaps = v1.list_namespaced_config_map(namespace)
+        configmaps = await v1.list_namespaced_config_map(namespace)
         return [cm.metadata.name for cm in configmaps.items]
     except client.exceptions.ApiException as e:
         print(f"Errore nell'ottenere le ConfigMap: {e}")
@@ -4,6 +4,8 @@ from fastapi import HTTPException
 from kubernetes import client
 from kubernetes.client import ApiException
 
+from k8s.k8s_gateway import core_v1_api
+
 from vui_common.configs.config_proxy import config_app
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
@@ -11,7 +13,7 @@ from vui_common.utils.k8s_tracer import trace_k8s_async_method
 @trace_k8s_async_method(description="Get velero secret list names")
 async def get_velero_secret_service():
     try:
-        secrets = client.CoreV1Api().list_namespaced_secret(config_app.k8s.velero_namespace)
+        secrets = await core_v1_api().list_namespaced_secret(config_app.k8s.velero_namespace)
         return [secret.metadata.name for secret in secrets.items]
     except Exception as e:
         print(f"Can't get secret: {e}")
@@ -21,8 +23,8 @@ async def get_velero_secret_service():
 @trace_k8s_async_method(description="Get secret's keys")
 async def get_secret_keys_service(namespace: str, secret_name: str):
     try:
-        secret = client.CoreV1Api().read_namespaced_secret(name=secret_name,
-                                                           namespace=namespace)
+        secret = await core_v1_api().read_namespaced_secret(name=secret_name,
+                                                            namespace=namespace)
         if secret.data:
             return list(secret.data.keys())
         else:
@@ -38,8 +40,8 @@ async def get_secret_keys_service(namespace: str, secret_name: str):
 @trace_k8s_async_method(description="get secret content")
 async def get_secret_service(namespace: str, secret_name: str):
     try:
-        secret = client.CoreV1Api().read_namespaced_secret(name=secret_name,
-                                                           namespace=namespace)
+        secret = await core_v1_api().read_namespaced_secret(name=secret_name,
+                                                            namespace=namespace)
         if secret.data:
             decoded_data = {key: base64.b64decode(value).decode('utf-8') for key, value in secret.data.items()}
             return decoded_data
@@ -73,10 +75,10 @@ async def add_or_update_key_in_secret_service(namespace, secret_name, key, value
     # Upload Kubernetes configuration
     # config.load_kube_config()
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
 
     try:
-        secret = v1.read_namespaced_secret(name=secret_name, namespace=namespace)
+        secret = await v1.read_namespaced_secret(name=secret_name, namespace=namespace)
 
         if secret.data is None:
             secret.data = {}
@@ -84,7 +86,7 @@ async def add_or_update_key_in_secret_service(namespace, secret_name, key, value
         # Encode value in base64
         secret.data[key] = base64.b64encode(value.encode()).decode()
 
-        updated_secret = v1.replace_namespaced_secret(name=secret_name, namespace=namespace, body=secret)
+        updated_secret = await v1.replace_namespaced_secret(name=secret_name, namespace=namespace, body=secret)
         print(f"Key '{key}' added/updated in Secret '{secret_name}'.")
         return updated_secret
 
@@ -99,7 +101,7 @@ async def add_or_update_key_in_secret_service(namespace, secret_name, key, value
                 type="Opaque"
             )
 
-            created_secret = v1.create_namespaced_secret(namespace=namespace, body=new_secret)
+            created_secret = await v1.create_namespaced_secret(namespace=namespace, body=new_secret)
             print(f"Secret '{secret_name}' created with key '{key}'.")
             return created_secret
         else:
@@ -108,7 +110,7 @@ async def add_or_update_key_in_secret_service(namespace, secret_name, key, value
 
 
 @trace_k8s_async_method(description="remove key from secret")
-def remove_key_from_secret_service(namespace, secret_name, key):
+async def remove_key_from_secret_service(namespace, secret_name, key):
     """
     Removes a key from a Secret Kubernetes.
 
@@ -123,10 +125,10 @@ def remove_key_from_secret_service(namespace, secret_name, key):
     # Upload Kubernetes configuration
     # config.load_kube_config()
 
-    v1 = client.CoreV1Api()
+    v1 = core_v1_api()
 
     try:
-        secret = v1.read_namespaced_secret(name=secret_name, namespace=namespace)
+        secret = await v1.read_namespaced_secret(name=secret_name, namespace=namespace)
 
         if secret.data is None or key not in secret.data:
             print(f"The key '{key}' does not exist in Secret '{secret_name}'.")
@@ -139,10 +141,10 @@ def remove_key_from_secret_service(namespace, secret_name, key):
         # If Secret is empty, it deletes it
         if not secret.data:
             print(f"The Secret '{secret_name}' is now empty. Deleting it...")
-            v1.delete_namespaced_secret(name=secret_name, namespace=namespace)
+            await v1.delete_namespaced_secret(name=secret_name, namespace=namespace)
             return None
 
-        updated_secret = v1.replace_namespaced_secret(name=secret_name, namespace=namespace, body=secret)
+        updated_secret = await v1.replace_namespaced_secret(name=secret_name, namespace=namespace, body=secret)
         return updated_secret
 
     except ApiException as e:
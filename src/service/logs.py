@@ -1,12 +1,17 @@
-from fastapi import HTTPException
+import json
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
 
-import requests
-import gzip
-import tempfile
+from fastapi import HTTPException
 
-from schemas.velero_log import VeleroLog
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import get_velero_resource
+from schemas.velero_log import VeleroLog, VeleroLogRecord, VeleroLogRecords
 from service.utils.download_request import create_download_request
-from service.utils.cleanup_requests import cleanup_server_request
+from service.utils.log_index import LogQuery, LogRecord, log_index
+from service.utils.log_stream import (LOG_CHUNK_SIZE, LogFilter, LogLines, filter_log_lines, iter_gzip_lines,
+                                     open_log_download, parse_tail)
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
 VELERO_LOG_TYPES = {
@@ -14,58 +19,133 @@ VELERO_LOG_TYPES = {
     "restore": "RestoreLog"
 }
 
-ACCEPTED_MIME_TYPES = [
-    "application/gzip",
-    "binary/octet-stream",
-    "application/octet-stream"
-]
+VELERO_LOG_PLURALS = {
+    "backup": RESOURCES[ResourcesNames.BACKUP].plural,
+    "restore": RESOURCES[ResourcesNames.RESTORE].plural
+}
 
-@trace_k8s_async_method(description="Get velero resource logs")
-async def get_velero_logs_service(resource_name: str, resource_type: str) -> VeleroLog:
-    """Retrieve logs from a Velero resource (Backup, Restore, etc.) using DownloadRequest"""
+
+async def _get_log_url(resource_name: str, resource_type: str) -> str:
     if resource_type not in VELERO_LOG_TYPES:
         raise HTTPException(status_code=400, detail=f"Unsupported resource type: {resource_type}")
 
-    log_kind = VELERO_LOG_TYPES[resource_type]
+    # Creation of the DownloadRequest or retrieval of the URL if already available
+    log_url = await create_download_request(resource_name, VELERO_LOG_TYPES[resource_type])
+    if not log_url:
+        raise HTTPException(status_code=408, detail=f"Unable to retrieve log download URL")
+    return log_url
+
+
+async def _open_log_lines(log_url: str,
+                          log_filter: LogFilter,
+                          tail: Optional[int]) -> LogLines:
+    """Connect to the log download and return the iterator of its (filtered) lines, to be closed by the caller"""
+    session, response = await open_log_download(log_url)
+    return LogLines(filter_log_lines(iter_gzip_lines(response.content.iter_chunked(LOG_CHUNK_SIZE)),
+                                     log_filter, tail),
+                    session.close)
+
+
+async def _log_version(resource_name: str, resource_type: str) -> str:
+    """Version of the log of a resource: its UID and completion timestamp, the log does not change afterwards"""
+    resource = await get_velero_resource(VELERO_LOG_PLURALS[resource_type], resource_name)
+    metadata, status = resource.get("metadata", {}), resource.get("status", {})
+    # a resource still running has no final log: the index is rebuilt at every request
+    completion = status.get("completionTimestamp") or f"running-{time.time()}"
+    return f"{metadata.get('uid')}:{completion}"
+
+
+async def _query_log_index(resource_name: str,
+                           resource_type: str,
+                           log_query: LogQuery,
+                           tail: Optional[int]) -> List[LogRecord]:
+    """Query the local index of the log, downloading and indexing the log the first time (or when it changes)"""
+    tail = parse_tail(tail)
+    if resource_type not in VELERO_LOG_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported resource type: {resource_type}")
+    version = await _log_version(resource_name, resource_type)
 
-    try:
-        # Creation of the DownloadRequest or retrieval of the URL if already available
-        log_url = await create_download_request(resource_name, log_kind)
-        if not log_url:
-            raise HTTPException(status_code=408, detail=f"Unable to retrieve log download URL")
+    async def open_lines():
+        # the DownloadRequest is created only when the index has to be built
+        return await _open_log_lines(await _get_log_url(resource_name, resource_type), LogFilter(), None)
+
+    return await log_index.search(resource_type, resource_name, version, open_lines, log_query, tail)
 
-        # Download and extract logs
-        logs = await _download_and_extract_logs(log_url)
 
+@trace_k8s_async_method(description="Get velero resource logs")
+async def get_velero_logs_service(resource_name: str,
+                                  resource_type: str,
+                                  grep: Optional[str] = None,
+                                  level: Optional[str] = None,
+                                  since: Optional[datetime] = None,
+                                  until: Optional[datetime] = None,
+                                  tail: Optional[int] = None) -> VeleroLog:
+    """Retrieve logs from a Velero resource (Backup, Restore, etc.) using DownloadRequest"""
+    try:
+        records = await _query_log_index(resource_name, resource_type,
+                                         LogQuery(LogFilter(grep, level, since, until)), tail)
         # DownloadRequest cleanup to avoid buildup
         # cleanup_download_request(resource_name)
-        return logs
+        return VeleroLog(logs=[record.raw for record in records])
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
 
-async def _download_and_extract_logs(log_url: str) -> VeleroLog:
-    """Download the .gz file, check the format, and return logs"""
+@trace_k8s_async_method(description="Get velero resource log records")
+async def get_velero_log_records_service(resource_name: str,
+                                         resource_type: str,
+                                         grep: Optional[str] = None,
+                                         level: Optional[str] = None,
+                                         since: Optional[datetime] = None,
+                                         until: Optional[datetime] = None,
+                                         namespace: Optional[str] = None,
+                                         resource: Optional[str] = None,
+                                         tail: Optional[int] = None) -> VeleroLogRecords:
+    """Parsed log records (time, level, msg, resource, namespace, error) of a Velero resource"""
     try:
-        response = requests.get(log_url, stream=True)
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail=f"Download error: {response.status_code}")
-
-        # Check the type of content
-        mime_type = response.headers.get("Content-Type", "").split(";")[0]
-        if mime_type not in ACCEPTED_MIME_TYPES:
-            raise HTTPException(status_code=400, detail=f"Invalid response: Unsupported mime type '{mime_type}'")
-
-        with tempfile.NamedTemporaryFile(delete=True) as temp_file:
-            temp_file.write(response.content)
-            temp_file.flush()
-
-            # Open the .gz file and read the contents
-            with gzip.open(temp_file.name, "rb") as gz_file:
-                log_content = gz_file.read().decode("utf-8").split("\n")
+        records = await _query_log_index(resource_name, resource_type,
+                                         LogQuery(LogFilter(grep, level, since, until), namespace, resource), tail)
+        return VeleroLogRecords(records=[
+            VeleroLogRecord(line=record.line,
+                            time=datetime.fromtimestamp(record.time, timezone.utc).isoformat()
+                            if record.time is not None else None,
+                            level=record.level,
+                            msg=record.msg,
+                            resource=record.resource,
+                            namespace=record.namespace,
+                            error=record.error)
+            for record in records])
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error {str(e)}")
 
-        return VeleroLog(success=True, logs=log_content)
 
-    except Exception as e:
-        raise HTTPException(status_code=408, detail=f"Request Timeout {str(e)}")
+@trace_k8s_async_method(description="Stream velero resource logs")
+async def stream_velero_logs_service(resource_name: str,
+                                     resource_type: str,
+                                     grep: Optional[str] = None,
+                                     level: Optional[str] = None,
+                                     since: Optional[datetime] = None,
+                                     until: Optional[datetime] = None,
+                                     tail: Optional[int] = None) -> LogLines:
+    """
+    NDJSON stream of the log lines of a Velero resource: `{"line": <number>, "message": <raw line>}` per line.
+
+    📌 The log is downloaded, decompressed and filtered chunk by chunk: memory stays flat whatever its size.
+    📌 The download is started (and its errors raised) before the first line is sent; the caller closes the
+    returned iterator (`aclose`) once the response is over.
+    """
+    tail = parse_tail(tail)
+    log_url = await _get_log_url(resource_name, resource_type)
+    lines = await _open_log_lines(log_url, LogFilter(grep, level, since, until), tail)
+
+    async def ndjson():
+        async for number, line in lines:
+            yield (json.dumps({"line": number, "message": line}) + "\n").encode()
+
+    return LogLines(ndjson(), lines.aclose)
@@ -1,11 +1,11 @@
 from fastapi import HTTPException
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
 from vui_common.configs.config_proxy import config_app
 
 
 async def get_pod_volume_backups_service():
     # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
+    api_instance = custom_objects_api()
 
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
@@ -17,7 +17,7 @@ async def get_pod_volume_backups_service():
 
     try:
         # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        pvb = await api_instance.list_namespaced_custom_object(group, version, namespace, plural)
 
         return pvb
     except Exception as e:
@@ -27,7 +27,7 @@ async def get_pod_volume_backups_service():
 
 async def get_pod_volume_backup_details_service(backup_name=None):
     # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
+    api_instance = custom_objects_api()
 
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
@@ -39,7 +39,7 @@ async def get_pod_volume_backup_details_service(backup_name=None):
 
     try:
         # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        pvb = await api_instance.list_namespaced_custom_object(group, version, namespace, plural)
 
         # Filter objects by label velero.io/backup-uid
         filtered_items = [
@@ -55,7 +55,7 @@ async def get_pod_volume_backup_details_service(backup_name=None):
 
 async def get_pod_volume_restore_service():
     # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
+    api_instance = custom_objects_api()
 
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
@@ -67,7 +67,7 @@ async def get_pod_volume_restore_service():
 
     try:
         # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        pvb = await api_instance.list_namespaced_custom_object(group, version, namespace, plural)
 
         return pvb
     except Exception as e:
@@ -76,7 +76,7 @@ async def get_pod_volume_restore_service():
 
 async def get_pod_volume_restore_details_service(restore_name=None):
     # Create an instance of the API client
-    api_instance = client.CustomObjectsApi()
+    api_instance = custom_objects_api()
 
     # Namespace in which Velero is operating
     namespace = config_app.k8s.velero_namespace
@@ -88,7 +88,7 @@ async def get_pod_volume_restore_details_service(restore_name=None):
 
     try:
         # API call to get backups
-        pvb = api_instance.list_namespaced_custom_object(group, version, namespace, plural)
+        pvb = await api_instance.list_namespaced_custom_object(group, version, namespace, plural)
 
         # Filter objects by label velero.io/backup-uid
         filtered_items = [
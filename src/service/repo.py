@@ -8,25 +8,23 @@ from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from utils.minio_wrapper import MinioInterface
 from utils.process import run_check_output_process
 
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_model_cache import build_models
+from k8s.k8s_resource_cache import list_velero_resources
 
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 @trace_k8s_async_method(description="Get repositories list")
 async def get_repos_service():
-    repos = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural
-    )
-
-    bsl_list = [BackupRepositoryResponseSchema(**item) for item in repos.get("items", [])]
+    repos = await list_velero_resources(RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural)
+
+    bsl_list = build_models(RESOURCES[ResourcesNames.BACKUP_REPOSITORY].plural,
+                            BackupRepositoryResponseSchema, repos)
 
     return bsl_list
 
@@ -1,4 +1,4 @@
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
 
 from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
@@ -6,11 +6,11 @@ from constants.resources import RESOURCES, ResourcesNames
 from schemas.request.delete_resource import DeleteResourceRequestSchema
 from service.utils.cleanup_requests import cleanup_server_request
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 async def get_server_status_requests_service():
-    ssr = custom_objects.list_namespaced_custom_object(
+    ssr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -21,7 +21,7 @@ async def get_server_status_requests_service():
 
 
 async def get_download_requests_service():
-    dr = custom_objects.list_namespaced_custom_object(
+    dr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -32,7 +32,7 @@ async def get_download_requests_service():
 
 
 async def get_delete_backup_requests_service():
-    dbr = custom_objects.list_namespaced_custom_object(
+    dbr = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -42,10 +42,10 @@ async def get_delete_backup_requests_service():
     return dbr
 
 async def delete_download_requests_service(request: DeleteResourceRequestSchema):
-    cleanup_server_request(request.name, RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural)
+    await cleanup_server_request(request.name, RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural)
 
 async def delete_delete_download_requests_service(request: DeleteResourceRequestSchema):
-    cleanup_server_request(request.name, RESOURCES[ResourcesNames.DELETE_BACKUP_REQUEST].plural)
+    await cleanup_server_request(request.name, RESOURCES[ResourcesNames.DELETE_BACKUP_REQUEST].plural)
 
 async def delete_server_status_requests_service(request: DeleteResourceRequestSchema):
-    cleanup_server_request(request.name, RESOURCES[ResourcesNames.SERVER_STATUS_REQUEST].plural)
+    await cleanup_server_request(request.name, RESOURCES[ResourcesNames.SERVER_STATUS_REQUEST].plural)
@@ -1,4 +1,5 @@
-from service.bsl import get_bsls_service
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import list_velero_resources
 from service.k8s import get_namespaces_service, get_resources_service
 from service.k8s_configmap import list_configmaps_service
 from service.vsl import get_vsls_service
@@ -8,13 +9,12 @@ from vui_common.utils.k8s_tracer import trace_k8s_async_method
 @trace_k8s_async_method(description="Get backup/schedule creation settings")
 async def get_resource_creation_settings_service():
     namespaces = await get_namespaces_service()
-    bsls = await get_bsls_service()
+    bsls = await list_velero_resources(RESOURCES[ResourcesNames.BACKUP_STORAGE_LOCATION].plural)
     vsls = await get_vsls_service()
 
-    bsls = [bsl.model_dump() for bsl in bsls]
     vsls = [vsl.model_dump() for vsl in vsls]
 
-    resource_policy = list_configmaps_service()
+    resource_policy = await list_configmaps_service()
 
     backup_location_list = [item['metadata']['name'] for item in bsls if
                             'metadata' in item and 'name' in item['metadata']]
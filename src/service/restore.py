@@ -1,6 +1,9 @@
-from typing import List
+from typing import List, Tuple
 
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_model_cache import build_model, build_models
+from k8s.k8s_resource_cache import ResourceStore, list_velero_resources, get_velero_resource
+from service.utils.list_options import paginate, project, projection_paths
 
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from constants.velero import VELERO
@@ -10,24 +13,33 @@ from schemas.request.create_restore import CreateRestoreRequestSchema
 from models.k8s.restore import RestoreResponseSchema
 from vui_common.configs.config_proxy import config_app
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
-# @trace_k8s_async_method(description="get a restores list")
-async def get_restores_service(in_progress: bool = False) -> List[RestoreResponseSchema]:
-    """Retrieve all Velero schedules"""
+RESTORE_SUMMARY_FIELDS = [('metadata', 'name'),
+                          ('metadata', 'namespace'),
+                          ('metadata', 'uid'),
+                          ('metadata', 'creationTimestamp'),
+                          ('spec', 'backupName'),
+                          ('spec', 'scheduleName'),
+                          ('status', 'phase'),
+                          ('status', 'startTimestamp'),
+                          ('status', 'completionTimestamp'),
+                          ('status', 'errors'),
+                          ('status', 'warnings'),
+                          ('status', 'validationErrors'),
+                          ('status', 'failureReason')]
 
-    restores = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.RESTORE].plural
-    )
+
+async def list_restores(in_progress: bool = False) -> List[dict]:
+    """Velero restores as raw items, ordered by (namespace, name)"""
+
+    restores = await list_velero_resources(RESOURCES[ResourcesNames.RESTORE].plural)
 
     filtered_restores = {}
     now = datetime.utcnow()
 
-    for item in restores.get("items", []):
+    for item in restores:
         metadata = item["metadata"]
         status = item.get("status", {})
         phase = status.get("phase", "").lower()
@@ -50,22 +62,41 @@ async def get_restores_service(in_progress: bool = False) -> List[RestoreRespons
 
         filtered_restores[metadata["uid"]] = item
 
-    restore_list = [RestoreResponseSchema(**item) for item in filtered_restores.values()]
+    return sorted(filtered_restores.values(), key=ResourceStore.key)
+
+
+# @trace_k8s_async_method(description="get a restores list")
+async def get_restores_service(in_progress: bool = False) -> List[RestoreResponseSchema]:
+    """Retrieve all Velero restores"""
+    restore_list = build_models(RESOURCES[ResourcesNames.RESTORE].plural, RestoreResponseSchema,
+                                await list_restores(in_progress=in_progress))
 
     return restore_list
 
 
+async def get_restores_page_service(in_progress: bool = False,
+                                    limit: int | None = None,
+                                    continue_token: str | None = None,
+                                    fields: str | None = None,
+                                    summary: bool = False) -> Tuple[list, dict | None]:
+    """
+    Retrieve a page of Velero restores and its pagination info.
+
+    With `fields` or `summary` the items are projected raw dictionaries, otherwise `RestoreResponseSchema`.
+    """
+    restores, pagination = paginate(await list_restores(in_progress=in_progress), limit, continue_token)
+
+    paths = projection_paths(fields, summary, RESTORE_SUMMARY_FIELDS)
+    if paths:
+        return [project(item, paths) for item in restores], pagination
+    return build_models(RESOURCES[ResourcesNames.RESTORE].plural, RestoreResponseSchema, restores), pagination
+
+
 @trace_k8s_async_method(description="Get a restore details")
 async def get_restore_details_service(restore_name: str) -> RestoreResponseSchema:
     """Retrieve details of a single schedule"""
-    restore = custom_objects.get_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.RESTORE].plural,
-        name=restore_name
-    )
-    return RestoreResponseSchema(**restore)
+    restore = await get_velero_resource(RESOURCES[ResourcesNames.RESTORE].plural, restore_name)
+    return build_model(RESOURCES[ResourcesNames.RESTORE].plural, RestoreResponseSchema, restore)
 
 
 @trace_k8s_async_method(description="Create a restore")
@@ -95,7 +126,7 @@ async def create_restore_service(restore_data: CreateRestoreRequestSchema):
         'writeSparseFiles': restore_data.writeSparseFiles,
     }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=restore_data.namespace,
@@ -112,7 +143,7 @@ async def delete_restore_service(restore_name: str):
     Delete an existing Restore from Kubernetes.
     """
 
-    response = custom_objects.delete_namespaced_custom_object(
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
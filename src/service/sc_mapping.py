@@ -4,12 +4,14 @@ from fastapi import HTTPException
 from kubernetes import client
 from kubernetes.client.exceptions import ApiException
 
+from k8s.k8s_gateway import k8s_gateway
+
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from vui_common.logger.logger_proxy import logger
 
-core_v1 = client.CoreV1Api()
-custom_object = client.CustomObjectsApi()
-storage_v1 = client.StorageV1Api()
+core_v1 = k8s_gateway.api(client.CoreV1Api)
+custom_object = k8s_gateway.api(client.CustomObjectsApi)
+storage_v1 = k8s_gateway.api(client.StorageV1Api)
 
 
 @trace_k8s_async_method(description="Set storage class map")
@@ -37,13 +39,13 @@ async def __set_storages_classes_map(namespace=os.getenv('K8S_VELERO_NAMESPACE',
 
         # Check if the ConfigMap already exists
         try:
-            existing_config_map = core_v1.read_namespaced_config_map(name=config_map_name,
-                                                                     namespace=namespace)
+            existing_config_map = await core_v1.read_namespaced_config_map(name=config_map_name,
+                                                                           namespace=namespace)
 
             # If it exists, update the ConfigMap
             existing_config_map.data = data_list
-            core_v1.replace_namespaced_config_map(name=config_map_name, namespace=namespace,
-                                                  body=existing_config_map)
+            await core_v1.replace_namespaced_config_map(name=config_map_name, namespace=namespace,
+                                                        body=existing_config_map)
             logger.info(
                 "ConfigMap 'change-storage-class-config' in namespace 'velero' updated successfully.")
         except client.rest.ApiException as e:
@@ -53,7 +55,7 @@ async def __set_storages_classes_map(namespace=os.getenv('K8S_VELERO_NAMESPACE',
                     metadata=config_map_metadata,
                     data=data_list
                 )
-                core_v1.create_namespaced_config_map(namespace=namespace, body=config_map_body)
+                await core_v1.create_namespaced_config_map(namespace=namespace, body=config_map_body)
                 logger.info(
                     "ConfigMap 'change-storage-class-config' in namespace 'velero' created successfully.")
             else:
@@ -69,8 +71,8 @@ async def get_storages_classes_map_service(config_map_name='change-storage-class
 
     # Get the ConfigMap
     try:
-        config_map = core_v1.read_namespaced_config_map(name=config_map_name,
-                                                        namespace=namespace)  # Extract data from the ConfigMap
+        config_map = await core_v1.read_namespaced_config_map(name=config_map_name,
+                                                              namespace=namespace)  # Extract data from the ConfigMap
         data = config_map.data or {}
     except ApiException as e:
         if e.status == 404:
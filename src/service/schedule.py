@@ -1,6 +1,8 @@
 from typing import List
 
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_model_cache import build_models
+from k8s.k8s_resource_cache import list_velero_resources
 
 from models.k8s.schedule import ScheduleResponseSchema
 from schemas.request.create_schedule import CreateScheduleRequestSchema
@@ -10,25 +12,20 @@ from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 @trace_k8s_async_method(description="Get velero schedules")
 async def get_schedules_service() -> List[ScheduleResponseSchema]:
-    schedules = custom_objects.list_namespaced_custom_object(
-        group=VELERO["GROUP"],
-        version=VELERO["VERSION"],
-        namespace=config_app.k8s.velero_namespace,
-        plural=RESOURCES[ResourcesNames.SCHEDULE].plural
-    )
+    schedules = await list_velero_resources(RESOURCES[ResourcesNames.SCHEDULE].plural)
 
-    schedule_list = [ScheduleResponseSchema(**item) for item in schedules.get("items", [])]
+    schedule_list = build_models(RESOURCES[ResourcesNames.SCHEDULE].plural, ScheduleResponseSchema, schedules)
     return schedule_list
 
 
 @trace_k8s_async_method(description="Set pause schedule")
 async def pause_schedule_service(schedule_name, paused=True):
-    schedule = custom_objects.get_namespaced_custom_object(
+    schedule = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -38,7 +35,7 @@ async def pause_schedule_service(schedule_name, paused=True):
 
     schedule["spec"]["paused"] = paused
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -89,7 +86,7 @@ async def create_schedule_service(schedule_data: CreateScheduleRequestSchema):
     if schedule_data.resourcePolicy:
         schedule_body['spec']['template']["resourcePolicy"] = {'kind': 'configmap', 'name': schedule_data.resourcePolicy}
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -103,7 +100,7 @@ async def create_schedule_service(schedule_data: CreateScheduleRequestSchema):
 @trace_k8s_async_method(description="Delete schedule")
 async def delete_schedule_service(schedule_name: str):
     """Delete a Velero schedule"""
-    response = custom_objects.delete_namespaced_custom_object(
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -115,7 +112,7 @@ async def delete_schedule_service(schedule_name: str):
 
 @trace_k8s_async_method(description="Update schedule")
 async def update_schedule_service(schedule_data):
-    existing_schedule = custom_objects.get_namespaced_custom_object(
+    existing_schedule = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -156,7 +153,7 @@ async def update_schedule_service(schedule_data):
     existing_schedule['spec'] = new_spec
 
     #  Update the Schedule with the new settings
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
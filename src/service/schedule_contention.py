@@ -0,0 +1,106 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from service.schedule_heatmap import get_schedules_events, week_run_segments
+from service.utils.cron_expansion import MINUTES_PER_DAY, MINUTES_PER_WEEK
+from vui_common.utils.k8s_tracer import trace_k8s_async_method
+
+
+class RunTimeline:
+    """
+    Sorted sweep-line over the projected runs of the schedules in a week.
+
+    📌 The week is split into segments at every run start/end: each segment knows how many runs are active and of
+    which schedules, so the queries cost O(runs) instead of a scan of the 10,080 minutes matrix.
+    """
+
+    def __init__(self, events):
+        # (start, end, concurrent runs, {schedule name: runs}) covering the whole week
+        self.segments = [(start, end, sum(running.values()), running)
+                         for start, end, running in week_run_segments(events)]
+
+    def overlaps(self, schedule_name):
+        """Minutes in which every other schedule runs together with `schedule_name`"""
+        minutes = Counter()
+        total = 0
+        for start, end, _, running in self.segments:
+            if schedule_name not in running:
+                continue
+            total += end - start
+            for other in running:
+                if other != schedule_name:
+                    minutes[other] += end - start
+
+        return {'schedule_name': schedule_name,
+                'running_minutes': total,
+                'overlaps': [{'schedule_name': other, 'minutes': overlap}
+                             for other, overlap in minutes.most_common()]}
+
+    def peak_per_hour(self):
+        """Highest number of concurrent runs in every hour of the week, as {weekday: [24 values]}"""
+        peaks = [0] * (MINUTES_PER_WEEK // 60)
+        for start, end, count, _ in self.segments:
+            if count == 0:
+                continue
+            for hour in range(start // 60, (end - 1) // 60 + 1):
+                peaks[hour] = max(peaks[hour], count)
+        return {day: peaks[day * 24:(day + 1) * 24] for day in range(7)}
+
+    def first_free_window(self, minutes, from_offset):
+        """Week offset of the first window of `minutes` without runs starting at or after `from_offset`, or None"""
+        # free segments of two consecutive weeks, merged, so the windows crossing Saturday midnight are found too
+        free = []
+        for week in (0, MINUTES_PER_WEEK):
+            for start, end, count, _ in self.segments:
+                if count:
+                    continue
+                if free and free[-1][1] == start + week:
+                    free[-1] = (free[-1][0], end + week)
+                else:
+                    free.append((start + week, end + week))
+
+        for start, end in free:
+            start = max(start, from_offset)
+            if end - start >= minutes:
+                return start % MINUTES_PER_WEEK
+        return None
+
+
+def _week_offset(moment: datetime):
+    # Convert weekday: 0 for Sunday, 1 for Monday, ..., 6 for Saturday
+    weekday = (moment.weekday() + 1) % 7
+    return weekday * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+@trace_k8s_async_method(description="Get schedules contention")
+async def get_schedules_contention_service(schedule_name: str | None = None, free_window_minutes: int = 60):
+    if not 0 < free_window_minutes <= MINUTES_PER_WEEK:
+        raise HTTPException(status_code=400,
+                            detail=f"free_window_minutes must be between 1 and {MINUTES_PER_WEEK}")
+
+    next_schedule, events = await get_schedules_events()
+
+    if schedule_name and schedule_name not in {cron['schedule_name'] for cron in next_schedule}:
+        raise HTTPException(status_code=404, detail=f"Schedule '{schedule_name}' not found.")
+
+    timeline = RunTimeline(events)
+
+    now = datetime.now().replace(second=0, microsecond=0)
+    now_offset = _week_offset(now)
+    free_offset = timeline.first_free_window(free_window_minutes, now_offset)
+    free_window = None
+    if free_offset is not None:
+        start = now + timedelta(minutes=(free_offset - now_offset) % MINUTES_PER_WEEK)
+        free_window = {'minutes': free_window_minutes,
+                       'weekday': free_offset // MINUTES_PER_DAY,
+                       'hour': (free_offset % MINUTES_PER_DAY) // 60,
+                       'minute': free_offset % 60,
+                       'start': start.isoformat()}
+
+    return {
+        'overlaps': timeline.overlaps(schedule_name) if schedule_name else None,
+        'peak_per_hour': timeline.peak_per_hour(),
+        'free_window': free_window
+    }
@@ -1,19 +1,27 @@
 import math
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import accumulate
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import list_velero_resources
+from service.backup import list_backups
+from service.utils.cron_expansion import MINUTES_PER_DAY, MINUTES_PER_WEEK, cron_expansion_cache
+from vui_common.utils.k8s_tracer import trace_k8s_async_method
 
-from croniter import croniter
 
-from service.backup import get_backups_service
-from service.schedule import get_schedules_service
-from vui_common.utils.k8s_tracer import trace_k8s_async_method
+def _latest_backup_by_schedule(backups):
+    latest = {}
+    for item in backups:
+        schedule_name = item.get('metadata', {}).get('labels', {}).get('velero.io/schedule-name')
+        if schedule_name is not None:
+            latest.setdefault(schedule_name, item)
+    return latest
 
 
-def _find_backup(backups, backup_name):
-    return next(
-        (item for item in backups if
-         item.get('metadata', {}).get('labels', {}).get('velero.io/schedule-name') == backup_name),
-        None
-    )
+def _event_offset(event):
+    """Minute of the week (0 = Sunday 00:00) at which the event starts"""
+    return event['weekday'] * MINUTES_PER_DAY + event['start_hour'] * 60 + event['start_minute']
 
 
 def _get_cron_events(cron_string, days=7):
@@ -26,30 +34,17 @@ def _get_cron_events(cron_string, days=7):
     """
     if cron_string == '':
         return []
-    start_time = datetime.now()
-    end_time = start_time + timedelta(days=days)
-
-    cron = croniter(cron_string, start_time)
-    events = []
 
-    while True:
-        event_time = cron.get_next(datetime)
-        if event_time > end_time:
-            break
-        # Convert weekday: 0 for Sunday, 1 for Monday, ..., 6 for Saturday
-        weekday = (event_time.weekday() + 1) % 7
-        new_event = {
-            'start_hour': event_time.hour,
-            'start_minute': event_time.minute,
-            'weekday': weekday
-        }
-        events.append(new_event) if new_event not in events else events
-
-    return events
+    # the expansion is memoized, only the event dictionaries are built per request
+    return [{'start_hour': (offset % MINUTES_PER_DAY) // 60,
+             'start_minute': offset % 60,
+             'weekday': offset // MINUTES_PER_DAY}
+            for offset in cron_expansion_cache.week_offsets(cron_string, days)]
 
 
 def _cron_heatmap_data(schedules, backups):
     data = []
+    latest_backups = _latest_backup_by_schedule(backups)
     for sc in schedules:
         tmp = {
             'schedule_name': sc.get('metadata', {}).get('name', ''),
@@ -57,7 +52,7 @@ def _cron_heatmap_data(schedules, backups):
             'last': sc.get('status', {}).get('lastBackup', '')
         }
 
-        last_backup = _find_backup(backups, tmp['schedule_name'])
+        last_backup = latest_backups.get(tmp['schedule_name'])
         if (tmp['last'] and last_backup and
                 last_backup.get('status', {}).get('startTimestamp') and
                 last_backup.get('status', {}).get('completionTimestamp')):
@@ -82,49 +77,107 @@ def _cron_heatmap_data(schedules, backups):
     return data
 
 
-def _create_event_matrix(events):
-    # Create a 3D matrix of dimensions 7 days x 24 hours x 60 minutes, initially with zeros
-    matrix = [[[0 for _ in range(60)] for _ in range(24)] for _ in range(7)]
-    matrix_schedule_name = [[['' for _ in range(60)] for _ in range(24)] for _ in range(7)]
+def week_ranges(event):
+    """
+    Split the run of an event into [start, end) ranges of the week (wrapping past Saturday) and return them with
+    the number of whole weeks it lasts
+    """
+    start = _event_offset(event)
+    full_weeks, remainder = divmod(max(event.get('duration', 0), 0), MINUTES_PER_WEEK)
+    end = start + remainder
+    if remainder == 0:
+        return [], full_weeks
+    if end <= MINUTES_PER_WEEK:
+        return [(start, end)], full_weeks
+    return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)], full_weeks
+
+
+def _week_coverage(events):
+    """
+    Concurrent runs for every minute of the week, computed on a flat array with a difference array
+    (range add + prefix sum) instead of a minute by minute walk.
+    """
+    diff = [0] * (MINUTES_PER_WEEK + 1)
+    for event in events:
+        ranges, full_weeks = week_ranges(event)
+        diff[0] += full_weeks
+        diff[MINUTES_PER_WEEK] -= full_weeks
+        for start, end in ranges:
+            diff[start] += 1
+            diff[end] -= 1
+    return list(accumulate(diff[:MINUTES_PER_WEEK]))
+
+
+def week_run_segments(events):
+    """
+    Sweep over the run boundaries of the week: sorted (start, end, {schedule name: concurrent runs}) segments
+    covering the whole week, the idle ones with an empty Counter.
+
+    📌 The cost depends on the number of runs and not on their duration; the schedules are listed in the order of
+    their first event.
+    """
+    opens = defaultdict(list)
+    closes = defaultdict(list)
+    active = Counter()
 
     for event in events:
-        start_hour = event['start_hour']
-        start_minute = event['start_minute']
-        weekday = event['weekday']
-        duration_minute = event['duration'] if 'duration' in event else 0
+        name = event['schedule_name']
+        ranges, full_weeks = week_ranges(event)
+        active[name] += full_weeks
+        for start, end in ranges:
+            opens[start].append(name)
+            closes[end].append(name)
 
-        # Calculates the total minutes since the beginning of the day
-        start_time_in_minutes = start_hour * 60 + start_minute
+    segments = []
+    position = 0
+    for boundary in sorted(set(opens) | set(closes) | {MINUTES_PER_WEEK}):
+        if boundary > position:
+            segments.append((position, boundary, +active))
+        position = boundary
+        active.subtract(closes.get(boundary, []))
+        active.update(opens.get(boundary, []))
+    return segments
 
-        for minute in range(duration_minute):
-            # Calculates the total time in minutes since the beginning of the week
-            total_minutes = (weekday * 1440) + start_time_in_minutes + minute
-            current_weekday = (total_minutes // 1440) % 7
-            current_hour = (total_minutes % 1440) // 60
-            current_minute = total_minutes % 60
 
-            # Increases the counter in the array
-            matrix[current_weekday][current_hour][current_minute] += 1
-            matrix_schedule_name[current_weekday][current_hour][current_minute] += (',' if matrix_schedule_name[
-                current_weekday][current_hour][current_minute] else '') + event['schedule_name']
+def _week_schedule_intervals(events):
+    """Schedules running in every minute of the week as a sorted list of (start, end, names) intervals"""
+    return [(start, end, list(running)) for start, end, running in week_run_segments(events) if running]
 
-    return matrix, matrix_schedule_name
 
+def _to_week_matrix(flat):
+    """Reshape a flat 10,080-minute array into 7 days x 24 hours x 60 minutes"""
+    return [[flat[day * MINUTES_PER_DAY + hour * 60: day * MINUTES_PER_DAY + (hour + 1) * 60] for hour in range(24)]
+            for day in range(7)]
 
-@trace_k8s_async_method(description="Get schedules heatmap")
-async def get_schedules_heatmap_service():
-    schedules = await get_schedules_service()
-    schedules = [schedule.model_dump(exclude_unset=True) for schedule in schedules]
 
-    backups = await get_backups_service(latest_per_schedule=True)
-    backups = [backup.model_dump(exclude_unset=True) for backup in backups]
+def _create_event_matrix(events):
+    # 7 days x 24 hours x 60 minutes matrices: concurrent runs and the names of the schedules running
+    schedule_names = [''] * MINUTES_PER_WEEK
+    for start, end, names in _week_schedule_intervals(events):
+        schedule_names[start:end] = [','.join(names)] * (end - start)
+
+    return _to_week_matrix(_week_coverage(events)), _to_week_matrix(schedule_names)
+
+
+async def get_schedules_events():
+    """Projected week runs of every schedule, with the duration of its last backup"""
+    # raw items: the heatmap only reads a few fields, there is no need to validate and dump the models
+    schedules = await list_velero_resources(RESOURCES[ResourcesNames.SCHEDULE].plural)
+    backups = await list_backups(latest_per_schedule=True)
     next_schedule = _cron_heatmap_data(schedules, backups)
 
     events = []
 
     for cron in next_schedule:
         if 'events' in cron:
-            events = events + cron['events']
+            events.extend(cron['events'])
+
+    return next_schedule, events
+
+
+@trace_k8s_async_method(description="Get schedules heatmap")
+async def get_schedules_heatmap_service():
+    next_schedule, events = await get_schedules_events()
 
     matrix, matrix_schedule_name = _create_event_matrix(events)
 
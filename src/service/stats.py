@@ -1,18 +1,24 @@
-from models.k8s.backup import BackupPhase
-from service.backup import get_backups_service
-from service.restore import get_restores_service
+import asyncio
+import os
+import time
 from collections import Counter
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_backup_index import SCHEDULE_LABEL, parse_k8s_timestamp, backup_index
+from k8s.k8s_model_cache import build_model
+from k8s.k8s_resource_cache import ResourceIndexer, list_velero_resources, resource_cache
+from models.k8s.backup import BackupPhase, BackupResponseSchema
 from service.k8s import get_namespaces_service
+from utils.event_envelope import EventEnvelope
 
-from service.schedule import get_schedules_service
+from vui_common.logger.logger_proxy import logger
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
-from datetime import datetime, timedelta
 
-def parse_timestamp(ts_str):
-    try:
-        return datetime.strptime(ts_str, "%Y-%m-%dT%H:%M:%SZ")
-    except Exception:
-        return None
+LATEST_BACKUPS_WINDOW_SEC = 24 * 60 * 60
+LATEST_BACKUPS_FALLBACK = 10
+STATS_PUSH_DEBOUNCE_SEC = float(os.getenv('STATS_PUSH_DEBOUNCE_SEC', '2'))
+STATS_NAMESPACES_TTL_SEC = float(os.getenv('STATS_NAMESPACES_TTL_SEC', '30'))
+
 
 def _build_data(phase, counter, total_count):
     return {'label': phase,
@@ -21,31 +27,8 @@ def _build_data(phase, counter, total_count):
             }
 
 
-def _resources_stats(resources, count_from_schedule=False):
-    """Generate statistics on backup resources, excluding phases with a count of 0."""
-
-    total_count = len(resources)
-
-    # Count occurrences of each backup phase
-    # phase_counts = Counter(
-    #     x['status']['phase'] for x in resources
-    #     if isinstance(x, dict) and 'status' in x and 'phase' in x['status']
-    # )
-    phase_counts = Counter(
-        x['status']['phase'] for x in resources
-        if isinstance(x, dict) and isinstance(x.get('status'), dict) and 'phase' in x['status']
-    )
-
-    # Count scheduled backups
-    scheduled_count = sum(
-        1 for x in resources
-        if isinstance(x, dict) and
-        'metadata' in x and 'labels' in x['metadata'] and
-        isinstance(x['metadata']['labels'], dict) and
-        'velero.io/schedule-name' in x['metadata']['labels']
-    )
-
-    # Prepare response dictionary
+def _phases_stats(phase_counts, total_count, from_schedule_count=None):
+    """Generate statistics on resource phases, excluding phases with a count of 0."""
     res = {'count': total_count, 'stats': []}
 
     # Include only phases that have a count greater than 0
@@ -61,18 +44,78 @@ def _resources_stats(resources, count_from_schedule=False):
             )
 
     # Add scheduled backups count if requested
-    if count_from_schedule:
-        res['from_schedule_count'] = scheduled_count
+    if from_schedule_count is not None:
+        res['from_schedule_count'] = from_schedule_count
 
     return res
 
 
-def _schedules_stats(resources):
-    count = len(resources)
+def _phase_of(item):
+    status = item.get('status')
+    return status.get('phase') if isinstance(status, dict) else None
+
+
+def _backups_stats(backups, now):
+    """Phase counters, scheduled count, latest backup per schedule and latest completed backups in one pass"""
+    phase_counts = Counter()
+    scheduled_count = 0
+    latest_per_schedule = {}
+    manual_count = 0
+    manual_phase_counts = Counter()
+    completed = []
+
+    for item in backups:
+        labels = item.get('metadata', {}).get('labels') or {}
+        phase = _phase_of(item)
+        phase_counts[phase] += 1
+
+        if SCHEDULE_LABEL in labels:
+            scheduled_count += 1
+
+        schedule_name = labels.get(SCHEDULE_LABEL)
+        if schedule_name:
+            # most recent creationTimestamp wins, ties go to the first (namespace, name) as in a LIST
+            creation = item['metadata'].get('creationTimestamp') or ''
+            key = (item['metadata'].get('namespace', ''), item['metadata'].get('name', ''))
+            existing = latest_per_schedule.get(schedule_name)
+            if existing is None or creation > existing[0] or (creation == existing[0] and key < existing[1]):
+                latest_per_schedule[schedule_name] = (creation, key, item)
+        else:
+            manual_count += 1
+            manual_phase_counts[phase] += 1
+
+        completion = parse_k8s_timestamp((item.get('status') or {}).get('completionTimestamp'))
+        if completion is not None:
+            completed.append((completion, item))
+
+    # latest backups: the last 24 hours, or the last ones ever completed when nothing ran in that window
+    completed.sort(key=lambda entry: entry[0], reverse=True)
+    recent = [item for completion, item in completed if completion >= now - LATEST_BACKUPS_WINDOW_SEC]
+    latest = recent or [item for _, item in completed[:LATEST_BACKUPS_FALLBACK]]
+
+    latest_phase_counts = manual_phase_counts + Counter(_phase_of(item) for _, _, item in latest_per_schedule.values())
+
+    return {
+        'stats': {
+            'all': _phases_stats(phase_counts, len(backups), from_schedule_count=scheduled_count),
+            'latest': _phases_stats(latest_phase_counts, manual_count + len(latest_per_schedule))
+        },
+        'latest': [build_model(RESOURCES[ResourcesNames.BACKUP].plural, BackupResponseSchema, item).model_dump()
+                   for item in latest],
+    }
+
 
-    paused = [x for x in resources if x.get('spec').get('paused') is True]
+def _schedules_stats(schedules):
+    """Paused/unpaused counters and the namespaces included by at least one schedule, in one pass"""
+    count = len(schedules)
+    paused_count = 0
+    scheduled_namespaces = set()
 
-    paused_count = len(paused)
+    for item in schedules:
+        spec = item.get('spec') or {}
+        if spec.get('paused') is True:
+            paused_count += 1
+        scheduled_namespaces.update((spec.get('template') or {}).get('includedNamespaces') or [])
 
     unpaused_count = count - paused_count
 
@@ -88,110 +131,291 @@ def _schedules_stats(resources):
                 'perc': round(100 * paused_count / count if count > 0 else 0, 1),
                 }]
            }
-    return res
-
-
-def _get_all_scheduled_namespace(scheduled):
-    unique_values_set = set()
-
-    for item in scheduled:
-        include_namespaces = item.get('spec', {}).get('template', {}).get('includedNamespaces', [])
-        unique_values_set.update(include_namespaces)
-
-    unique_values_list = list(unique_values_set)
-
-    return unique_values_list
-
-
-def _get_completion_timestamp(item):
-    if not isinstance(item, dict):
-        return ''  # Ensure item is a dictionary
-
-    status = item.get('status')
-    if not isinstance(status, dict):  # Ensure status is a dictionary
-        return ''
-
-    if status.get('completionTimestamp'):
-        return status.get('completionTimestamp')
-
-    return ''
-
+    return res, scheduled_namespaces
 
-def _latest_backup(backups):
-    #
-    # get backups of the last 24 hours
-    #
-    # Current time and time threshold
-    now = datetime.now()
 
-    def valid_backup(b):
-        time_threshold = now - timedelta(hours=24)
-        ts = _get_completion_timestamp(b)
-        if ts is None:
-            return False
-        dt = parse_timestamp(ts)
-        return dt is not None and dt >= time_threshold
+def compute_stats(backups, restores, schedules, namespaces, now=None):
+    """Build the dashboard stats from one snapshot of every resource kind"""
+    now = time.time() if now is None else now
 
-    recent_backups = [b for b in backups if valid_backup(b)]
+    restore_phase_counts = Counter(_phase_of(item) for item in restores)
+    schedules_stats, scheduled_namespaces = _schedules_stats(schedules)
 
-    def sort_key(b):
-        ts = _get_completion_timestamp(b)
-        return parse_timestamp(ts) or datetime.min  # fallback
-
-    if recent_backups:
-        last_backup_sorted = sorted(recent_backups, key=sort_key, reverse=True)
-    else:
-        valid_fallbacks = [b for b in backups if sort_key(b) != datetime.min]
-        last_backup_sorted = sorted(valid_fallbacks, key=sort_key, reverse=True)[:10]
-
-    return last_backup_sorted
-
-@trace_k8s_async_method(description="Get service stats")
-async def get_stats_service():
-    backups = await get_backups_service()
-    backups = [backup.model_dump() for backup in backups]
-
-    all_backups_stats = _resources_stats(backups, count_from_schedule=True)
-
-    last_backup = await get_backups_service(latest_per_schedule=True)
-    last_backup = [backup.model_dump() for backup in last_backup]
-
-    last_schedule_backup_stats = _resources_stats(last_backup)
-
-    restores = await get_restores_service()
-    restores = [restore.model_dump() for restore in restores]
-
-    all_restores_stats = _resources_stats(restores)
-
-    schedules = await get_schedules_service()
-    schedules = [schedule.model_dump() for schedule in schedules]
-
-    schedules_stats = _schedules_stats(schedules)
-
-    last_backup_sorted = _latest_backup(backups)
-
-    scheduled_namespace = _get_all_scheduled_namespace(schedules)
-    all_ns = await get_namespaces_service()
-    unscheduled_ns = list(set(all_ns) - set(scheduled_namespace))
-
-    output = {
-        'backups': {
-            'stats': {
-                'all': all_backups_stats,
-                'latest': last_schedule_backup_stats
-            },
-            'latest': last_backup_sorted,
-        },
+    return {
+        'backups': _backups_stats(backups, now),
         'restores': {
-            'all': all_restores_stats,
+            'all': _phases_stats(restore_phase_counts, len(restores)),
         },
         'schedules': {
             'all': schedules_stats
         },
         'namespaces': {
-            'total': len(all_ns),
-            'unscheduled': unscheduled_ns
+            'total': len(namespaces),
+            'unscheduled': [ns for ns in namespaces if ns not in scheduled_namespaces]
         }
     }
 
-    return output
+
+def _decrement(counter, value):
+    counter[value] -= 1
+    if counter[value] <= 0:
+        del counter[value]
+
+
+class _PhaseAggregate(ResourceIndexer):
+    """Phase counters of a plural, updated by the watch events of its store"""
+
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self.phases = {}
+        self.phase_counts = Counter()
+
+    def rebuild(self, items):
+        self.phases.clear()
+        self.phase_counts.clear()
+        for key, obj in items.items():
+            self.add(key, obj)
+
+    def add(self, key, obj):
+        phase = _phase_of(obj)
+        self.phases[key] = phase
+        self.phase_counts[phase] += 1
+        self.on_change()
+
+    def remove(self, key):
+        if key in self.phases:
+            _decrement(self.phase_counts, self.phases.pop(key))
+            self.on_change()
+
+
+class _BackupAggregate(_PhaseAggregate):
+    """
+    Backup counters: phases, scheduled backups and phases of the "latest per schedule" set.
+
+    📌 The latest backup of every schedule is read from `backup_index`, which is registered on the store first
+    and is therefore already updated when these counters are.
+    """
+
+    def __init__(self, on_change):
+        super().__init__(on_change)
+        self.schedules = {}
+        self.scheduled_count = 0
+        self.manual_phase_counts = Counter()
+        self.latest_phase = {}
+        self.latest_phase_counts = Counter()
+        self._rebuilding = False
+
+    def rebuild(self, items):
+        self.schedules.clear()
+        self.scheduled_count = 0
+        self.manual_phase_counts.clear()
+        self.latest_phase.clear()
+        self.latest_phase_counts.clear()
+
+        self._rebuilding = True
+        try:
+            super().rebuild(items)
+        finally:
+            self._rebuilding = False
+        for schedule_name in backup_index.latest_per_schedule:
+            self._sync_latest(schedule_name)
+
+    def add(self, key, obj):
+        labels = obj.get('metadata', {}).get('labels') or {}
+        schedule_name = labels.get(SCHEDULE_LABEL) or None
+        self.schedules[key] = (SCHEDULE_LABEL in labels, schedule_name)
+        super().add(key, obj)
+
+        if SCHEDULE_LABEL in labels:
+            self.scheduled_count += 1
+        if schedule_name is None:
+            self.manual_phase_counts[self.phases[key]] += 1
+        elif not self._rebuilding:
+            self._sync_latest(schedule_name)
+
+    def remove(self, key):
+        if key not in self.schedules:
+            return
+        has_label, schedule_name = self.schedules.pop(key)
+        phase = self.phases[key]
+        super().remove(key)
+
+        if has_label:
+            self.scheduled_count -= 1
+        if schedule_name is None:
+            _decrement(self.manual_phase_counts, phase)
+        else:
+            self._sync_latest(schedule_name)
+
+    def _sync_latest(self, schedule_name):
+        if schedule_name in self.latest_phase:
+            _decrement(self.latest_phase_counts, self.latest_phase.pop(schedule_name))
+
+        latest_key = backup_index.latest_per_schedule.get(schedule_name)
+        if latest_key in self.phases:
+            self.latest_phase[schedule_name] = self.phases[latest_key]
+            self.latest_phase_counts[self.phases[latest_key]] += 1
+
+
+class _ScheduleAggregate(ResourceIndexer):
+    """Paused schedules and reference counts of the namespaces included by the schedules"""
+
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self.entries = {}
+        self.paused_count = 0
+        self.namespace_counts = Counter()
+
+    def rebuild(self, items):
+        self.entries.clear()
+        self.paused_count = 0
+        self.namespace_counts.clear()
+        for key, obj in items.items():
+            self.add(key, obj)
+
+    def add(self, key, obj):
+        spec = obj.get('spec') or {}
+        paused = spec.get('paused') is True
+        namespaces = set((spec.get('template') or {}).get('includedNamespaces') or [])
+        self.entries[key] = (paused, namespaces)
+        self.paused_count += paused
+        self.namespace_counts.update(namespaces)
+        self.on_change()
+
+    def remove(self, key):
+        if key not in self.entries:
+            return
+        paused, namespaces = self.entries.pop(key)
+        self.paused_count -= paused
+        for namespace in namespaces:
+            _decrement(self.namespace_counts, namespace)
+        self.on_change()
+
+
+class StatsAggregates:
+    """
+    Dashboard stats maintained incrementally from the watch-fed resource cache.
+
+    📌 Counters are updated on every ADDED/MODIFIED/DELETED event: reading them does not scan the resources.
+    📌 `publish_deltas` pushes the sections that changed, debounced, through the global watch channel.
+    """
+
+    def __init__(self):
+        self.backups = _BackupAggregate(lambda: self._mark_changed('backups'))
+        self.restores = _PhaseAggregate(lambda: self._mark_changed('restores'))
+        self.schedules = _ScheduleAggregate(lambda: self._mark_changed('schedules'))
+
+        self._changed = set()
+        self._changed_event = asyncio.Event()
+        self._latest_cache = None
+        self._namespaces_cache = None
+        self._last_pushed = {}
+
+        resource_cache.store(RESOURCES[ResourcesNames.BACKUP].plural).add_indexer(self.backups)
+        resource_cache.store(RESOURCES[ResourcesNames.RESTORE].plural).add_indexer(self.restores)
+        resource_cache.store(RESOURCES[ResourcesNames.SCHEDULE].plural).add_indexer(self.schedules)
+
+    def _mark_changed(self, section):
+        self._changed.add(section)
+        if section == 'schedules':
+            self._changed.add('namespaces')
+        self._changed_event.set()
+
+    @staticmethod
+    def ready():
+        return all(resource_cache.synced_store(RESOURCES[name].plural) is not None
+                   for name in (ResourcesNames.BACKUP, ResourcesNames.RESTORE, ResourcesNames.SCHEDULE))
+
+    def _latest_backups(self, now):
+        # The rendered list only changes with the backups or when the 24 hours window moves (checked every minute)
+        generation = resource_cache.store(RESOURCES[ResourcesNames.BACKUP].plural).generation
+        cache_key = (generation, int(now // 60))
+        if self._latest_cache is None or self._latest_cache[0] != cache_key:
+            keys = backup_index.completed_since(now - LATEST_BACKUPS_WINDOW_SEC) or \
+                   backup_index.latest_completed(LATEST_BACKUPS_FALLBACK)
+            latest = [build_model(RESOURCES[ResourcesNames.BACKUP].plural, BackupResponseSchema,
+                                  backup_index.objects[key]).model_dump() for key in keys]
+            self._latest_cache = (cache_key, latest)
+        return self._latest_cache[1]
+
+    async def _namespaces(self):
+        now = time.monotonic()
+        if self._namespaces_cache is None or now - self._namespaces_cache[0] > STATS_NAMESPACES_TTL_SEC:
+            self._namespaces_cache = (now, await get_namespaces_service())
+        return self._namespaces_cache[1]
+
+    async def section(self, name):
+        if name == 'backups':
+            backups = self.backups
+            return {
+                'stats': {
+                    'all': _phases_stats(backups.phase_counts, len(backups.phases),
+                                         from_schedule_count=backups.scheduled_count),
+                    'latest': _phases_stats(backups.manual_phase_counts + backups.latest_phase_counts,
+                                            sum(backups.manual_phase_counts.values()) + len(backups.latest_phase))
+                },
+                'latest': self._latest_backups(time.time()),
+            }
+        if name == 'restores':
+            return {'all': _phases_stats(self.restores.phase_counts, len(self.restores.phases))}
+        if name == 'schedules':
+            count = len(self.schedules.entries)
+            paused_count = self.schedules.paused_count
+            return {'all': {'count': count,
+                            'from_schedule_count': 0,
+                            'stats': [_build_data('Unpaused', count - paused_count, count),
+                                      _build_data('Paused', paused_count, count)]}}
+        if name == 'namespaces':
+            namespaces = await self._namespaces()
+            return {'total': len(namespaces),
+                    'unscheduled': [ns for ns in namespaces if ns not in self.schedules.namespace_counts]}
+        raise ValueError(f"Unknown stats section {name}")
+
+    async def get_stats(self):
+        return {name: await self.section(name) for name in ('backups', 'restores', 'schedules', 'namespaces')}
+
+    async def publish_deltas(self, send_message):
+        """Send the changed stats sections to the dashboards (WebSocket and NATS)"""
+        while True:
+            await self._changed_event.wait()
+            await asyncio.sleep(STATS_PUSH_DEBOUNCE_SEC)
+            self._changed_event.clear()
+            sections, self._changed = self._changed, set()
+
+            if not self.ready():
+                continue
+
+            try:
+                delta = {}
+                for name in sorted(sections):
+                    value = await self.section(name)
+                    if self._last_pushed.get(name) != value:
+                        delta[name] = value
+                if not delta:
+                    continue
+                self._last_pushed.update(delta)
+
+                message = EventEnvelope.build("global_watch", "stats", delta)
+                logger.watch(f"📊 Stats changed: {', '.join(delta)}")
+                await send_message(message)
+            except Exception as e:
+                logger.error(f"⚠️ Error publishing stats delta: {e}")
+
+
+stats_aggregates = StatsAggregates()
+
+
+@trace_k8s_async_method(description="Get service stats")
+async def get_stats_service():
+    if stats_aggregates.ready():
+        return await stats_aggregates.get_stats()
+
+    # Independent sources: at most one LIST per kind, fetched concurrently
+    backups, restores, schedules, namespaces = await asyncio.gather(
+        list_velero_resources(RESOURCES[ResourcesNames.BACKUP].plural),
+        list_velero_resources(RESOURCES[ResourcesNames.RESTORE].plural),
+        list_velero_resources(RESOURCES[ResourcesNames.SCHEDULE].plural),
+        get_namespaces_service()
+    )
+
+    return compute_stats(backups, restores, schedules, namespaces)
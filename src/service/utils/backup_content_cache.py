@@ -0,0 +1,322 @@
+import asyncio
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+import aiofiles
+import aiohttp
+from fastapi import HTTPException
+
+from vui_common.configs.config_proxy import config_app
+from vui_common.logger.logger_proxy import logger
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import get_velero_resource
+from service.utils.download_request import create_download_request
+
+BACKUP_CACHE_FOLDER = os.getenv('BACKUP_CACHE_FOLDER', os.path.join(tempfile.gettempdir(), 'velero-backups'))
+BACKUP_CACHE_MAX_BYTES = int(os.getenv('BACKUP_CACHE_MAX_BYTES', str(2 * 1024 ** 3)))
+# an entry exposed by `alias` is kept until it is not browsed for this long
+BACKUP_CACHE_ALIAS_TTL_SEC = int(os.getenv('BACKUP_CACHE_ALIAS_TTL_SEC', '3600'))
+
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_PARTIAL_SUFFIX = '.partial'
+_TARBALL_SUFFIX = '.tar.gz'
+_UID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+
+class _CacheFull(Exception):
+    pass
+
+
+def _directory_size(path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def _extract_tarfile(tar_path: str, extract_to: str, max_bytes: int, progress: Callable[[int], None]):
+    with tarfile.open(tar_path, "r:gz") as tar:
+        def members() -> Iterator[tarfile.TarInfo]:
+            # the sizes are read from the member headers: the extraction stops before exceeding its budget
+            extracted = 0
+            for member in tar:
+                extracted += member.size
+                if extracted > max_bytes:
+                    raise _CacheFull(f"the extracted content exceeds {max_bytes} bytes")
+                progress(extracted)
+                yield member
+
+        # 'data' filter: no absolute paths, links outside the folder or special files from the archive
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(path=extract_to, members=members(), filter='data')
+        else:
+            tar.extractall(path=extract_to, members=members())
+
+
+class _CacheEntry:
+    __slots__ = ('path', 'size', 'refs', 'last_used', 'aliases', 'pinned_until')
+
+    def __init__(self, path: str, size: int, last_used: Optional[float] = None):
+        self.path = path
+        self.size = size
+        self.refs = 0
+        self.last_used = last_used or time.time()
+        self.aliases = set()
+        self.pinned_until = 0.0
+
+    def evictable(self, now: float) -> bool:
+        return self.refs == 0 and self.pinned_until <= now
+
+
+class BackupContentCache:
+    """
+    Shared on-disk cache of the extracted backup contents, keyed by backup UID.
+
+    📌 A backup is downloaded and extracted at most once, the concurrent requests wait for the same extraction;
+    a backup deleted and created again with the same name has a new UID and so a new entry.
+    📌 The entries in use are reference counted (`acquire`); when the total size exceeds BACKUP_CACHE_MAX_BYTES the
+    least recently used entries not in use are deleted.
+    📌 The downloads in progress reserve their space first (Content-Length of the archive), the extractions grow
+    their reservation member by member: a backup that cannot fit once the idle entries are evicted is refused with
+    507.
+    📌 `alias` exposes an entry under another folder (e.g. the inspect folder) with a symlink removed on eviction;
+    the entry is pinned until it is not browsed (`touch_alias`) for BACKUP_CACHE_ALIAS_TTL_SEC.
+    """
+
+    def __init__(self, folder: str = BACKUP_CACHE_FOLDER, max_bytes: int = BACKUP_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._reserved: Dict[str, int] = {}
+        self._loaded = False
+
+    @property
+    def size(self) -> int:
+        """Bytes of the extracted entries plus the bytes reserved by the downloads in progress"""
+        return sum(entry.size for entry in self._entries.values()) + sum(self._reserved.values())
+
+    def _load(self):
+        """
+        Index the entries extracted before a restart and remove the interrupted extractions.
+
+        📌 The symlinks of the inspect folder into the cache are attached again to their entries (removed on
+        eviction), the ones to a missing entry are removed.
+        """
+        if self._loaded:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        for name in os.listdir(self.folder):
+            # anything else in the folder is not ours and is left untouched
+            path = os.path.join(self.folder, name)
+            uid = name.split('.', 1)[0]
+            if not _UID_RE.match(uid):
+                continue
+            if name == uid + _PARTIAL_SUFFIX + _TARBALL_SUFFIX and os.path.isfile(path):
+                os.remove(path)
+            elif name == uid + _PARTIAL_SUFFIX and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif name == uid and os.path.isdir(path):
+                self._entries[uid] = _CacheEntry(path, _directory_size(path), os.path.getmtime(path))
+        self._load_aliases(config_app.app.inspect_folder)
+        self._loaded = True
+
+    def _load_aliases(self, folder: str):
+        if not os.path.isdir(folder):
+            return
+        cache_folder = os.path.realpath(self.folder)
+        for name in os.listdir(folder):
+            link = os.path.join(folder, name)
+            if not os.path.islink(link):
+                continue
+            target = os.path.realpath(link)
+            if os.path.dirname(target) != cache_folder:
+                continue
+            entry = self._entries.get(os.path.basename(target))
+            if entry is not None:
+                entry.aliases.add(link)
+            else:
+                os.remove(link)
+
+    @staticmethod
+    async def _backup_uid(backup_name: str) -> str:
+        backup = await get_velero_resource(RESOURCES[ResourcesNames.BACKUP].plural, backup_name)
+        uid = (backup or {}).get('metadata', {}).get('uid')
+        if not uid:
+            raise HTTPException(status_code=404, detail=f"Backup '{backup_name}' not found")
+        return uid
+
+    def _held(self, uid: str) -> int:
+        """Bytes that cannot be freed for the download of `uid`: entries in use or pinned, other reservations"""
+        now = time.time()
+        return (sum(entry.size for entry in self._entries.values() if not entry.evictable(now)) +
+                sum(nbytes for other, nbytes in self._reserved.items() if other != uid))
+
+    def _grow(self, uid: str, nbytes: int):
+        if uid in self._reserved:
+            self._reserved[uid] = nbytes
+            self._evict()
+
+    def _reserve(self, uid: str, nbytes: int):
+        """Reserve the space of a download in progress, evicting the idle entries; 507 when it cannot fit"""
+        self._reserved[uid] = 0
+        self._evict(nbytes)
+        if self.size + nbytes > self.max_bytes:
+            raise HTTPException(status_code=507,
+                                detail=f"Not enough space in the backup cache ({nbytes} bytes needed, "
+                                       f"{self.max_bytes - self.size} bytes available)")
+        self._reserved[uid] = nbytes
+
+    async def _download(self, backup_name: str, uid: str, target: str):
+        download_url = await create_download_request(backup_name, "BackupContents")
+        if not download_url:
+            raise HTTPException(status_code=400, detail=f"Create a DownloadRequest to retrieve backup data")
+
+        logger.info(f"Download and extract backup {backup_name}")
+        temp_file_path = target + _TARBALL_SUFFIX
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(download_url) as response:
+                    if response.status != 200:
+                        logger.error(f"Backup download error: {response.status}")
+                        raise HTTPException(status_code=400, detail=f"Backup download error: {response.status}")
+                    # refused before the download when the announced archive cannot fit
+                    self._reserve(uid, response.content_length or 0)
+                    downloaded = 0
+                    async with aiofiles.open(temp_file_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                            downloaded += len(chunk)
+                            if downloaded > self._reserved[uid]:
+                                # no or wrong Content-Length: the reservation grows with the download
+                                self._reserve(uid, downloaded)
+                            await f.write(chunk)
+
+            # the reservation grows with the extracted members (idle entries evicted on the way), the extraction
+            # stops if it goes beyond what can be freed
+            loop = asyncio.get_running_loop()
+            available = self.max_bytes - self._held(uid) - downloaded
+
+            def progress(extracted: int):
+                loop.call_soon_threadsafe(self._grow, uid, downloaded + extracted)
+
+            try:
+                # Extract the .tar.gz file in a separate thread (to avoid blockages)
+                await asyncio.to_thread(_extract_tarfile, temp_file_path, target, available, progress)
+            except _CacheFull as e:
+                logger.error(f"Backup {backup_name} does not fit in the backup cache: {e}")
+                raise HTTPException(status_code=507, detail=f"Not enough space in the backup cache: {e}")
+        finally:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    async def _ensure(self, backup_name: str) -> _CacheEntry:
+        self._load()
+        uid = await self._backup_uid(backup_name)
+        async with self._locks.setdefault(uid, asyncio.Lock()):
+            entry = self._entries.get(uid)
+            if entry is None:
+                path = os.path.join(self.folder, uid)
+                partial = path + _PARTIAL_SUFFIX
+                shutil.rmtree(partial, ignore_errors=True)
+                os.makedirs(partial)
+                try:
+                    await self._download(backup_name, uid, partial)
+                    os.rename(partial, path)
+                    entry = self._entries[uid] = _CacheEntry(path, await asyncio.to_thread(_directory_size, path))
+                except BaseException as e:
+                    # the entry is published only once complete: a failed extraction is never read
+                    shutil.rmtree(partial, ignore_errors=True)
+                    if isinstance(e, Exception) and not isinstance(e, HTTPException):
+                        logger.error(f"Error while downloading and extracting backup: {e}")
+                        raise HTTPException(status_code=400,
+                                            detail=f"Error while downloading and extracting backup: {e}")
+                    raise
+                finally:
+                    self._reserved.pop(uid, None)
+                logger.info(f"Backup {backup_name} cached ({entry.size} bytes)")
+            entry.refs += 1
+            entry.last_used = time.time()
+        return entry
+
+    @asynccontextmanager
+    async def acquire(self, backup_name: str) -> AsyncIterator[str]:
+        """Folder of the extracted content of a backup, kept on disk until the context exits"""
+        entry = await self._ensure(backup_name)
+        try:
+            yield entry.path
+        finally:
+            entry.refs -= 1
+            entry.last_used = time.time()
+            self._evict()
+
+    @asynccontextmanager
+    async def acquire_if_cached(self, backup_name: str) -> AsyncIterator[Optional[str]]:
+        """Like `acquire` when the backup is already extracted, None otherwise (nothing is downloaded)"""
+        self._load()
+        uid = await self._backup_uid(backup_name)
+        if uid not in self._entries or self._locks.get(uid, asyncio.Lock()).locked():
+            yield None
+            return
+        async with self.acquire(backup_name) as path:
+            yield path
+
+    async def alias(self, backup_name: str, folder: str) -> str:
+        """
+        Expose the content of a backup as `folder/backup_name` (symlink to its cache entry).
+
+        📌 The entry is pinned for BACKUP_CACHE_ALIAS_TTL_SEC, renewed by `touch_alias` at each read.
+        """
+        async with self.acquire(backup_name) as path:
+            entry = self._entries[os.path.basename(path)]
+            entry.pinned_until = time.time() + BACKUP_CACHE_ALIAS_TTL_SEC
+            os.makedirs(folder, exist_ok=True)
+            link = os.path.join(folder, backup_name)
+            if os.path.islink(link):
+                os.remove(link)
+            elif os.path.isdir(link):
+                shutil.rmtree(link)
+            os.symlink(path, link)
+            entry.aliases.add(link)
+            return link
+
+    def touch_alias(self, link: str):
+        """Renew the pin of the entry exposed as `link` (see `alias`)"""
+        now = time.time()
+        for entry in self._entries.values():
+            if link in entry.aliases:
+                entry.pinned_until = now + BACKUP_CACHE_ALIAS_TTL_SEC
+                entry.last_used = now
+                return
+
+    def _evict(self, needed: int = 0):
+        """Delete the least recently used entries not in use until the cache fits its budget plus `needed` bytes"""
+        excess = self.size + needed - self.max_bytes
+        if excess <= 0:
+            return
+        now = time.time()
+        for uid, entry in sorted(self._entries.items(), key=lambda item: item[1].last_used):
+            if excess <= 0:
+                break
+            if not entry.evictable(now):
+                continue
+            logger.info(f"Backup cache: evicting {uid} ({entry.size} bytes)")
+            for link in entry.aliases:
+                if os.path.islink(link):
+                    os.remove(link)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            del self._entries[uid]
+            excess -= entry.size
+
+
+backup_content_cache = BackupContentCache()
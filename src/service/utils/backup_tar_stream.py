@@ -0,0 +1,135 @@
+import asyncio
+import concurrent.futures
+import tarfile
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import aiohttp
+from fastapi import HTTPException
+
+from vui_common.logger.logger_proxy import logger
+
+_READ_TIMEOUT_SEC = 300
+# bytes moved from the event loop to the tar thread per round trip
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+class TarMember(NamedTuple):
+    name: str
+    size: int
+
+
+class TarScan(NamedTuple):
+    # every regular file of the archive, in archive order
+    members: List[TarMember]
+    # content of the selected members
+    files: Dict[str, bytes]
+
+
+class _AsyncStreamFile:
+    """
+    Blocking file-like view of an aiohttp response body, for `tarfile` running in a worker thread.
+
+    📌 The body is fetched from the event loop by chunks of _READ_CHUNK_SIZE and served from a local buffer: only
+    that buffer is in memory, nothing is written to disk.
+    📌 `close` (from the event loop) cancels the pending fetch: the blocked read fails at once.
+    """
+
+    def __init__(self, stream: aiohttp.StreamReader, loop: asyncio.AbstractEventLoop):
+        self.stream = stream
+        self.loop = loop
+        self._buffer = bytearray()
+        self._eof = False
+        self._closed = False
+        self._pending: Optional[concurrent.futures.Future] = None
+
+    async def _read_chunk(self) -> bytes:
+        chunk = bytearray()
+        while len(chunk) < _READ_CHUNK_SIZE:
+            data = await self.stream.read(_READ_CHUNK_SIZE - len(chunk))
+            if not data:
+                break
+            chunk += data
+        return bytes(chunk)
+
+    def _fill(self):
+        if self._closed:
+            raise OSError("Backup download closed")
+        self._pending = asyncio.run_coroutine_threadsafe(self._read_chunk(), self.loop)
+        if self._closed:
+            self._pending.cancel()
+        try:
+            chunk = self._pending.result(_READ_TIMEOUT_SEC)
+        except concurrent.futures.CancelledError:
+            raise OSError("Backup download closed")
+        except concurrent.futures.TimeoutError:
+            self._pending.cancel()
+            raise OSError(f"Backup download stalled for {_READ_TIMEOUT_SEC} seconds")
+        finally:
+            self._pending = None
+        if chunk:
+            self._buffer += chunk
+        else:
+            self._eof = True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            self._fill()
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self):
+        self._closed = True
+        pending = self._pending
+        if pending is not None:
+            pending.cancel()
+
+
+def member_path(name: str) -> str:
+    """Archive path without the leading './'"""
+    return name[2:] if name.startswith('./') else name
+
+
+def _scan(fileobj, select: Callable[[str], bool]) -> TarScan:
+    members, files = [], {}
+    # 'r|gz': sequential read of a gzip stream, the members are visited once in archive order
+    with tarfile.open(fileobj=fileobj, mode='r|gz', bufsize=_READ_CHUNK_SIZE) as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            name = member_path(member.name)
+            members.append(TarMember(name, member.size))
+            if select(name):
+                extracted = tar.extractfile(member)
+                files[name] = extracted.read() if extracted is not None else b''
+    return TarScan(members, files)
+
+
+async def scan_tar_stream(download_url: str, select: Callable[[str], bool]) -> TarScan:
+    """
+    Read a .tar.gz while it is downloaded, indexing its members and keeping only the content of the members
+    accepted by `select(path)`.
+    """
+    loop = asyncio.get_running_loop()
+    # the archive is decompressed by tarfile, whatever Content-Encoding is announced
+    async with aiohttp.ClientSession(auto_decompress=False) as session:
+        async with session.get(download_url) as response:
+            if response.status != 200:
+                logger.error(f"Backup download error: {response.status}")
+                raise HTTPException(status_code=400, detail=f"Backup download error: {response.status}")
+            fileobj = _AsyncStreamFile(response.content, loop)
+            try:
+                return await asyncio.to_thread(_scan, fileobj, select)
+            except asyncio.CancelledError:
+                # client gone: the tar thread stops at its next read instead of waiting for the download
+                fileobj.close()
+                response.close()
+                raise
+            except tarfile.TarError as e:
+                logger.error(f"Error while reading backup archive: {e}")
+                raise HTTPException(status_code=400, detail=f"Error while reading backup archive: {e}")
+            except OSError as e:
+                logger.error(f"Error while downloading backup archive: {e}")
+                raise HTTPException(status_code=504, detail=f"Error while downloading backup archive: {e}")
@@ -1,14 +1,16 @@
 from fastapi import HTTPException
 from kubernetes import client
+
+from k8s.k8s_gateway import custom_objects_api
 from vui_common.configs.config_proxy import config_app
 from vui_common.logger.logger_proxy import logger
 
 from constants.velero import VELERO
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
-def cleanup_server_request(resource_name: str, plural: str):
+async def cleanup_server_request(resource_name: str, plural: str):
     """
     Deletes the resource after use to avoid accumulation in the cluster.
 
@@ -17,7 +19,7 @@ def cleanup_server_request(resource_name: str, plural: str):
     """
     logger.info(f"Cleanup {plural}:{resource_name}")
     try:
-        custom_objects.delete_namespaced_custom_object(
+        await custom_objects.delete_namespaced_custom_object(
             group=VELERO["GROUP"],
             version=VELERO["VERSION"],
             namespace=config_app.k8s.velero_namespace,
@@ -0,0 +1,119 @@
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from croniter import croniter
+
+from constants.resources import RESOURCES, ResourcesNames
+from k8s.k8s_resource_cache import ResourceIndexer, resource_cache
+
+CRON_CACHE_MAX_ENTRIES = int(os.getenv('CRON_CACHE_MAX_ENTRIES', '256'))
+CRON_CACHE_BUCKET_SEC = int(os.getenv('CRON_CACHE_BUCKET_SEC', '3600'))
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def expand_cron(cron_string: str, start_time: datetime, days: int = 7) -> Tuple[int, ...]:
+    """
+    Minutes of the week (0 = Sunday 00:00) at which the cron fires between `start_time` and `start_time + days`,
+    in chronological order and without duplicates
+    """
+    end_time = start_time + timedelta(days=days)
+    cron = croniter(cron_string, start_time)
+    offsets = []
+    seen = set()
+
+    while True:
+        event_time = cron.get_next(datetime)
+        if event_time > end_time:
+            break
+        # Convert weekday: 0 for Sunday, 1 for Monday, ..., 6 for Saturday
+        weekday = (event_time.weekday() + 1) % 7
+        offset = weekday * MINUTES_PER_DAY + event_time.hour * 60 + event_time.minute
+        if offset not in seen:
+            seen.add(offset)
+            offsets.append(offset)
+
+    return tuple(offsets)
+
+
+class CronExpansionCache(ResourceIndexer):
+    """
+    LRU cache of the cron expansions, keyed by (cron, window start bucket, days).
+
+    📌 The window start is rounded down to CRON_CACHE_BUCKET_SEC, so the same expansion is reused by every
+    request of the bucket.
+    📌 Registered on the schedules store: when no schedule uses a cron string anymore (the `spec.schedule` changed
+    or the schedule was deleted) its expansions are dropped.
+    """
+
+    def __init__(self, max_entries: int = CRON_CACHE_MAX_ENTRIES, bucket_sec: int = CRON_CACHE_BUCKET_SEC):
+        self.max_entries = max_entries
+        self.bucket_sec = max(bucket_sec, 1)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._schedule_crons: Dict[Tuple[str, str], str] = {}
+        self._cron_refs: Counter = Counter()
+        self._orphans = set()
+
+    def week_offsets(self, cron_string: str, days: int = 7, now: Optional[datetime] = None) -> Tuple[int, ...]:
+        self._evict_orphans()
+
+        now = now or datetime.now()
+        bucket = int(now.timestamp() // self.bucket_sec)
+        key = (cron_string, bucket, days)
+
+        offsets = self._entries.get(key)
+        if offsets is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return offsets
+
+        self.misses += 1
+        offsets = expand_cron(cron_string, datetime.fromtimestamp(bucket * self.bucket_sec), days)
+        self._entries[key] = offsets
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return offsets
+
+    def invalidate(self, cron_string: str):
+        for key in [key for key in self._entries if key[0] == cron_string]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def _evict_orphans(self):
+        # MODIFIED events are a remove followed by an add: orphans are evicted only if no add claimed them back
+        for cron_string in self._orphans:
+            if self._cron_refs[cron_string] <= 0:
+                del self._cron_refs[cron_string]
+                self.invalidate(cron_string)
+        self._orphans.clear()
+
+    # ResourceIndexer on the schedules store
+
+    def rebuild(self, items):
+        for key in list(self._schedule_crons):
+            self.remove(key)
+        for key, obj in items.items():
+            self.add(key, obj)
+        self._evict_orphans()
+
+    def add(self, key, obj):
+        cron_string = (obj.get('spec') or {}).get('schedule') or ''
+        self._schedule_crons[key] = cron_string
+        self._cron_refs[cron_string] += 1
+
+    def remove(self, key):
+        cron_string = self._schedule_crons.pop(key, None)
+        if cron_string is not None:
+            self._cron_refs[cron_string] -= 1
+            self._orphans.add(cron_string)
+
+
+cron_expansion_cache = CronExpansionCache()
+resource_cache.store(RESOURCES[ResourcesNames.SCHEDULE].plural).add_indexer(cron_expansion_cache)
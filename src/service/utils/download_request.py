@@ -1,12 +1,15 @@
-import tempfile
-import tarfile
-import aiohttp
-import aiofiles
+import os
+import time
+from datetime import datetime
 import asyncio
 
 from fastapi import HTTPException
 from kubernetes import client
-from typing import Optional
+
+from k8s.k8s_event_hub import event_hub
+from k8s.k8s_gateway import custom_objects_api
+from k8s.k8s_resource_cache import list_velero_resources
+from typing import Dict, Optional, Tuple
 
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
@@ -15,49 +18,98 @@ from vui_common.logger.logger_proxy import logger
 
 from service.utils.cleanup_requests import cleanup_server_request
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
+DOWNLOAD_REQUEST_TIMEOUT_SEC = float(os.getenv('DOWNLOAD_REQUEST_TIMEOUT_SEC', '30'))
+DOWNLOAD_REQUEST_POLL_SEC = float(os.getenv('DOWNLOAD_REQUEST_POLL_SEC', '5'))
+DOWNLOAD_URL_EXPIRY_MARGIN_SEC = float(os.getenv('DOWNLOAD_URL_EXPIRY_MARGIN_SEC', '30'))
+DOWNLOAD_REQUEST_GC_INTERVAL_SEC = float(os.getenv('DOWNLOAD_REQUEST_GC_INTERVAL_SEC', '300'))
+DOWNLOAD_REQUEST_MAX_AGE_SEC = float(os.getenv('DOWNLOAD_REQUEST_MAX_AGE_SEC', '3600'))
 
-async def create_download_request(resource_name: str, resource_kind: str) -> Optional[str]:
+# Velero does not always report the expiration: the URLs without it are reused for this time only
+_DEFAULT_URL_TTL_SEC = 60
+_DOWNLOAD_REQUEST_PREFIX = "download-"
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _processed_url(download_request: Optional[dict]) -> Optional[Tuple[str, float]]:
+    """(downloadURL, expiration timestamp) of a Processed DownloadRequest whose URL is still usable"""
+    status = (download_request or {}).get("status", {})
+    if status.get("phase") != "Processed" or not status.get("downloadURL"):
+        return None
+    expires_at = _parse_time(status.get("expiration")) or time.time() + _DEFAULT_URL_TTL_SEC
+    if expires_at - DOWNLOAD_URL_EXPIRY_MARGIN_SEC <= time.time():
+        return None
+    return status["downloadURL"], expires_at
+
+
+class DownloadRequestManager:
     """
-    Creates a Velero DownloadRequest to download the requested data.
-    If a request already exists, reuses or deletes it and creates a new one.
+    Lifecycle of the Velero DownloadRequests created by the UI.
 
-    :param resource_name: Name of the resource (e.g., backup_name).
-    :param resource_kind: Type of the resource (BackupLog, BackupContents, etc.).
-    :return: URL for download or None if it fails
+    📌 The Processed phase is awaited on the `downloadrequests` watch (event hub); a GET every
+    DOWNLOAD_REQUEST_POLL_SEC is only a safety net for a missed event.
+    📌 The signed URLs are cached until their expiration (minus a margin) and the concurrent requests for the same
+    (name, kind) share a single DownloadRequest.
+    📌 The DownloadRequests created by the UI are garbage collected in the background when expired or older than
+    DOWNLOAD_REQUEST_MAX_AGE_SEC.
     """
-    logger.info(f"Create download request download-{resource_name}-{resource_kind.lower()}")
-    download_request_name = f"download-{resource_name}-{resource_kind.lower()}"
 
-    try:
-        # Check if a DownloadRequest already exists
-        existing_request = custom_objects.get_namespaced_custom_object(
-            group=VELERO["GROUP"],
-            version=VELERO["VERSION"],
-            namespace=config_app.k8s.velero_namespace,
-            plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
-            name=download_request_name
-        )
-
-        # If it exists and is Processed, we reuse its URL
-        if existing_request.get("status", {}).get("phase") == "Processed":
-            logger.info(f"Download request from existing url {existing_request.get('status', {}).get('downloadURL')}")
-            return existing_request.get("status", {}).get("downloadURL")
-
-        # If it exists but is not Processed, we delete it and recreate it
-        logger.info(f"DownloadRequest ‘{download_request_name}’ already exists but is not Processed. By deleting it...")
-        cleanup_server_request(resource_name, RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural)
-
-    except client.exceptions.ApiException as e:
-        if e.status != 404:  # Ignoriamo l'errore 404 (not found)
+    def __init__(self):
+        self._urls: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._gc_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def request_name(resource_name: str, resource_kind: str) -> str:
+        return f"{_DOWNLOAD_REQUEST_PREFIX}{resource_name}-{resource_kind.lower()}"
+
+    async def get_url(self, resource_name: str, resource_kind: str) -> Optional[str]:
+        key = (resource_name, resource_kind)
+        cached = self._urls.get(key)
+        if cached and cached[1] - DOWNLOAD_URL_EXPIRY_MARGIN_SEC > time.time():
+            return cached[0]
+
+        # the concurrent callers wait for the same DownloadRequest
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._resolve(resource_name, resource_kind))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _get(self, download_request_name: str) -> Optional[dict]:
+        try:
+            return await custom_objects.get_namespaced_custom_object(
+                group=VELERO["GROUP"],
+                version=VELERO["VERSION"],
+                namespace=config_app.k8s.velero_namespace,
+                plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
+                name=download_request_name
+            )
+        except client.exceptions.ApiException as e:
+            if e.status == 404:
+                return None
             logger.error(f"Error while checking DownloadRequest ‘{download_request_name}’: {e}")
             raise HTTPException(status_code=400,
                                 detail=f"Error while checking DownloadRequest ‘{download_request_name}’: {e}")
 
-    try:
-        # Creating the new DownloadRequest
-        logger.info("Creating the new DownloadRequest")
+    async def _delete(self, download_request_name: str):
+        try:
+            await cleanup_server_request(download_request_name, RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural)
+        except HTTPException as e:
+            # already gone (e.g. removed by Velero when expired)
+            logger.debug(f"DownloadRequest ‘{download_request_name}’ cleanup: {e.detail}")
+
+    async def _create(self, resource_name: str, resource_kind: str, download_request_name: str):
         download_request_body = {
             "apiVersion": f"{VELERO['GROUP']}/{VELERO['VERSION']}",
             "kind": "DownloadRequest",
@@ -72,69 +124,145 @@ async def create_download_request(resource_name: str, resource_kind: str) -> Opt
                 }
             }
         }
+        for attempt in range(3):
+            try:
+                await custom_objects.create_namespaced_custom_object(
+                    group=VELERO["GROUP"],
+                    version=VELERO["VERSION"],
+                    namespace=config_app.k8s.velero_namespace,
+                    plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
+                    body=download_request_body
+                )
+                return
+            except client.exceptions.ApiException as e:
+                # 409: the deleted request is still terminating
+                if e.status != 409 or attempt == 2:
+                    raise
+                await asyncio.sleep(0.5 * (attempt + 1))
 
-        custom_objects.create_namespaced_custom_object(
-            group=VELERO["GROUP"],
-            version=VELERO["VERSION"],
-            namespace=config_app.k8s.velero_namespace,
-            plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
-            body=download_request_body
-        )
-
-        # Wait up to 5 attempts for the request to be processed
-        for _ in range(5):
-            await asyncio.sleep(5)
-            download_request = custom_objects.get_namespaced_custom_object(
-                group=VELERO["GROUP"],
-                version=VELERO["VERSION"],
-                namespace=config_app.k8s.velero_namespace,
-                plural=RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
-                name=download_request_name
-            )
+    async def _resolve(self, resource_name: str, resource_kind: str) -> Optional[str]:
+        key = (resource_name, resource_kind)
+        download_request_name = self.request_name(resource_name, resource_kind)
+        logger.info(f"Create download request {download_request_name}")
 
-            if download_request.get("status", {}).get("phase") == "Processed":
-                return download_request.get("status", {}).get("downloadURL")
+        # subscribed before the GET/create: the Processed event cannot be missed
+        subscription = event_hub.subscribe(RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural,
+                                           config_app.k8s.velero_namespace)
+        try:
+            existing_request = await self._get(download_request_name)
+            processed = _processed_url(existing_request)
+            if processed:
+                logger.info(f"Download request from existing url {processed[0]}")
+                self._urls[key] = processed
+                return processed[0]
 
-    except Exception as e:
-        logger.error(f"Error in DownloadRequest for ‘{resource_name}’: {e}")
-        raise HTTPException(status_code=400,
-                            detail=f"Error in DownloadRequest for ‘{resource_name}’: {e}")
+            if existing_request is not None and self._is_stale(existing_request):
+                # Processed but expired (a new signed URL is needed) or never processed by Velero
+                logger.info(f"DownloadRequest ‘{download_request_name}’ is expired or stale. By deleting it...")
+                await self._delete(download_request_name)
+                existing_request = None
 
+            try:
+                if existing_request is None:
+                    # Creating the new DownloadRequest
+                    logger.info("Creating the new DownloadRequest")
+                    await self._create(resource_name, resource_kind, download_request_name)
+                else:
+                    # a New request is still processed by Velero: wait for it instead of recreating it
+                    logger.info(f"DownloadRequest ‘{download_request_name}’ already exists, waiting for it...")
 
-async def download_and_extract_backup(download_url: str) -> Optional[str]:
-    logger.info(f"Download and extract backup from {download_url}")
-    try:
-        # Download the file asynchronously
-        async with aiohttp.ClientSession() as session:
-            async with session.get(download_url) as response:
-                if response.status != 200:
-                    logger.error(f"Backup download error: {response.status}")
-                    raise HTTPException(status_code=400,
-                                        detail=f"Backup download error: {response.status}")
-
-                # Writes the contents to a temporary file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".tar.gz")
-                temp_file_path = temp_file.name
-                temp_file.close()  # Close to write async
-
-                async with aiofiles.open(temp_file_path, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(1024 * 1024):
-                        await f.write(chunk)
-
-        # Creates a temporary folder for extraction
-        extract_folder = tempfile.mkdtemp()
-
-        # Extract the .tar.gz file in a separate thread (to avoid blockages)
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, extract_tarfile, temp_file_path, extract_folder)
-
-        return extract_folder
-
-    except Exception as e:
-        logger.error(f"Error while downloading and extracting backup: {e}")
-        raise HTTPException(status_code=400,
-                            detail=f"Error while downloading and extracting backup: {e}")
-
-def extract_tarfile(tar_path: str, extract_to: str):
-    with tarfile.open(tar_path, "r:gz") as tar:
-        tar.extractall(path=extract_to)
\ No newline at end of file
+                processed = await self._wait_processed(subscription, download_request_name)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"Error in DownloadRequest for ‘{resource_name}’: {e}")
+                raise HTTPException(status_code=400,
+                                    detail=f"Error in DownloadRequest for ‘{resource_name}’: {e}")
+
+            if processed:
+                self._urls[key] = processed
+                return processed[0]
+            logger.warning(f"DownloadRequest ‘{download_request_name}’ not processed after "
+                           f"{DOWNLOAD_REQUEST_TIMEOUT_SEC} seconds")
+            return None
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    @staticmethod
+    def _is_stale(download_request: dict) -> bool:
+        if download_request.get("status", {}).get("phase") == "Processed":
+            return True
+        created_at = _parse_time(download_request.get("metadata", {}).get("creationTimestamp"))
+        return created_at is not None and time.time() - created_at > DOWNLOAD_REQUEST_TIMEOUT_SEC
+
+    async def _wait_processed(self, subscription, download_request_name: str) -> Optional[Tuple[str, float]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + DOWNLOAD_REQUEST_TIMEOUT_SEC
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=min(remaining, DOWNLOAD_REQUEST_POLL_SEC))
+            except asyncio.TimeoutError:
+                # no event: the watch may be down, check the request directly
+                processed = _processed_url(await self._get(download_request_name))
+            else:
+                if event.obj.get("metadata", {}).get("name") != download_request_name or event.event_type == "DELETED":
+                    continue
+                processed = _processed_url(event.obj)
+            if processed:
+                return processed
+        return None
+
+    def start(self):
+        """Start the background garbage collection (at the application startup)"""
+        if self._gc_task is None or self._gc_task.done():
+            self._gc_task = asyncio.create_task(self._run_gc())
+
+    async def stop(self):
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            try:
+                await self._gc_task
+            except asyncio.CancelledError:
+                pass
+            self._gc_task = None
+
+    async def _run_gc(self):
+        while True:
+            await asyncio.sleep(DOWNLOAD_REQUEST_GC_INTERVAL_SEC)
+            try:
+                await self.collect_garbage()
+            except Exception as e:
+                logger.error(f"DownloadRequest garbage collection error: {e}")
+
+    async def collect_garbage(self):
+        """Delete the DownloadRequests created by the UI that are expired or too old"""
+        now = time.time()
+        for download_request in await list_velero_resources(RESOURCES[ResourcesNames.DOWNLOAD_REQUEST].plural):
+            metadata = download_request.get("metadata", {})
+            name = metadata.get("name", "")
+            if not name.startswith(_DOWNLOAD_REQUEST_PREFIX) or metadata.get("deletionTimestamp"):
+                continue
+            expires_at = _parse_time(download_request.get("status", {}).get("expiration"))
+            created_at = _parse_time(metadata.get("creationTimestamp"))
+            if (expires_at is not None and expires_at <= now) or \
+                    (created_at is not None and now - created_at > DOWNLOAD_REQUEST_MAX_AGE_SEC):
+                await self._delete(name)
+
+        for key, (_, expires_at) in list(self._urls.items()):
+            if expires_at <= now:
+                del self._urls[key]
+
+
+download_requests = DownloadRequestManager()
+
+
+async def create_download_request(resource_name: str, resource_kind: str) -> Optional[str]:
+    """
+    Creates a Velero DownloadRequest to download the requested data.
+    If a usable request already exists, its URL is reused; the expired ones are recreated.
+
+    :param resource_name: Name of the resource (e.g., backup_name).
+    :param resource_kind: Type of the resource (BackupLog, BackupContents, etc.).
+    :return: URL for download or None if it fails
+    """
+    return await download_requests.get_url(resource_name, resource_kind)
@@ -0,0 +1,102 @@
+import base64
+import bisect
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from k8s.k8s_resource_cache import ResourceStore
+
+FieldPath = Tuple[str, ...]
+
+# field separator: a dot not escaped with a backslash
+_FIELD_SEPARATOR_RE = re.compile(r'(?<!\\)\.')
+
+
+def _encode_continue(key: Tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def _decode_continue(token: str) -> Tuple[str, str]:
+    try:
+        namespace, name = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return str(namespace), str(name)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid continue token")
+
+
+def paginate(items: List[dict],
+             limit: Optional[int] = None,
+             continue_token: Optional[str] = None) -> Tuple[List[dict], Optional[Dict[str, Any]]]:
+    """
+    Page a list of resources sorted by (namespace, name), as the K8s API does with limit/continue.
+
+    📌 The token is the key of the last returned item: pages stay consistent when items are added or removed.
+    📌 The pagination info is None when neither `limit` nor `continue_token` is requested.
+    """
+    if limit is None and not continue_token:
+        return items, None
+    if limit is not None:
+        # the NATS requests pass the query parameters as strings
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="limit must be an integer")
+        if limit < 1:
+            raise HTTPException(status_code=400, detail="limit must be greater than 0")
+
+    if continue_token:
+        keys = [ResourceStore.key(item) for item in items]
+        items = items[bisect.bisect_right(keys, _decode_continue(continue_token)):]
+
+    page = items if limit is None else items[:limit]
+    remaining = len(items) - len(page)
+    return page, {'continue_token': _encode_continue(ResourceStore.key(page[-1])) if remaining else None,
+                  'remaining_item_count': remaining}
+
+
+def _collapse(paths: Sequence[FieldPath]) -> List[FieldPath]:
+    """Remove the duplicates and the paths inside another requested path (`spec,spec.ttl` -> `spec`)"""
+    unique = list(dict.fromkeys(paths))
+    return [path for path in unique
+            if not any(other != path and path[:len(other)] == other for other in unique)]
+
+
+def parse_fields(fields: Optional[str]) -> List[FieldPath]:
+    """
+    `metadata.name,status.phase` -> [('metadata', 'name'), ('status', 'phase')]
+
+    📌 A dot inside a key is escaped with a backslash: `metadata.labels.velero\\.io/schedule-name`.
+    """
+    if not fields:
+        return []
+    paths = [tuple(part.replace('\\.', '.') for part in _FIELD_SEPARATOR_RE.split(field.strip()) if part)
+             for field in fields.split(',')]
+    return _collapse([path for path in paths if path])
+
+
+def project(item: dict, paths: Sequence[FieldPath]) -> dict:
+    """Copy only the requested (nested) fields of a resource, missing fields are skipped"""
+    projected = {}
+    for path in paths:
+        value = item
+        for part in path:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+    return projected
+
+
+def projection_paths(fields: Optional[str], summary: bool, summary_paths: Sequence[FieldPath]) -> List[FieldPath]:
+    """Fields requested with `fields=`, or the summary fields of the resource; empty for full objects"""
+    paths = parse_fields(fields)
+    if summary:
+        paths = list(summary_paths) + paths
+    # overlapping paths would write into the subtree copied from the source item (the cached model)
+    return _collapse(paths)
@@ -0,0 +1,270 @@
+import asyncio
+import os
+import re
+import sqlite3
+import tempfile
+from contextlib import closing
+from datetime import timezone
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from vui_common.logger.logger_proxy import logger
+
+from service.utils.log_stream import LogFilter, parse_iso_datetime
+
+LOG_INDEX_FOLDER = os.getenv('LOG_INDEX_FOLDER', os.path.join(tempfile.gettempdir(), 'velero-logs'))
+LOG_INDEX_MAX_ENTRIES = int(os.getenv('LOG_INDEX_MAX_ENTRIES', '64'))
+
+_INSERT_BATCH = 5000
+# logrus text formatter: key=value or key="quoted \"value\""
+_FIELD_RE = re.compile(r'([\w.]+)=("(?:[^"\\]|\\.)*"|\S*)')
+_ERROR_FIELDS = ('error', 'err', 'error.message')
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE records (
+    line INTEGER PRIMARY KEY,
+    time REAL,
+    level TEXT,
+    msg TEXT,
+    resource TEXT,
+    namespace TEXT,
+    error TEXT,
+    raw TEXT
+);
+CREATE INDEX records_level ON records (level);
+CREATE INDEX records_namespace ON records (namespace);
+CREATE INDEX records_time ON records (time);
+CREATE VIRTUAL TABLE records_fts USING fts5(raw, content='records', content_rowid='line', tokenize='trigram');
+"""
+
+
+class LogRecord(NamedTuple):
+    line: int
+    time: Optional[float]
+    level: Optional[str]
+    msg: Optional[str]
+    resource: Optional[str]
+    namespace: Optional[str]
+    error: Optional[str]
+    raw: str
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        moment = parse_iso_datetime(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_log_line(number: int, line: str) -> LogRecord:
+    """Split a logrus key=value line in a record, the missing fields are None"""
+    fields = {key: _unquote(value) for key, value in _FIELD_RE.findall(line)}
+    level = fields.get('level')
+    return LogRecord(line=number,
+                     time=_timestamp(fields.get('time')),
+                     level=level.lower() if level else None,
+                     msg=fields.get('msg'),
+                     resource=fields.get('resource'),
+                     namespace=fields.get('namespace'),
+                     error=next((fields[key] for key in _ERROR_FIELDS if fields.get(key)), None),
+                     raw=line)
+
+
+class LogQuery:
+    """
+    Filters of the indexed log records: the LogFilter ones plus the structured `namespace` and `resource` fields.
+    """
+
+    def __init__(self, log_filter: LogFilter, namespace: Optional[str] = None, resource: Optional[str] = None):
+        self.log_filter = log_filter
+        self.namespace = namespace
+        self.resource = resource
+
+    def to_sql(self) -> Tuple[str, list]:
+        conditions, parameters = [], []
+        grep = self.log_filter.grep
+        if grep and len(grep) >= 3:
+            # trigram index: case-insensitive substring match, as the grep of the streamed logs
+            conditions.append("line IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)")
+            parameters.append('"' + grep.replace('"', '""') + '"')
+        elif grep:
+            conditions.append("instr(lower(raw), ?) > 0")
+            parameters.append(grep)
+        if self.log_filter.levels:
+            conditions.append(f"level IN ({','.join('?' * len(self.log_filter.levels))})")
+            parameters.extend(sorted(self.log_filter.levels))
+        if self.log_filter.since:
+            conditions.append("time >= ?")
+            parameters.append(self.log_filter.since.timestamp())
+        if self.log_filter.until:
+            conditions.append("time <= ?")
+            parameters.append(self.log_filter.until.timestamp())
+        if self.namespace:
+            conditions.append("namespace = ?")
+            parameters.append(self.namespace)
+        if self.resource:
+            conditions.append("resource = ?")
+            parameters.append(self.resource)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", parameters
+
+
+class LogIndex:
+    """
+    On-disk SQLite index of the parsed log of a backup/restore.
+
+    📌 One file per resource under LOG_INDEX_FOLDER, tagged with the version of the log it was built from (UID and
+    completion timestamp of the resource: the log is immutable once the resource is finished). The index survives
+    restarts and the expiration of the DownloadRequest URLs; it is rebuilt only when the version changes.
+    📌 The queries run on the indexed columns (level, namespace, time) and on an FTS5 trigram table for grep.
+    📌 The indexes being built or queried are never evicted.
+    """
+
+    def __init__(self, folder: str = LOG_INDEX_FOLDER, max_entries: int = LOG_INDEX_MAX_ENTRIES):
+        self.folder = folder
+        self.max_entries = max(1, max_entries)
+        self._versions: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._in_use: Dict[str, int] = {}
+
+    def _path(self, resource_type: str, resource_name: str) -> str:
+        return os.path.join(self.folder, f"{resource_type}-{resource_name}.sqlite")
+
+    @staticmethod
+    def _stored_version(path: str) -> Optional[str]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with closing(sqlite3.connect(path)) as connection:
+                row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def _is_current(self, path: str, version: str) -> bool:
+        if self._versions.get(path) is None:
+            stored = self._stored_version(path)
+            if stored is not None:
+                self._versions[path] = stored
+        return self._versions.get(path) == version and os.path.exists(path)
+
+    def _evict(self, protected: Set[str]):
+        files = [os.path.join(self.folder, name) for name in os.listdir(self.folder) if name.endswith('.sqlite')]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            if path in protected:
+                continue
+            self._versions.pop(path, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def search(self,
+                     resource_type: str,
+                     resource_name: str,
+                     version: str,
+                     open_lines,
+                     log_query: LogQuery,
+                     tail: Optional[int] = None) -> List[LogRecord]:
+        """
+        Query the index of a resource, building it first from `open_lines()` (LogLines of (number, line)) when
+        missing or built from another version of the log.
+        """
+        path = self._path(resource_type, resource_name)
+        self._in_use[path] = self._in_use.get(path, 0) + 1
+        try:
+            await self._ensure(path, version, open_lines)
+            return await self._query(path, log_query, tail)
+        finally:
+            self._in_use[path] -= 1
+            if not self._in_use[path]:
+                del self._in_use[path]
+
+    async def _ensure(self, path: str, version: str, open_lines):
+        if self._is_current(path, version):
+            return
+
+        # concurrent requests of the same log wait for a single build
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            if self._is_current(path, version):
+                return
+            os.makedirs(self.folder, exist_ok=True)
+            building = f"{path}.{os.getpid()}.tmp"
+            lines = await open_lines()
+            try:
+                await self._build(building, version, lines)
+            finally:
+                # the download is released also when the build fails halfway
+                await lines.aclose()
+            os.replace(building, path)
+            self._versions[path] = version
+            logger.info(f"Log index {os.path.basename(path)} built")
+            await asyncio.to_thread(self._evict, set(self._in_use))
+
+    @staticmethod
+    async def _build(path: str, version: str, lines: AsyncIterator[Tuple[int, str]]):
+        if os.path.exists(path):
+            os.remove(path)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            connection.executescript(_SCHEMA)
+            connection.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (version,))
+
+            def insert(batch):
+                # parsed in the worker thread: the event loop only moves the raw lines
+                connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                       [parse_log_line(number, line) for number, line in batch])
+
+            batch = []
+            async for item in lines:
+                batch.append(item)
+                if len(batch) >= _INSERT_BATCH:
+                    # the inserts run off the event loop, the download goes on meanwhile
+                    await asyncio.to_thread(insert, batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(insert, batch)
+
+            def finish():
+                connection.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+                connection.commit()
+
+            await asyncio.to_thread(finish)
+        except BaseException:
+            connection.close()
+            os.remove(path)
+            raise
+        connection.close()
+
+    @staticmethod
+    async def _query(path: str, log_query: LogQuery, tail: Optional[int] = None) -> List[LogRecord]:
+        where, parameters = log_query.to_sql()
+        if tail:
+            sql = f"SELECT * FROM (SELECT * FROM records{where} ORDER BY line DESC LIMIT ?) ORDER BY line"
+            parameters = parameters + [tail]
+        else:
+            sql = f"SELECT * FROM records{where} ORDER BY line"
+
+        def run():
+            # the least recently queried indexes are evicted first
+            os.utime(path)
+            with closing(sqlite3.connect(path)) as connection:
+                return [LogRecord(*row) for row in connection.execute(sql, parameters)]
+
+        return await asyncio.to_thread(run)
+
+
+log_index = LogIndex()
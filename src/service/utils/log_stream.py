@@ -0,0 +1,184 @@
+import re
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+import aiohttp
+from fastapi import HTTPException
+
+ACCEPTED_MIME_TYPES = [
+    "application/gzip",
+    "binary/octet-stream",
+    "application/octet-stream"
+]
+
+LOG_CHUNK_SIZE = 256 * 1024
+
+_LEVEL_RE = re.compile(r'\blevel=(\w+)')
+_TIME_RE = re.compile(r'\btime="?([^"\s]+)"?')
+
+
+async def open_log_download(log_url: str) -> tuple[aiohttp.ClientSession, aiohttp.ClientResponse]:
+    """
+    Start the download of a gzipped log, checking its status and format before anything is streamed.
+
+    📌 The caller owns the returned session and must close it.
+    """
+    # the content is decompressed by the line iterator, whatever Content-Encoding is announced
+    session = aiohttp.ClientSession(auto_decompress=False)
+    try:
+        response = await session.get(log_url)
+        if response.status != 200:
+            raise HTTPException(status_code=400, detail=f"Download error: {response.status}")
+
+        # Check the type of content
+        mime_type = response.headers.get("Content-Type", "").split(";")[0]
+        if mime_type not in ACCEPTED_MIME_TYPES:
+            raise HTTPException(status_code=400, detail=f"Invalid response: Unsupported mime type '{mime_type}'")
+        return session, response
+    except Exception:
+        await session.close()
+        raise
+
+
+async def iter_gzip_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decompress a gzip stream incrementally and yield its lines (without the trailing newline)"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = b''
+    async for chunk in chunks:
+        data = pending + decompressor.decompress(chunk)
+        lines = data.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8', errors='replace')
+    pending += decompressor.flush()
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """`datetime.fromisoformat` accepting the `Z` suffix (not supported before Python 3.11)"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def parse_tail(tail) -> Optional[int]:
+    """Number of last lines requested, the NATS requests pass it as a string"""
+    if tail is None:
+        return None
+    try:
+        tail = int(tail)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="tail must be an integer")
+    if tail < 1:
+        raise HTTPException(status_code=400, detail="tail must be greater than 0")
+    return tail
+
+
+def _as_utc(moment: Optional[datetime | str]) -> Optional[datetime]:
+    if isinstance(moment, str):
+        # NATS requests call the endpoints directly, with the query parameters as strings
+        try:
+            moment = parse_iso_datetime(moment)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid datetime '{moment}'")
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    return moment.replace(tzinfo=timezone.utc)
+
+
+class LogFilter:
+    """
+    Server-side filters of the Velero (logrus) log lines.
+
+    📌 grep: case-insensitive substring; level: one or more levels separated by commas; since/until: time range of
+    the `time=` field. Lines without the filtered field are discarded when the filter is set.
+    """
+
+    def __init__(self,
+                 grep: Optional[str] = None,
+                 level: Optional[str] = None,
+                 since: Optional[datetime] = None,
+                 until: Optional[datetime] = None):
+        self.grep = grep.lower() if grep else None
+        self.levels = {value.strip().lower() for value in level.split(',') if value.strip()} if level else None
+        self.since = _as_utc(since)
+        self.until = _as_utc(until)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.grep or self.levels or self.since or self.until)
+
+    def matches(self, line: str) -> bool:
+        if self.grep and self.grep not in line.lower():
+            return False
+        if self.levels:
+            match = _LEVEL_RE.search(line)
+            if not match or match.group(1).lower() not in self.levels:
+                return False
+        if self.since or self.until:
+            match = _TIME_RE.search(line)
+            try:
+                moment = _as_utc(parse_iso_datetime(match.group(1))) if match else None
+            except ValueError:
+                moment = None
+            if moment is None:
+                return False
+            if (self.since and moment < self.since) or (self.until and moment > self.until):
+                return False
+        return True
+
+
+async def filter_log_lines(lines: AsyncIterator[str],
+                           log_filter: LogFilter,
+                           tail: Optional[int] = None) -> AsyncIterator[tuple[int, str]]:
+    """(line number, line) of the matching lines; with `tail` only the last N matches are kept in memory"""
+    tail = parse_tail(tail)
+    last: Optional[deque] = deque(maxlen=tail) if tail else None
+    number = 0
+    async for line in lines:
+        number += 1
+        if log_filter.active and not log_filter.matches(line):
+            continue
+        if last is not None:
+            last.append((number, line))
+        else:
+            yield number, line
+
+    for item in last or ():
+        yield item
+
+
+class LogLines:
+    """
+    Async iterator over an open log download.
+
+    📌 `aclose` releases the connection even when the iteration never started (e.g. a response never sent); it is
+    also called when the iteration ends. Closing twice is a no-op.
+    """
+
+    def __init__(self, items: AsyncIterator, *closers):
+        self._items = items
+        self._closers = closers
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._items.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if hasattr(self._items, 'aclose'):
+                await self._items.aclose()
+        finally:
+            for closer in self._closers:
+                await closer()
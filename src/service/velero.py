@@ -1,13 +1,14 @@
 import re
-import asyncio
 from kubernetes import client
 from kubernetes.client import ApiException
 
+from k8s.k8s_gateway import core_v1_api
+
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
 from vui_common.configs.config_proxy import config_app
 from datetime import timezone
 
-coreV1 = client.CoreV1Api()
+coreV1 = core_v1_api()
 
 
 def _parse_version_output(output):
@@ -46,7 +47,7 @@ async def get_velero_version_service():
 
     try:
         for label_selector in label_selectors:
-            pods = coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
+            pods = await coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
 
             if pods.items:
                 pod = pods.items[0]
@@ -69,7 +70,7 @@ async def get_velero_version_service():
 
 @trace_k8s_async_method(description="Get velero Pods")
 async def get_pods_service(label_selectors_by_type, namespace):
-    coreV1 = client.CoreV1Api()
+    coreV1 = core_v1_api()
 
     pods_info = []
     seen_pods = set()
@@ -81,7 +82,7 @@ async def get_pods_service(label_selectors_by_type, namespace):
 
     for pod_type, label_selector in label_selectors_by_type.items():
         try:
-            pods = coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
+            pods = await coreV1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
             for pod in pods.items:
                 pod_name = pod.metadata.name
                 if pod_name in seen_pods:
@@ -115,18 +116,16 @@ async def get_pods_service(label_selectors_by_type, namespace):
 
 
 async def get_pod_logs_service(pod, namespace="velero", lines=100):
-    coreV1 = client.CoreV1Api()
+    coreV1 = core_v1_api()
 
-    def _get_logs():
-        try:
-            return coreV1.read_namespaced_pod_log(
-                name=pod,
-                namespace=namespace,
-                tail_lines=lines,
-                timestamps=False,
-            )
-        except client.exceptions.ApiException as e:
-            return f"error while fetching logs for '{pod}': {e}"
-
-    logs = (await asyncio.to_thread(_get_logs)).split("\n")
-    return logs
+    try:
+        logs = await coreV1.read_namespaced_pod_log(
+            name=pod,
+            namespace=namespace,
+            tail_lines=lines,
+            timestamps=False,
+        )
+    except client.exceptions.ApiException as e:
+        logs = f"error while fetching logs for '{pod}': {e}"
+
+    return logs.split("\n")
@@ -1,7 +1,7 @@
 from models.k8s.vsl import VolumeSnapshotLocationResponseSchema
 from schemas.request.create_vsl import CreateVslRequestSchema
 
-from kubernetes import client
+from k8s.k8s_gateway import custom_objects_api
 
 from schemas.request.update_vsl import UpdateVslRequestSchema
 from vui_common.utils.k8s_tracer import trace_k8s_async_method
@@ -10,12 +10,12 @@ from vui_common.configs.config_proxy import config_app
 from constants.velero import VELERO
 from constants.resources import RESOURCES, ResourcesNames
 
-custom_objects = client.CustomObjectsApi()
+custom_objects = custom_objects_api()
 
 
 @trace_k8s_async_method(description="Get Volume Snapshot Locations")
 async def get_vsls_service():
-    vsl = custom_objects.list_namespaced_custom_object(
+    vsl = await custom_objects.list_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -54,7 +54,7 @@ async def create_vsl_service(vsl_data: CreateVslRequestSchema):
             "key": vsl_data.credentialKey
         }
 
-    response = custom_objects.create_namespaced_custom_object(
+    response = await custom_objects.create_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -67,7 +67,7 @@ async def create_vsl_service(vsl_data: CreateVslRequestSchema):
 @trace_k8s_async_method(description="Delete Volume Snapshot Locations")
 async def delete_vsl_service(vsl_name: str):
     """Delete a Velero BSL"""
-    response = custom_objects.delete_namespaced_custom_object(
+    response = await custom_objects.delete_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -82,7 +82,7 @@ async def update_vsl_service(vsl_data: UpdateVslRequestSchema):
     Update a Backup Storage Location (BSL) in Kubernetes
     """
 
-    existing_vsl = custom_objects.get_namespaced_custom_object(
+    existing_vsl = await custom_objects.get_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -112,7 +112,7 @@ async def update_vsl_service(vsl_data: UpdateVslRequestSchema):
         if "spec" in existing_vsl and isinstance(existing_vsl["spec"], dict) and 'credential' in existing_vsl["spec"]:
             existing_vsl['spec'].pop("credential")
 
-    response = custom_objects.replace_namespaced_custom_object(
+    response = await custom_objects.replace_namespaced_custom_object(
         group=VELERO["GROUP"],
         version=VELERO["VERSION"],
         namespace=config_app.k8s.velero_namespace,
@@ -1,6 +1,8 @@
 import aiohttp
 from fastapi import HTTPException
 from kubernetes import client
+
+from k8s.k8s_gateway import k8s_gateway
 from vui_common.configs.config_proxy import config_app
 from datetime import datetime
 from service.k8s_secret import get_secret_service, add_or_update_key_in_secret_service
@@ -86,10 +88,10 @@ async def get_watchdog_env_services():
 @trace_k8s_async_method(description="Get watchdog cron")
 async def get_watchdog_report_cron_service(job_name=f"{config_app.helm.release_name}-report-cronjob"):
     try:
-        api_instance = client.BatchV1Api()
+        api_instance = k8s_gateway.api(client.BatchV1Api)
         logger.debug(f"namespace {config_app.k8s.velero_namespace} job_name {job_name}")
-        cronjob = api_instance.read_namespaced_cron_job(name=job_name,
-                                                        namespace=config_app.k8s.vui_namespace)
+        cronjob = await api_instance.read_namespaced_cron_job(name=job_name,
+                                                              namespace=config_app.k8s.vui_namespace)
         cron_schedule = cronjob.spec.schedule
         return cron_schedule
 
@@ -104,9 +106,9 @@ async def restart_watchdog_service():
         namespace = config_app.k8s.vui_namespace
         deployment_name = f"{config_app.helm.release_name}-watchdog-deploy"
 
-        api_instance = client.AppsV1Api()
+        api_instance = k8s_gateway.api(client.AppsV1Api)
 
-        deployment = api_instance.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+        deployment = await api_instance.read_namespaced_deployment(name=deployment_name, namespace=namespace)
 
         # Update annotation in pod template (NOT just in metadata)
         restart_time = datetime.utcnow().isoformat()
@@ -115,7 +117,7 @@ async def restart_watchdog_service():
         deployment.spec.template.metadata.annotations["kubectl.kubernetes.io/restartedAt"] = restart_time
 
         # Apply the patch to update the deployment and force a restart
-        api_instance.patch_namespaced_deployment(
+        await api_instance.patch_namespaced_deployment(
             name=deployment_name,
             namespace=namespace,
             body={
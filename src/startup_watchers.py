@@ -8,6 +8,9 @@ from integrations import nats_manager_proxy
 
 from k8s.k8s_watch_manager import K8sWatchManager
 from k8s import k8s_watcher_proxy
+from service.stats import stats_aggregates
+from service.utils.download_request import download_requests
+from utils.event_envelope import EventEnvelope, as_text
 from vui_common.configs.config_proxy import config_app
 
 def init_watchers(app):
@@ -15,15 +18,18 @@ def init_watchers(app):
     if config_app.nats.enable:
         nats_manager_proxy.nat_manager = NatsManager(app)
 
-    async def send_global_to_all(message: str):
-        await ws_manager_proxy.ws_manager.broadcast(message)
+    # The messages are EventEnvelope serialized once: the WebSocket sends its text, NATS publishes its bytes
+    async def send_global_to_all(message: EventEnvelope | str):
+        sinks = [ws_manager_proxy.ws_manager.broadcast(message)]
         if config_app.nats.enable:
-            await nats_manager_proxy.nat_manager.publish_global_event(message)
+            sinks.append(nats_manager_proxy.nat_manager.publish_global_event(message))
+        await asyncio.gather(*sinks)
 
-    async def send_user_to_all(user_id: str, message: str):
-        await ws_manager_proxy.ws_manager.send_personal_message(user_id, message)
+    async def send_user_to_all(user_id: str, message: EventEnvelope | str):
+        sinks = [ws_manager_proxy.ws_manager.send_personal_message(user_id, as_text(message))]
         if config_app.nats.enable:
-            await nats_manager_proxy.nat_manager.publish_user_event(user_id, message)
+            sinks.append(nats_manager_proxy.nat_manager.publish_user_event(user_id, message))
+        await asyncio.gather(*sinks)
 
     k8s_watcher_proxy.k8s_watcher_manager = K8sWatchManager(
         send_global_callback=send_global_to_all,
@@ -33,3 +39,9 @@ def init_watchers(app):
     if config_app.nats.enable:
         asyncio.create_task(nats_manager_proxy.nat_manager.run())
     asyncio.create_task(k8s_watcher_proxy.k8s_watcher_manager.start_global_watch_tasks())
+    asyncio.create_task(stats_aggregates.publish_deltas(send_global_to_all))
+    download_requests.start()
+
+
+async def stop_watchers():
+    await download_requests.stop()
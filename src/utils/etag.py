@@ -0,0 +1,45 @@
+import hashlib
+import uuid
+from typing import Optional
+
+from fastapi import Response
+
+from k8s.k8s_resource_cache import resource_cache
+
+# the store generations restart from 0 with the process: the tags of a previous process must never match
+_INSTANCE = uuid.uuid4().hex
+
+
+def collection_etag(plural: str, *params) -> Optional[str]:
+    """
+    Weak ETag of a list response, derived from the generation of the watch-fed cache and the request parameters.
+
+    📌 Computed before the payload is read: if the collection changes in between, the client gets the newer payload
+    with the older tag and simply receives a full response on its next request.
+    📌 The generation changes only with the content of the store: the BOOKMARK events, which advance its
+    resourceVersion, do not change the tag.
+    📌 None when the cache is not in sync (the response is then sent without ETag).
+    """
+    store = resource_cache.synced_store(plural)
+    if store is None:
+        return None
+    digest = hashlib.sha1(repr((plural, _INSTANCE, store.generation, params)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # weak comparison: the W/ prefix is ignored
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return etag.removeprefix('W/') in candidates
+
+
+def etag_headers(etag: Optional[str]) -> Optional[dict]:
+    return {'ETag': etag} if etag else None
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag})
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+from typing import Union
+
+from vui_common.configs.config_proxy import config_app
+
+try:
+    import orjson
+except ImportError:  # optional, faster serializer
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode()
+
+
+class EventEnvelope:
+    """
+    Watch message serialized once and shared by every sink.
+
+    📌 `data` (bytes) is published as is on NATS, `text` is decoded once and sent to all the WebSockets.
+    """
+
+    __slots__ = ('data', '_text')
+
+    def __init__(self, message: dict):
+        self.data = dumps(message)
+        self._text = None
+
+    @classmethod
+    def build(cls, message_type: str, kind: str, payload) -> 'EventEnvelope':
+        return cls({
+            "type": message_type,
+            "kind": kind,
+            "payload": payload,
+            'timestamp': datetime.utcnow().isoformat(),
+            'agent_name': config_app.k8s.cluster_id
+        })
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.data.decode()
+        return self._text
+
+    def __str__(self):
+        return self.text
+
+
+def as_text(message: Union[EventEnvelope, str]) -> str:
+    return message.text if isinstance(message, EventEnvelope) else message
+
@@ -194,7 +194,9 @@ from k8s import k8s_watcher_proxy
 
 
 
+import asyncio
 import json
+import os
 
 from vui_common.ws.base_manager import WebSocket
 from vui_common.logger.logger_proxy import logger
@@ -202,14 +204,108 @@ from vui_common.ws.base_manager import BaseWebSocketManager
 from vui_common.ws.ws_message import WebSocketMessage, build_message
 
 from integrations import nats_manager_proxy
+from utils.event_envelope import EventEnvelope, as_text
+
+WS_SEND_QUEUE_SIZE = int(os.getenv('WS_SEND_QUEUE_SIZE', '256'))
+WS_SEND_TIMEOUT_SEC = float(os.getenv('WS_SEND_TIMEOUT_SEC', '10'))
+# 1013 Try Again Later: the client reconnects and reloads its data
+WS_SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+class _Outbox:
+    """Outbound queue of a connection, drained by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, max_size: int):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=max(1, max_size))
+        self.task = None
+
 
 class WebSocketManager(BaseWebSocketManager):
+    """
+    📌 Every connection has a bounded outbound queue and a writer task: sending only enqueues, so a stalled browser
+    never delays the other clients.
+    📌 A client whose queue is full, or whose send does not complete within WS_SEND_TIMEOUT_SEC, is evicted: its
+    socket is closed and it reconnects.
+    """
+
     def __init__(self):
         super().__init__()
+        self._outboxes: dict[str, _Outbox] = {}
+
+    def _outbox(self, user_id: str) -> _Outbox | None:
+        websocket = self.active_connections.get(user_id)
+        outbox = self._outboxes.get(user_id)
+        if outbox is not None and outbox.websocket is not websocket:
+            # the user reconnected (or is gone): the writer of the old socket is stopped
+            outbox.task.cancel()
+            del self._outboxes[user_id]
+            outbox = None
+        if outbox is None and websocket is not None:
+            outbox = _Outbox(websocket, WS_SEND_QUEUE_SIZE)
+            outbox.task = asyncio.create_task(self._writer(user_id, outbox))
+            self._outboxes[user_id] = outbox
+        return outbox
+
+    def _enqueue(self, user_id: str, text: str) -> bool:
+        """False when the queue of the user is full"""
+        outbox = self._outbox(user_id)
+        if outbox is None:
+            return True
+        try:
+            outbox.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _writer(self, user_id: str, outbox: _Outbox):
+        while True:
+            text = await outbox.queue.get()
+            try:
+                await asyncio.wait_for(outbox.websocket.send_text(text), timeout=WS_SEND_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                asyncio.create_task(self._evict(user_id, outbox, "send timeout"))
+                return
+            except Exception as e:
+                logger.warning(f"WebSocket send to user {user_id} failed: {e}")
+                asyncio.create_task(self._evict(user_id, outbox, "send error"))
+                return
+
+    async def _evict(self, user_id: str, outbox: _Outbox, reason: str):
+        if self._outboxes.get(user_id) is outbox:
+            del self._outboxes[user_id]
+        if outbox.task is not None and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
+        if self.active_connections.get(user_id) is outbox.websocket:
+            self.active_connections.pop(user_id, None)
+        logger.warning(f"Evicting slow WebSocket client {user_id} ({reason}, {outbox.queue.qsize()} queued messages)")
+        try:
+            await outbox.websocket.close(code=WS_SLOW_CLIENT_CLOSE_CODE)
+        except Exception:
+            logger.warning(f"WebSocket for user {user_id} was already closed.")
+
+    async def send_personal_message(self, user_id, message: EventEnvelope | str):
+        user_id = str(user_id)
+        if user_id not in self.active_connections:
+            # unknown user: the base class reports it
+            return await super().send_personal_message(user_id, as_text(message))
+        if not self._enqueue(user_id, as_text(message)):
+            await self._evict(user_id, self._outboxes[user_id], "queue full")
+
+    async def broadcast(self, message: EventEnvelope | str):
+        """Enqueue the message for all the users, the slow ones whose queue is full are evicted"""
+        text = as_text(message)
+        for user_id in set(self._outboxes) - set(self.active_connections):
+            self._outbox(user_id)
+        slow = [user_id for user_id in list(self.active_connections) if not self._enqueue(user_id, text)]
+        if slow:
+            await asyncio.gather(*(self._evict(user_id, self._outboxes[user_id], "queue full") for user_id in slow))
 
     # 🔁 Hook: override
     async def on_user_authenticated(self, user_id: str):
         logger.debug(f"on_user_authenticated override method {user_id}")
+        # start the writer of the new connection
+        self._outbox(str(user_id))
 
     # 🔁 Hook: override
     async def handle_custom_action(self, user_id: str, data: WebSocketMessage, websocket: WebSocket):
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils import backup_content_cache  # noqa: E402
+from service.utils.backup_content_cache import BackupContentCache  # noqa: E402
+
+UIDS = {name: str(uuid.uuid4()) for name in ('nightly-1', 'nightly-2', 'nightly-3')}
+
+
+class _FakeCache(BackupContentCache):
+    """BackupContentCache extracting a fixed size file (reserved first, as an archive) instead of the backup"""
+
+    def __init__(self, folder, max_bytes, content_size=1000):
+        super().__init__(folder, max_bytes)
+        self.content_size = content_size
+        self.downloads = []
+
+    @staticmethod
+    async def _backup_uid(backup_name):
+        return UIDS[backup_name]
+
+    async def _download(self, backup_name, uid, target):
+        self.downloads.append(backup_name)
+        self._reserve(uid, self.content_size)
+        await asyncio.sleep(0.01)
+        os.makedirs(os.path.join(target, 'resources'))
+        with open(os.path.join(target, 'resources', 'backup.json'), 'wb') as f:
+            f.write(b'x' * self.content_size)
+
+
+@pytest.fixture(autouse=True)
+def inspect_folder(tmp_path, monkeypatch):
+    folder = str(tmp_path / 'inspect')
+    config = SimpleNamespace(app=SimpleNamespace(inspect_folder=folder))
+    monkeypatch.setattr(backup_content_cache, 'config_app', config)
+    return folder
+
+
+def test_concurrent_acquires_share_one_download(tmp_path):
+    cache = _FakeCache(str(tmp_path / 'cache'), 10000)
+
+    async def use():
+        async with cache.acquire('nightly-1') as path:
+            await asyncio.sleep(0.01)
+            return path
+
+    async def run():
+        return await asyncio.gather(*[use() for _ in range(3)])
+
+    paths = asyncio.run(run())
+
+    assert cache.downloads == ['nightly-1']
+    assert set(paths) == {os.path.join(cache.folder, UIDS['nightly-1'])}
+    assert cache._entries[UIDS['nightly-1']].refs == 0
+
+
+def test_least_recently_used_evicted_but_not_in_use(tmp_path):
+    cache = _FakeCache(str(tmp_path / 'cache'), 2500)
+
+    async def run():
+        async with cache.acquire('nightly-1'):
+            async with cache.acquire('nightly-2'):
+                pass
+            # over budget: nightly-2 is idle, nightly-1 is in use
+            async with cache.acquire('nightly-3'):
+                assert set(cache._entries) == {UIDS['nightly-1'], UIDS['nightly-3']}
+
+    asyncio.run(run())
+
+    assert not os.path.exists(os.path.join(cache.folder, UIDS['nightly-2']))
+    assert cache.size == 2000
+
+
+def test_backup_too_large_refused(tmp_path):
+    cache = _FakeCache(str(tmp_path / 'cache'), 2500)
+
+    async def run():
+        async with cache.acquire('nightly-1'):
+            async with cache.acquire('nightly-2'):
+                async with cache.acquire('nightly-3'):
+                    pass
+
+    with pytest.raises(backup_content_cache.HTTPException) as error:
+        asyncio.run(run())
+
+    assert error.value.status_code == 507
+    assert UIDS['nightly-3'] not in cache._entries
+    assert not os.path.exists(os.path.join(cache.folder, UIDS['nightly-3'] + '.partial'))
+
+
+def test_alias_pinned_until_expired(tmp_path, inspect_folder):
+    cache = _FakeCache(str(tmp_path / 'cache'), 2500)
+
+    async def run():
+        link = await cache.alias('nightly-1', inspect_folder)
+        async with cache.acquire('nightly-2'):
+            pass
+        # over budget: nightly-1 is not in use but pinned by its alias
+        async with cache.acquire('nightly-3'):
+            pass
+        return link
+
+    link = asyncio.run(run())
+    assert os.path.isfile(os.path.join(link, 'resources', 'backup.json'))
+    assert set(cache._entries) == {UIDS['nightly-1'], UIDS['nightly-3']}
+
+    cache._entries[UIDS['nightly-1']].pinned_until = time.time() - 1
+    cache.max_bytes = 0
+    cache._evict()
+    assert not os.path.lexists(link)
+
+
+def test_load_after_restart(tmp_path, inspect_folder):
+    cache = _FakeCache(str(tmp_path / 'cache'), 10000)
+    link = asyncio.run(cache.alias('nightly-1', inspect_folder))
+    uid = UIDS['nightly-2']
+    os.makedirs(os.path.join(cache.folder, uid + '.partial'))
+    open(os.path.join(cache.folder, uid + '.partial.tar.gz'), 'wb').close()
+    open(os.path.join(cache.folder, 'notes.txt'), 'wb').close()
+
+    restarted = _FakeCache(cache.folder, 10000)
+    restarted._load()
+
+    assert sorted(os.listdir(cache.folder)) == sorted([UIDS['nightly-1'], 'notes.txt'])
+    assert restarted._entries[UIDS['nightly-1']].size == 1000
+    assert restarted._entries[UIDS['nightly-1']].aliases == {link}
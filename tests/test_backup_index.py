@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from k8s.k8s_backup_index import BackupIndex, SCHEDULE_LABEL  # noqa: E402
+
+
+def _timestamp(seconds_ago):
+    return datetime.fromtimestamp(time.time() - seconds_ago, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _backup(name, schedule=None, created=0, phase='Completed', completed_ago=None, location='default'):
+    metadata = {'name': name, 'namespace': 'velero', 'uid': f'uid-{name}',
+                'creationTimestamp': f'2024-05-0{created + 1}T00:00:00Z'}
+    if schedule:
+        metadata['labels'] = {SCHEDULE_LABEL: schedule}
+    status = {'phase': phase}
+    if completed_ago is not None:
+        status['completionTimestamp'] = _timestamp(completed_ago)
+    return {'metadata': metadata, 'spec': {'storageLocation': location}, 'status': status}
+
+
+BACKUPS = [
+    _backup('nightly-1', 'nightly', created=1, completed_ago=3 * 86400),
+    _backup('nightly-2', 'nightly', created=2, completed_ago=86400),
+    _backup('nightly-3', 'nightly', created=3, phase='InProgress'),
+    _backup('hourly-1', 'hourly', created=1, phase='Failed', completed_ago=60, location='s3'),
+    _backup('hourly-2', 'hourly', created=2, phase='Finalizing', location='s3'),
+    _backup('manual-1', created=1, completed_ago=7200),
+    _backup('manual-2', created=4, phase='Deleting', completed_ago=30),
+]
+
+
+def _legacy_filter(backups, schedule_name=None, latest_per_schedule=False, in_progress=False):
+    """Filters of the backup list before the index (scan of every item)"""
+    now = datetime.utcnow()
+    filtered = {}
+    for item in backups:
+        metadata = item['metadata']
+        backup_schedule_name = metadata.get('labels', {}).get(SCHEDULE_LABEL)
+        phase = item.get('status', {}).get('phase', '').lower()
+        completion_timestamp = item.get('status', {}).get('completionTimestamp')
+
+        if schedule_name and backup_schedule_name != schedule_name:
+            continue
+        if in_progress:
+            recent = completion_timestamp is not None and \
+                (now - datetime.strptime(completion_timestamp, '%Y-%m-%dT%H:%M:%SZ')).total_seconds() < 180
+            if not (phase.endswith('ing') or phase == 'inprogress' or recent):
+                continue
+
+        if latest_per_schedule and backup_schedule_name:
+            existing = filtered.get(backup_schedule_name)
+            if existing is None or metadata['creationTimestamp'] > existing['metadata']['creationTimestamp']:
+                filtered[backup_schedule_name] = item
+        else:
+            filtered[metadata['uid']] = item
+    return sorted(item['metadata']['name'] for item in filtered.values())
+
+
+def _names(items):
+    return [item['metadata']['name'] for item in items]
+
+
+def test_query_matches_legacy_filters():
+    index = BackupIndex.from_items(BACKUPS)
+
+    for schedule_name in (None, 'nightly', 'hourly', 'missing'):
+        for latest_per_schedule in (False, True):
+            for in_progress in (False, True):
+                filters = dict(schedule_name=schedule_name, latest_per_schedule=latest_per_schedule,
+                               in_progress=in_progress)
+                assert _names(index.query(**filters)) == _legacy_filter(BACKUPS, **filters), filters
+
+
+def test_query_by_storage_location():
+    index = BackupIndex.from_items(BACKUPS)
+
+    assert _names(index.query(storage_location='s3')) == ['hourly-1', 'hourly-2']
+    assert _names(index.query(storage_location='s3', latest_per_schedule=True)) == ['hourly-2']
+
+
+def test_incremental_updates():
+    index = BackupIndex.from_items(BACKUPS)
+
+    index.remove(('velero', 'nightly-3'))
+    assert index.latest_per_schedule['nightly'] == ('velero', 'nightly-2')
+
+    index.remove(('velero', 'hourly-1'))
+    index.remove(('velero', 'hourly-2'))
+    assert 'hourly' not in index.latest_per_schedule
+    assert 'hourly' not in index.by_schedule
+
+    completed = _backup('nightly-4', 'nightly', created=5, completed_ago=10)
+    index.add(('velero', 'nightly-4'), completed)
+    assert index.latest_per_schedule['nightly'] == ('velero', 'nightly-4')
+    assert index.latest_completed(2) == [('velero', 'nightly-4'), ('velero', 'manual-2')]
+    assert index.completed_since(time.time() - 3600) == [('velero', 'nightly-4'), ('velero', 'manual-2')]
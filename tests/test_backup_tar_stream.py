@@ -0,0 +1,64 @@
+import io
+import os
+import sys
+import tarfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils.backup_tar_stream import TarMember, _scan, member_path  # noqa: E402
+
+PVC = b'{"metadata": {"name": "data"}, "spec": {"storageClassName": "gp2"}}'
+
+
+def _archive(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        directory = tarfile.TarInfo('./resources')
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        for name, data in files:
+            member = tarfile.TarInfo(name)
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def test_member_path():
+    assert member_path('./metadata/version') == 'metadata/version'
+    assert member_path('metadata/version') == 'metadata/version'
+
+
+def test_scan_indexes_members_and_keeps_selected():
+    archive = _archive([('./metadata/version', b'1'),
+                        ('./resources/persistentvolumeclaims/namespaces/db/data.json', PVC),
+                        ('./resources/pods/namespaces/db/postgres-0.json', b'x' * 100000)])
+
+    scan = _scan(archive, lambda path: path.startswith('resources/persistentvolumeclaims/'))
+
+    assert scan.members == [TarMember('metadata/version', 1),
+                            TarMember('resources/persistentvolumeclaims/namespaces/db/data.json', len(PVC)),
+                            TarMember('resources/pods/namespaces/db/postgres-0.json', 100000)]
+    assert scan.files == {'resources/persistentvolumeclaims/namespaces/db/data.json': PVC}
+
+
+def test_scan_reads_a_non_seekable_stream():
+    class _Stream:
+        def __init__(self, data):
+            self.buffer = io.BytesIO(data)
+
+        def read(self, size=-1):
+            return self.buffer.read(size)
+
+    scan = _scan(_Stream(_archive([('metadata/version', b'1')]).getvalue()), lambda path: True)
+
+    assert scan.files == {'metadata/version': b'1'}
+
+
+def test_scan_truncated_archive():
+    data = _archive([('./resources/pods/namespaces/db/postgres-0.json', os.urandom(100000))]).getvalue()
+
+    with pytest.raises(tarfile.TarError):
+        _scan(io.BytesIO(data[:len(data) // 2]), lambda path: True)
@@ -0,0 +1,59 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils.cron_expansion import CronExpansionCache, expand_cron  # noqa: E402
+
+# Sunday
+NOW = datetime(2024, 5, 5, 0, 0)
+
+
+def _schedule(name, cron_string):
+    return {'metadata': {'name': name, 'namespace': 'velero'}, 'spec': {'schedule': cron_string}}
+
+
+def test_expand_cron_week_offsets():
+    assert expand_cron('0 1 * * *', NOW) == tuple(day * 1440 + 60 for day in range(7))
+    assert expand_cron('30 2 * * 1', NOW) == (1440 + 150,)
+
+
+def test_expansion_reused_within_bucket():
+    cache = CronExpansionCache(bucket_sec=3600)
+
+    first = cache.week_offsets('0 1 * * *', now=NOW)
+    second = cache.week_offsets('0 1 * * *', now=NOW.replace(minute=59))
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_evicted():
+    cache = CronExpansionCache(max_entries=2)
+    cache.week_offsets('0 1 * * *', now=NOW)
+    cache.week_offsets('0 2 * * *', now=NOW)
+    cache.week_offsets('0 1 * * *', now=NOW)
+
+    cache.week_offsets('0 3 * * *', now=NOW)
+
+    assert [key[0] for key in cache._entries] == ['0 1 * * *', '0 3 * * *']
+
+
+def test_expansions_dropped_when_no_schedule_uses_the_cron():
+    cache = CronExpansionCache()
+    cache.rebuild({('velero', 'nightly'): _schedule('nightly', '0 1 * * *'),
+                   ('velero', 'weekly'): _schedule('weekly', '0 1 * * *')})
+    cache.week_offsets('0 1 * * *', now=NOW)
+
+    # MODIFIED event without changes: remove then add of the same cron
+    cache.remove(('velero', 'nightly'))
+    cache.add(('velero', 'nightly'), _schedule('nightly', '0 1 * * *'))
+    cache.remove(('velero', 'weekly'))
+    cache.week_offsets('0 5 * * *', now=NOW)
+    assert [key[0] for key in cache._entries] == ['0 1 * * *', '0 5 * * *']
+
+    cache.remove(('velero', 'nightly'))
+    cache.add(('velero', 'nightly'), _schedule('nightly', '0 4 * * *'))
+    cache.week_offsets('0 5 * * *', now=NOW)
+    assert [key[0] for key in cache._entries] == ['0 5 * * *']
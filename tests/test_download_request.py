@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils import download_request  # noqa: E402
+from service.utils.download_request import DownloadRequestManager, _processed_url  # noqa: E402
+
+
+def _expiration(seconds):
+    return datetime.fromtimestamp(time.time() + seconds, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class _FakeManager(DownloadRequestManager):
+    """DownloadRequestManager with the DownloadRequest round trip replaced by a counter"""
+
+    def __init__(self, ttl=600):
+        super().__init__()
+        self.ttl = ttl
+        self.resolved = 0
+
+    async def _resolve(self, resource_name, resource_kind):
+        self.resolved += 1
+        await asyncio.sleep(0.01)
+        url = f"https://storage/{resource_name}/{resource_kind}?{self.resolved}"
+        self._urls[(resource_name, resource_kind)] = (url, time.time() + self.ttl)
+        return url
+
+
+def test_processed_url():
+    processed = {'status': {'phase': 'Processed', 'downloadURL': 'https://storage/url',
+                            'expiration': _expiration(600)}}
+
+    assert _processed_url(processed)[0] == 'https://storage/url'
+    assert _processed_url({'status': {'phase': 'New'}}) is None
+    assert _processed_url(None) is None
+
+
+def test_processed_url_expired_or_about_to_expire():
+    for seconds in (-60, download_request.DOWNLOAD_URL_EXPIRY_MARGIN_SEC / 2):
+        expired = {'status': {'phase': 'Processed', 'downloadURL': 'https://storage/url',
+                              'expiration': _expiration(seconds)}}
+        assert _processed_url(expired) is None
+
+
+def test_concurrent_requests_share_one_download_request():
+    manager = _FakeManager()
+
+    async def run():
+        return await asyncio.gather(*[manager.get_url('nightly-1', 'BackupLog') for _ in range(5)],
+                                    manager.get_url('nightly-1', 'BackupContents'))
+
+    urls = asyncio.run(run())
+
+    assert len(set(urls[:5])) == 1
+    assert urls[5] != urls[0]
+    assert manager.resolved == 2
+
+
+def test_url_cached_until_expiration():
+    manager = _FakeManager()
+
+    first = asyncio.run(manager.get_url('nightly-1', 'BackupLog'))
+    assert asyncio.run(manager.get_url('nightly-1', 'BackupLog')) == first
+    assert manager.resolved == 1
+
+    # within the expiry margin: a new signed URL is requested
+    expires_at = time.time() + download_request.DOWNLOAD_URL_EXPIRY_MARGIN_SEC / 2
+    manager._urls[('nightly-1', 'BackupLog')] = (first, expires_at)
+    assert asyncio.run(manager.get_url('nightly-1', 'BackupLog')) != first
+    assert manager.resolved == 2
+
+
+def test_request_name():
+    assert DownloadRequestManager.request_name('nightly-1', 'BackupLog') == 'download-nightly-1-backuplog'
+
+
+def test_garbage_collection(monkeypatch):
+    created = _expiration(-60)
+    old = _expiration(-download_request.DOWNLOAD_REQUEST_MAX_AGE_SEC - 60)
+
+    def _request(name, creation, expiration=None):
+        return {'metadata': {'name': name, 'creationTimestamp': creation},
+                'status': {'expiration': expiration} if expiration else {}}
+
+    async def list_resources(plural):
+        return [_request('download-valid-backuplog', created, _expiration(600)),
+                _request('download-expired-backuplog', created, _expiration(-60)),
+                _request('download-old-backuplog', old),
+                _request('other-expired', created, _expiration(-60))]
+
+    monkeypatch.setattr(download_request, 'list_velero_resources', list_resources)
+    manager = DownloadRequestManager()
+    deleted = []
+
+    async def delete(name):
+        deleted.append(name)
+
+    manager._delete = delete
+    manager._urls[('expired', 'BackupLog')] = ('https://storage/url', time.time() - 1)
+
+    asyncio.run(manager.collect_garbage())
+
+    assert deleted == ['download-expired-backuplog', 'download-old-backuplog']
+    assert manager._urls == {}
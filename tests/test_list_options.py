@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils.list_options import paginate, parse_fields, project, projection_paths  # noqa: E402
+
+ITEMS = [{'metadata': {'namespace': 'velero', 'name': f'backup-{index}'}} for index in range(5)]
+
+
+def _names(items):
+    return [item['metadata']['name'] for item in items]
+
+
+def test_paginate_without_options():
+    page, pagination = paginate(ITEMS)
+
+    assert page == ITEMS
+    assert pagination is None
+
+
+def test_paginate_pages():
+    page, pagination = paginate(ITEMS, limit=2)
+    assert _names(page) == ['backup-0', 'backup-1']
+    assert pagination['remaining_item_count'] == 3
+
+    page, pagination = paginate(ITEMS, limit='2', continue_token=pagination['continue_token'])
+    assert _names(page) == ['backup-2', 'backup-3']
+
+    page, pagination = paginate(ITEMS, limit=2, continue_token=pagination['continue_token'])
+    assert _names(page) == ['backup-4']
+    assert pagination == {'continue_token': None, 'remaining_item_count': 0}
+
+
+def test_paginate_token_survives_removed_item():
+    _, pagination = paginate(ITEMS, limit=2)
+    remaining = [item for item in ITEMS if item['metadata']['name'] != 'backup-1']
+
+    page, _ = paginate(remaining, limit=2, continue_token=pagination['continue_token'])
+
+    assert _names(page) == ['backup-2', 'backup-3']
+
+
+@pytest.mark.parametrize('options', [{'continue_token': 'not-a-token'},
+                                     {'limit': 0},
+                                     {'limit': 'ten'}])
+def test_paginate_bad_options(options):
+    with pytest.raises(HTTPException) as error:
+        paginate(ITEMS, **options)
+
+    assert error.value.status_code == 400
+
+
+def test_parse_fields():
+    assert parse_fields(None) == []
+    assert parse_fields('metadata.name, status.phase') == [('metadata', 'name'), ('status', 'phase')]
+    assert parse_fields('metadata.labels.velero\\.io/schedule-name') == \
+        [('metadata', 'labels', 'velero.io/schedule-name')]
+    assert parse_fields('spec,spec.ttl,spec') == [('spec',)]
+
+
+def test_project():
+    item = {'metadata': {'name': 'nightly-1', 'labels': {'velero.io/schedule-name': 'nightly'}},
+            'status': {'phase': 'Completed', 'errors': 0}}
+
+    projected = project(item, parse_fields('metadata.labels.velero\\.io/schedule-name,status.phase,spec.ttl'))
+
+    assert projected == {'metadata': {'labels': {'velero.io/schedule-name': 'nightly'}},
+                         'status': {'phase': 'Completed'}}
+
+
+def test_projection_paths_collapse_summary_overlaps():
+    summary = [('metadata', 'name'), ('status', 'phase')]
+
+    assert projection_paths('metadata', True, summary) == [('status', 'phase'), ('metadata',)]
+    assert projection_paths(None, False, summary) == []
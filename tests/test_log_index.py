@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from service.utils.log_index import parse_log_line  # noqa: E402
+
+LOGRUS_LINE = ('time="2024-05-02T10:15:30Z" level=error msg="Error backing up item" backup=velero/nightly-20240502 '
+               'error="timed out waiting for \\"pvc-1\\" snapshot" logSource="pkg/backup/backup.go:435" '
+               'name=data-postgres-0 namespace=db resource=persistentvolumeclaims')
+
+
+def test_parse_logrus_line():
+    record = parse_log_line(7, LOGRUS_LINE)
+
+    assert record.line == 7
+    assert record.time == datetime(2024, 5, 2, 10, 15, 30, tzinfo=timezone.utc).timestamp()
+    assert record.level == 'error'
+    assert record.msg == 'Error backing up item'
+    assert record.resource == 'persistentvolumeclaims'
+    assert record.namespace == 'db'
+    assert record.error == 'timed out waiting for "pvc-1" snapshot'
+    assert record.raw == LOGRUS_LINE
+
+
+def test_parse_line_without_fields():
+    record = parse_log_line(1, 'plain text')
+
+    assert record.time is None
+    assert record.level is None
+    assert record.namespace is None
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from k8s.k8s_model_cache import ModelCache  # noqa: E402
+from k8s.k8s_resource_cache import ResourceStore  # noqa: E402
+from models.k8s.backup import BackupResponseSchema  # noqa: E402
+
+
+def _backup(resource_version, phase='Completed'):
+    return {'metadata': {'name': 'nightly-1', 'namespace': 'velero', 'resourceVersion': resource_version},
+            'status': {'phase': phase}}
+
+
+def test_model_reused_for_same_resource_version():
+    cache = ModelCache()
+
+    first = cache.validate(BackupResponseSchema, _backup('1'))
+    second = cache.validate(BackupResponseSchema, _backup('1'))
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_model_revalidated_on_new_resource_version():
+    cache = ModelCache()
+    first = cache.validate(BackupResponseSchema, _backup('1'))
+
+    second = cache.validate(BackupResponseSchema, _backup('2', phase='Deleting'))
+
+    assert second is not first
+    assert second.status.phase == 'Deleting'
+    assert cache.misses == 2
+
+
+def test_model_without_resource_version_not_cached():
+    cache = ModelCache()
+    item = _backup(None)
+
+    assert cache.validate(BackupResponseSchema, item) is not cache.validate(BackupResponseSchema, item)
+    assert cache.hits == 0
+
+
+def test_models_dropped_with_store_events():
+    store = ResourceStore('backups')
+    cache = ModelCache()
+    store.add_indexer(cache)
+    store.replace([_backup('1')], '1')
+    first = cache.validate(BackupResponseSchema, _backup('1'))
+
+    store.apply('DELETED', _backup('2'))
+
+    assert cache.validate(BackupResponseSchema, _backup('1')) is not first
@@ -0,0 +1,45 @@
+import gzip
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from integrations.nats_kv_codec import KV_ENCODING_GZIP, KV_ENCODING_HEADER, compress_kv_value, \
+    encode_kv_value  # noqa: E402
+
+
+def _payload(timestamp, phase='Completed'):
+    return {'data': {'backups': [{'name': 'nightly-1', 'phase': phase}]},
+            'metadata': {'timestamp': timestamp, 'source': 'cron'}}
+
+
+def test_digest_ignores_publish_metadata():
+    data, digest = encode_kv_value(_payload('2024-05-02T10:00:00'))
+    republished, same_digest = encode_kv_value(_payload('2024-05-02T10:05:00'))
+
+    assert same_digest == digest
+    assert republished != data
+    assert json.loads(republished) == _payload('2024-05-02T10:05:00')
+
+
+def test_digest_changes_with_data():
+    _, digest = encode_kv_value(_payload('2024-05-02T10:00:00'))
+    _, changed = encode_kv_value(_payload('2024-05-02T10:00:00', phase='Failed'))
+
+    assert changed != digest
+
+
+def test_encode_plain_values():
+    assert encode_kv_value(b'raw')[0] == b'raw'
+    assert encode_kv_value('text')[0] == b'text'
+    assert json.loads(encode_kv_value({'metadata': {'source': 'cron'}})[0]) == {'metadata': {'source': 'cron'}}
+
+
+def test_compress_above_threshold():
+    data = b'x' * 100
+
+    assert compress_kv_value(data, enabled=True, min_bytes=1000) == (data, None)
+    compressed, headers = compress_kv_value(data, enabled=True, min_bytes=10)
+    assert headers == {KV_ENCODING_HEADER: KV_ENCODING_GZIP}
+    assert gzip.decompress(compressed) == data
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+
+from fastapi import APIRouter, FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from integrations.nats_route_table import NATS_EXCLUDED, NatsRouteTable  # noqa: E402
+
+
+def _app():
+    app = FastAPI()
+    router = APIRouter()
+
+    @router.get('/backups')
+    async def get_backups(schedule_name: str | None = None):
+        return {'schedule_name': schedule_name}
+
+    @router.get('/backups/logs/stream', openapi_extra=NATS_EXCLUDED)
+    async def stream_logs():
+        return None
+
+    @router.get('/backups/{backup_name}')
+    async def get_backup(backup_name: str):
+        return {'backup_name': backup_name}
+
+    @router.get('/backups/{backup_name}/logs/{line:int}')
+    async def get_log_line(backup_name: str, line: int):
+        return {'backup_name': backup_name, 'line': line}
+
+    @router.delete('/backups/{backup_name}')
+    async def delete_backup(backup_name: str):
+        return {'deleted': backup_name}
+
+    app.include_router(router, prefix='/v1')
+    return app
+
+
+def test_resolve_static_path():
+    table = NatsRouteTable(_app())
+
+    binding, path_params = table.resolve('get', '/v1/backups')
+
+    assert binding.endpoint.__name__ == 'get_backups'
+    assert path_params == {}
+
+
+def test_resolve_path_parameters():
+    table = NatsRouteTable(_app())
+
+    binding, path_params = table.resolve('GET', '/v1/backups/nightly-1')
+    assert binding.endpoint.__name__ == 'get_backup'
+    assert path_params == {'backup_name': 'nightly-1'}
+
+    binding, path_params = table.resolve('GET', '/v1/backups/nightly-1/logs/42')
+    assert binding.endpoint.__name__ == 'get_log_line'
+    assert path_params == {'backup_name': 'nightly-1', 'line': 42}
+
+    binding, _ = table.resolve('DELETE', '/v1/backups/nightly-1')
+    assert binding.endpoint.__name__ == 'delete_backup'
+
+
+def test_resolve_unknown_route():
+    table = NatsRouteTable(_app())
+
+    assert table.resolve('GET', '/v1/restores') is None
+    assert table.resolve('PUT', '/v1/backups/nightly-1') is None
+    assert table.resolve('GET', '/v1/backups/nightly-1/logs/last') is None
+
+
+def test_streaming_routes_excluded():
+    table = NatsRouteTable(_app())
+
+    assert table.resolve('GET', '/v1/backups/logs/stream') is None
+    assert len(table) == 4
+
+
+def test_call_get_with_path_and_query_parameters():
+    table = NatsRouteTable(_app())
+    binding, path_params = table.resolve('GET', '/v1/backups/nightly-1')
+    assert asyncio.run(binding.call_get(path_params, {})) == {'backup_name': 'nightly-1'}
+
+    binding, path_params = table.resolve('GET', '/v1/backups')
+    assert asyncio.run(binding.call_get(path_params, {'schedule_name': 'nightly'})) == {'schedule_name': 'nightly'}
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from constants.resources import RESOURCES, ResourcesNames  # noqa: E402
+from k8s.k8s_resource_cache import resource_cache  # noqa: E402
+from service import stats  # noqa: E402
+
+NAMESPACES = ['default', 'db', 'web', 'velero']
+
+
+def _timestamp(seconds_ago):
+    return datetime.fromtimestamp(time.time() - seconds_ago, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _backup(name, schedule=None, created=0, phase='Completed', completed_ago=None):
+    metadata = {'name': name, 'namespace': 'velero', 'resourceVersion': '1',
+                'creationTimestamp': f'2024-05-0{created + 1}T00:00:00Z'}
+    if schedule:
+        metadata['labels'] = {'velero.io/schedule-name': schedule}
+    status = {'phase': phase}
+    if completed_ago is not None:
+        status['completionTimestamp'] = _timestamp(completed_ago)
+    return {'metadata': metadata, 'status': status}
+
+
+def _schedule(name, namespaces, paused=False):
+    return {'metadata': {'name': name, 'namespace': 'velero'},
+            'spec': {'paused': paused, 'template': {'includedNamespaces': namespaces}}}
+
+
+def _restore(name, phase):
+    return {'metadata': {'name': name, 'namespace': 'velero'}, 'status': {'phase': phase}}
+
+
+def _store(name):
+    return resource_cache.store(RESOURCES[name].plural)
+
+
+def _assert_matches_snapshot():
+    backups = _store(ResourcesNames.BACKUP).list()
+    restores = _store(ResourcesNames.RESTORE).list()
+    schedules = _store(ResourcesNames.SCHEDULE).list()
+
+    assert asyncio.run(stats.stats_aggregates.get_stats()) == \
+        stats.compute_stats(backups, restores, schedules, NAMESPACES)
+
+
+def test_aggregates_match_compute_stats(monkeypatch):
+    async def namespaces():
+        return NAMESPACES
+
+    monkeypatch.setattr(stats, 'get_namespaces_service', namespaces)
+    stats.stats_aggregates._namespaces_cache = None
+
+    _store(ResourcesNames.BACKUP).replace([
+        _backup('nightly-1', 'nightly', created=1, completed_ago=3 * 86400),
+        _backup('nightly-2', 'nightly', created=2, phase='Failed', completed_ago=3600),
+        _backup('hourly-1', 'hourly', created=1, phase='InProgress'),
+        _backup('manual-1', created=3, phase='PartiallyFailed', completed_ago=60),
+    ], '1')
+    _store(ResourcesNames.RESTORE).replace([_restore('restore-1', 'Completed'),
+                                            _restore('restore-2', 'Failed')], '1')
+    _store(ResourcesNames.SCHEDULE).replace([_schedule('nightly', ['db', 'web']),
+                                             _schedule('hourly', ['db'], paused=True)], '1')
+    assert stats.stats_aggregates.ready()
+    _assert_matches_snapshot()
+
+    # incremental updates from the watch events
+    _store(ResourcesNames.BACKUP).apply('ADDED', _backup('nightly-3', 'nightly', created=4, completed_ago=10))
+    _store(ResourcesNames.BACKUP).apply('MODIFIED', _backup('hourly-1', 'hourly', created=1, completed_ago=5))
+    _store(ResourcesNames.BACKUP).apply('DELETED', _backup('manual-1'))
+    _store(ResourcesNames.RESTORE).apply('MODIFIED', _restore('restore-2', 'Completed'))
+    _store(ResourcesNames.SCHEDULE).apply('DELETED', _schedule('nightly', ['db', 'web']))
+    _assert_matches_snapshot()